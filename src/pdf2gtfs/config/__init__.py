@@ -14,8 +14,8 @@ from pdf2gtfs.config.properties import (
     AbbrevProperty, AverageSpeedProperty, DateBoundsProperty,
     DirectionProperty, FilenameProperty,
     HeaderValuesProperty, HolidayCodeProperty, InputProperty,
-    OutputPathProperty, PagesProperty, RepeatIdentifierProperty,
-    RouteTypeProperty, SplitOrientationsProperty,
+    OutputPathProperty, PageBudgetFallbackProperty, PagesProperty,
+    RepeatIdentifierProperty, RouteTypeProperty, SplitOrientationsProperty,
     )
 
 
@@ -69,6 +69,7 @@ class P2GConfig(BaseConfig):
         self.holiday_code = HolidayCodeProperty("holiday_code")
         self.repeat_identifier = RepeatIdentifierProperty("repeat_identifier")
         self.repeat_strategy = Property("repeat_strategy", str)
+        self.use_frequencies = Property("use_frequencies", bool)
         self.pages = PagesProperty("pages")
         self.max_row_distance = IntBoundedProperty("max_row_distance", 0)
         self.min_row_count = IntBoundedProperty("min_row_count", 0)
@@ -79,6 +80,9 @@ class P2GConfig(BaseConfig):
         self.average_speed = AverageSpeedProperty("average_speed")
         self.allowed_stop_chars = Property("allowed_stop_chars", list)
         self.output_path = OutputPathProperty("output_path")
+        self.output_compression_level = \
+            IntBoundedProperty("output_compression_level", 0, 9)
+        self.uid_prefix = Property("uid_prefix", str)
         self.preprocess = Property("preprocess", bool)
         self.output_pp = Property("output_pp", bool)
         self.non_interactive = Property("non_interactive", bool)
@@ -119,6 +123,16 @@ class P2GConfig(BaseConfig):
         self.split_orientations = \
             SplitOrientationsProperty("split_orientations")
         self.output_tables_as_csv = Property("output_tables_as_csv", bool)
+        self.dump_table_artifacts = Property("dump_table_artifacts", bool)
+        self.use_layout_templates = Property("use_layout_templates", bool)
+        self.layout_template_key = Property("layout_template_key", str)
+        self.use_ruling_lines = Property("use_ruling_lines", bool)
+        self.use_structure_tree = Property("use_structure_tree", bool)
+        self.page_time_budget = FloatBoundedProperty("page_time_budget", 0.)
+        self.page_operation_budget = \
+            IntBoundedProperty("page_operation_budget", 0)
+        self.page_budget_fallback = \
+            PageBudgetFallbackProperty("page_budget_fallback")
 
         super()._initialize_config_properties()
 
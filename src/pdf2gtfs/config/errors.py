@@ -53,6 +53,26 @@ class InvalidDirectionError(PropertyError):
         super().__init__(msg)
 
 
+class InvalidPageBudgetFallbackError(PropertyError):
+    def __init__(self, **kwargs) -> None:
+        """ Raised if the given fallback is not a valid fallback.
+
+        :keyword prop: The property that was created.
+        :type prop: Property
+        :keyword fallback: The invalid fallback.
+        :type fallback: str
+        """
+        if "prop" not in kwargs or "fallback" not in kwargs:
+            super().__init__()
+            return
+        prop_name = kwargs["prop"].name
+        fallback = kwargs["fallback"]
+        msg = (f"Tried to use invalid fallback '{fallback}' for the "
+               f"property '{prop_name}'. The fallback needs to be either "
+               f"'legacy' or 'skip'.")
+        super().__init__(msg)
+
+
 class InvalidOrientationError(PropertyError):
     def __init__(self, **kwargs) -> None:
         """ Raised if any of the given orientation is not a valid orientation.
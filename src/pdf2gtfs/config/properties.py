@@ -19,7 +19,8 @@ from pdf2gtfs.datastructures.gtfs_output.routes import (
 from pdf2gtfs.config.errors import (
     InvalidDateBoundsError, InvalidDirectionError, InvalidHeaderDaysError,
     InvalidHolidayCodeError, InvalidOrientationError, InvalidOutputPathError,
-    InvalidRepeatIdentifierError, InvalidRouteTypeValueError,
+    InvalidPageBudgetFallbackError, InvalidRepeatIdentifierError,
+    InvalidRouteTypeValueError,
     )
 
 
@@ -368,6 +369,18 @@ class SplitOrientationsProperty(Property):
                 raise InvalidOrientationError(prop=self, orientation=char)
 
 
+class PageBudgetFallbackProperty(Property):
+    """ Property for the page_budget_fallback. """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name, str)
+
+    def validate(self, value: str) -> None:
+        super().validate(value)
+        if value not in ("legacy", "skip"):
+            raise InvalidPageBudgetFallbackError(prop=self, fallback=value)
+
+
 class AbbrevProperty(Property):
     """ Property used by the abbreviations. """
 
@@ -5,24 +5,33 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, Field, fields
+from io import TextIOWrapper
+from itertools import islice
 from operator import methodcaller
 from pathlib import Path
-from typing import Iterator, Optional, Type, TypeVar
+from typing import Hashable, Iterator, Optional, TextIO, Type, TypeVar
+from zipfile import ZipFile
 
 import pandas as pd
 
-from pdf2gtfs.utils import next_uid, UIDGenerator
+from pdf2gtfs.utils import _UIDGenerator, UIDGenerator
 
 
 logger = logging.getLogger(__name__)
 
+# The number of lines that are written at once.
+OUTPUT_CHUNK_SIZE = 10000
+
 
 @dataclass
 class BaseDataClass:
     """ Base class for a single entry in a gtfs file. """
 
-    def __init__(self, existing_id: str | None = None) -> None:
-        self.id: str = next_uid() if existing_id is None else existing_id
+    def __init__(self, existing_id: str | None = None,
+                 uid_generator: _UIDGenerator | None = None) -> None:
+        if existing_id is None:
+            existing_id = (uid_generator or UIDGenerator).next()
+        self.id: str = existing_id
 
     def get_field_value(self, field: Field):
         """ Returns the value of the given field. """
@@ -40,6 +49,14 @@ class BaseDataClass:
         """ Returns this object, as it would be found within a GTFS file. """
         return ",".join(map(self._to_output, fields(self)))
 
+    def get_key(self) -> Hashable:
+        """ Return the key used by the containers to find equal entries.
+
+        Two entries that are equal need to have the same key. Subclasses,
+        which override __eq__, need to override this as well.
+        """
+        return tuple(getattr(self, field.name) for field in fields(self))
+
 
 DCType = TypeVar("DCType", bound=BaseDataClass)
 
@@ -49,46 +66,128 @@ class BaseContainer:
 
     entries: list[DCType]
 
-    def __init__(self, file_name: str, entry_type: Type[DCType], path: Path):
+    def __init__(self, file_name: str, entry_type: Type[DCType], path: Path,
+                 uid_generator: _UIDGenerator | None = None):
         self.fp = path.joinpath(file_name)
         self.entry_type = entry_type
-        self.entries: list[entry_type] = self.read_input_files()
-        for entry in self.entries:
-            UIDGenerator.skip(entry.id)
-
-    def read_input_file(self, path: Path) -> list[DCType]:
+        # Generates the IDs of new entries and skips the IDs of the input.
+        self.uid_generator = uid_generator or UIDGenerator
+        self._index: dict[Hashable, DCType] | None = None
+        self._indexed_count = 0
+        self.load_input_files()
+
+    @property
+    def entries(self) -> list[DCType]:
+        """ The entries of the file. """
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries: list[DCType]) -> None:
+        self._entries = entries
+        self.invalidate_index()
+
+    def load_input_files(self) -> None:
+        """ Set the entries to the entries of the input files. """
+        entries = self.read_input_files()
+        self.uid_generator.skip_many(entry.id for entry in entries)
+        self.entries: list[DCType] = entries
+
+    @staticmethod
+    def read_input_df(path: Path) -> pd.DataFrame | None:
         """ Try to read the given input file. """
         try:
-            df = pd.read_csv(path, dtype=str, keep_default_na=False,
-                             encoding="utf-8")
+            return pd.read_csv(path, dtype=str, keep_default_na=False,
+                               encoding="utf-8")
         except Exception as e:
             logger.warning(f"The following exception occurred, when trying "
                            f"to read the input file '{path}':\n{e}")
-            return []
-        entries = self.entries_from_df(df)
-        return entries
+            return None
 
-    def read_input_files(self) -> list[DCType]:
-        """ Read the existing file, returning a list of all entries.
-         If the file does not exist, return the default instead. """
+    def read_input_dfs(self) -> Iterator[pd.DataFrame]:
+        """ Read each input file of this container. """
         from pdf2gtfs.config import Config
 
-        entries = []
         for file in Config.input_files.get(self.fp.name, []):
             logger.info(f"Reading input file {file}...")
-            entries += self.read_input_file(file)
-        return entries
+            df = self.read_input_df(file)
+            if df is not None:
+                yield df
 
-    def entries_from_df(self, df: pd.DataFrame) -> list[DCType]:
-        """ Turn the given dataframe into entries with the correct type. """
+    def read_input_files(self) -> list[DCType]:
+        """ Read the existing file, returning a list of all entries.
+         If the file does not exist, return the default instead. """
         entries = []
-        for _, values in df.iterrows():
-            entries.append(self.entry_type.from_series(values))
+        for df in self.read_input_dfs():
+            entries += self.entries_from_df(df)
         return entries
 
+    def entries_from_df(self, df: pd.DataFrame) -> list[DCType]:
+        """ Turn the given dataframe into entries with the correct type.
+
+        Each row is passed to from_series as a dict, which is a lot faster
+        than iterating over the rows of the dataframe.
+        """
+        columns = df.columns.tolist()
+        rows = zip(*(df[column].tolist() for column in columns))
+        return [self.entry_type.from_series(dict(zip(columns, row)))
+                for row in rows]
+
+    def invalidate_index(self) -> None:
+        """ Invalidate the index of the entries.
+
+        Needs to be called, when the values of entries were changed in
+        place in a way that changes their key, e.g. when the annotations
+        of a calendar entry were updated.
+        """
+        self._index = None
+        self._indexed_count = 0
+
+    @staticmethod
+    def _get_key(entry: DCType) -> Hashable | None:
+        """ Return the key of the entry or None, if it is not hashable. """
+        try:
+            key = entry.get_key()
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _get_index(self) -> dict[Hashable, DCType]:
+        """ Return the index, mapping the key of each entry to the first
+        entry with that key.
+
+        Entries that were appended directly to the entries are added to the
+        index. If entries were removed directly, the index is rebuilt.
+        """
+        if self._index is None or self._indexed_count > len(self.entries):
+            self._index = {}
+            self._indexed_count = 0
+        for entry in self.entries[self._indexed_count:]:
+            key = self._get_key(entry)
+            if key is not None:
+                self._index.setdefault(key, entry)
+        self._indexed_count = len(self.entries)
+        return self._index
+
+    def _find(self, new_entry: DCType) -> Optional[DCType]:
+        """ Return the first entry equal to new_entry or None. """
+        key = self._get_key(new_entry)
+        if key is not None:
+            entry = self._get_index().get(key)
+            if entry is None or entry == new_entry:
+                return entry
+            # The entry was changed in place after it was indexed.
+            self.invalidate_index()
+            return self._get_index().get(key)
+        for entry in self.entries:
+            if entry == new_entry:
+                return entry
+        return None
+
     def _add(self, entry: DCType) -> DCType:
-        if entry in self.entries:
-            return self.entries[self.entries.index(entry)]
+        existing_entry = self._find(entry)
+        if existing_entry is not None:
+            return existing_entry
         self.entries.append(entry)
         return entry
 
@@ -98,27 +197,54 @@ class BaseContainer:
         argument instead. """
         if not hasattr(self.entry_type, "__eq__"):
             return new_entry
-        for entry in self.entries:
-            if entry == new_entry:
-                return entry
-        return None
+        return self._find(new_entry)
+
+    def remove(self, entry: DCType) -> None:
+        """ Remove the given entry, if it exists. """
+        try:
+            self.entries.remove(entry)
+        except ValueError:
+            return
+        self.invalidate_index()
+
+    def _extend(self, entries: list[DCType]) -> None:
+        """ Add all entries, without checking for existing entries. """
+        self.entries.extend(entries)
 
     def get_header(self) -> str:
         """ Returns the field_names (headers) of the entry. """
         return ",".join([field.name for field in fields(self.entry_type)])
 
+    def get_output_lines(self) -> Iterator[str]:
+        """ Return the lines of the entries, as they would be found
+        within the gtfs file. """
+        return map(methodcaller("to_output"), self.entries)
+
     def to_output(self) -> str:
         """ Return the content of the gtfs file. """
-        entry_output = "\n".join(map(methodcaller("to_output"), self.entries))
+        entry_output = "\n".join(self.get_output_lines())
         return f"{self.get_header()}\n{entry_output}\n"
 
     def write(self) -> None:
         """ Write the file content to the output directory. """
-        self._write(self.to_output())
-
-    def _write(self, content: str) -> None:
-        with open(self.fp, "w", encoding="utf-8") as fil:
-            fil.write(content)
+        with open(self.fp, "w", encoding="utf-8", newline="") as fil:
+            self.write_to(fil)
+
+    def write_to_zip(self, zip_file: ZipFile) -> None:
+        """ Write the file content directly into the given zip archive. """
+        with (zip_file.open(self.fp.name, "w") as raw_file,
+              TextIOWrapper(raw_file, encoding="utf-8", newline="") as fil):
+            self.write_to(fil)
+
+    def write_to(self, fil: TextIO) -> None:
+        """ Write the file content to the given file, in chunks.
+
+        Only a single chunk of lines is kept in memory at a time.
+        """
+        fil.write(f"{self.get_header()}\n")
+        lines = self.get_output_lines()
+        while chunk := list(islice(lines, OUTPUT_CHUNK_SIZE)):
+            fil.write("\n".join(chunk) + "\n")
 
     def __eq__(self, other: BaseContainer) -> bool:
         fields1 = fields(self.entry_type)
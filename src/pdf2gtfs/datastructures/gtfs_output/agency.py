@@ -4,13 +4,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-
-import pandas as pd
+from typing import Mapping, TYPE_CHECKING
 
 from pdf2gtfs.datastructures.gtfs_output.__init__ import (
     BaseContainer, BaseDataClass)
 
 
+if TYPE_CHECKING:
+    from pdf2gtfs.utils import _UIDGenerator
+
+
 @dataclass
 class GTFSAgencyEntry(BaseDataClass):
     """ A single agency. """
@@ -20,16 +23,17 @@ class GTFSAgencyEntry(BaseDataClass):
     agency_timezone: str
 
     def __init__(self, name: str, url: str, timezone: str,
-                 agency_id: str = None):
-        super().__init__(agency_id)
+                 agency_id: str = None,
+                 uid_generator: _UIDGenerator | None = None):
+        super().__init__(agency_id, uid_generator)
         self.agency_id = self.id
         self.agency_name = name
         self.agency_url = url
         self.agency_timezone = timezone
 
     @staticmethod
-    def from_series(series: pd.Series) -> GTFSAgencyEntry:
-        """ Return an entry, using the series' values. """
+    def from_series(series: Mapping[str, str]) -> GTFSAgencyEntry:
+        """ Return an entry, using the values of the given row. """
         return GTFSAgencyEntry(series["agency_name"],
                                series["agency_url"],
                                series["agency_timezone"],
@@ -46,21 +50,23 @@ class DummyGTFSAgencyEntry(GTFSAgencyEntry):
     """ Dummy agency, which will be used, if no agency is given. """
     entries: list[GTFSAgencyEntry]
 
-    def __init__(self) -> None:
+    def __init__(self, uid_generator: _UIDGenerator | None = None) -> None:
         url = "https://www.github.com/heijul/pdf2gtfs"
-        super().__init__("pdf2gtfs", url, "Europe/Berlin")
+        super().__init__("pdf2gtfs", url, "Europe/Berlin",
+                         uid_generator=uid_generator)
         self.name = "pdf2gtfs"
 
 
 class GTFSAgency(BaseContainer):
     """ Used to create 'agency.txt'. """
 
-    def __init__(self, outdir: Path) -> None:
-        super().__init__("agency.txt", GTFSAgencyEntry, outdir)
+    def __init__(self, outdir: Path,
+                 uid_generator: _UIDGenerator | None = None) -> None:
+        super().__init__("agency.txt", GTFSAgencyEntry, outdir, uid_generator)
 
     def read_input_files(self) -> list[GTFSAgencyEntry]:
         """ Return the entries of the inputfiles, otherwise return a dummy. """
         entries = super().read_input_files()
         if not entries:
-            return [DummyGTFSAgencyEntry()]
+            return [DummyGTFSAgencyEntry(self.uid_generator)]
         return entries
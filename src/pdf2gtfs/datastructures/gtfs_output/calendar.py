@@ -5,15 +5,17 @@ from __future__ import annotations
 import datetime as dt
 from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Callable, Optional, TypeAlias
-
-import pandas as pd
+from typing import Callable, Mapping, Optional, TYPE_CHECKING, TypeAlias
 
 from pdf2gtfs.config import Config
 from pdf2gtfs.datastructures.gtfs_output import (
     BaseContainer, BaseDataClass, str_wrap)
 
 
+if TYPE_CHECKING:
+    from pdf2gtfs.utils import _UIDGenerator
+
+
 @dataclass
 class DayIsActive:
     """ Simple dataclass used by calendar entries, to turn booleans
@@ -84,8 +86,9 @@ class GTFSCalendarEntry(BaseDataClass):
     end_date: ServiceDay = None
 
     def __init__(self, days: list[str] = None, annots: set[str] = None,
-                 service_id: str = None):
-        super().__init__(service_id)
+                 service_id: str = None,
+                 uid_generator: _UIDGenerator | None = None):
+        super().__init__(service_id, uid_generator)
         self.service_id = self.id
         self.on_holidays = False
         self.start_date = StartDate()
@@ -122,9 +125,14 @@ class GTFSCalendarEntry(BaseDataClass):
     def __eq__(self, other: GTFSCalendarEntry):
         return self.same_days(other) and self.annotations == other.annotations
 
+    def get_key(self) -> tuple:
+        """ Uses the same values as __eq__, i.e. the days and annotations. """
+        days = tuple(getattr(self, name).active for name in WEEKDAY_NAMES)
+        return days, self.on_holidays, frozenset(self.annotations)
+
     @staticmethod
-    def from_series(s: pd.Series) -> GTFSCalendarEntry:
-        """ Creates a new GTFSTrip from the given series. """
+    def from_series(s: Mapping[str, str]) -> GTFSCalendarEntry:
+        """ Creates a new GTFSCalendarEntry from the given row. """
         days = []
         for i, day in enumerate(WEEKDAY_NAMES):
             if s[day] != "1":
@@ -144,12 +152,15 @@ class GTFSCalendar(BaseContainer):
 
     entries: list[GTFSCalendarEntry]
 
-    def __init__(self, path: Path) -> None:
-        super().__init__("calendar.txt", GTFSCalendarEntry, path)
+    def __init__(self, path: Path,
+                 uid_generator: _UIDGenerator | None = None) -> None:
+        super().__init__(
+            "calendar.txt", GTFSCalendarEntry, path, uid_generator)
 
     def add(self, days: list[str], annots: set[str]) -> GTFSCalendarEntry:
         """ Add an entry, active on the given days with the given annots. """
-        entry = GTFSCalendarEntry(days, annots)
+        entry = GTFSCalendarEntry(
+            days, annots, uid_generator=self.uid_generator)
         return self._add(entry)
 
     def get(self, entry: GTFSCalendarEntry) -> GTFSCalendarEntry:
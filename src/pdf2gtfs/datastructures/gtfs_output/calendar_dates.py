@@ -5,8 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime as dt
 from pathlib import Path
-
-import pandas as pd
+from typing import Iterable, Mapping
 
 from pdf2gtfs.datastructures.gtfs_output import BaseContainer, BaseDataClass
 
@@ -25,8 +24,8 @@ class GTFSCalendarDateEntry(BaseDataClass):
         self.exception_type = exception_type
 
     @staticmethod
-    def from_series(s: pd.Series) -> GTFSCalendarDateEntry:
-        """ Creates a new GTFSTrip from the given series. """
+    def from_series(s: Mapping[str, str]) -> GTFSCalendarDateEntry:
+        """ Creates a new GTFSCalendarDateEntry from the given row. """
         return GTFSCalendarDateEntry(
             s["service_id"], s["date"], int(s["exception_type"]))
 
@@ -48,7 +47,8 @@ class GTFSCalendarDates(BaseContainer):
         return self._add(entry)
 
     def add_multiple(
-            self, service_id: str, dates: list[dt.date], add_service: bool):
+            self, service_id: str, dates: Iterable[dt.date],
+            add_service: bool):
         """ Adds a new entry for each given date of dates. """
         for date in dates:
             self.add(service_id, date, add_service)
@@ -0,0 +1,65 @@
+""" Used by the handler to create the file 'frequencies.txt'. """
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping
+
+from pdf2gtfs.datastructures.gtfs_output import BaseContainer, BaseDataClass
+from pdf2gtfs.datastructures.gtfs_output.stop_times import Time
+
+
+@dataclass(init=False)
+class GTFSFrequencyEntry(BaseDataClass):
+    """ A single frequency, which repeats a (template) trip. """
+    trip_id: str
+    start_time: Time
+    end_time: Time
+    headway_secs: int
+    exact_times: int
+
+    def __init__(self, trip_id: str, start_time: Time, end_time: Time,
+                 headway_secs: int, exact_times: int = 1) -> None:
+        super().__init__()
+        self.trip_id = trip_id
+        self.start_time = start_time
+        self.end_time = end_time
+        self.headway_secs = headway_secs
+        self.exact_times = exact_times
+
+    @staticmethod
+    def from_series(s: Mapping[str, str]) -> GTFSFrequencyEntry:
+        """ Creates a new GTFSFrequencyEntry from the given row. """
+        exact_times = int(s["exact_times"]) if s.get("exact_times") else 0
+        return GTFSFrequencyEntry(
+            s["trip_id"], Time.from_gtfs(s["start_time"]),
+            Time.from_gtfs(s["end_time"]), int(s["headway_secs"]),
+            exact_times)
+
+
+class GTFSFrequencies(BaseContainer):
+    """ Used to create the 'frequencies.txt'. """
+    entries: list[GTFSFrequencyEntry]
+
+    def __init__(self, path: Path) -> None:
+        super().__init__("frequencies.txt", GTFSFrequencyEntry, path)
+
+    def add(self, trip_id: str, start_time: Time, end_time: Time,
+            headway_secs: int) -> GTFSFrequencyEntry:
+        """ Add a new frequency, which repeats the trip with the given
+        trip_id every headway_secs seconds, between start_time and end_time.
+
+        The trips of the frequency are scheduled exactly.
+        """
+        entry = GTFSFrequencyEntry(trip_id, start_time, end_time, headway_secs)
+        return self._add(entry)
+
+    def get_with_trip_id(self, trip_id: str) -> list[GTFSFrequencyEntry]:
+        """ Return all frequencies of the trip with the given trip_id. """
+        return [entry for entry in self.entries if entry.trip_id == trip_id]
+
+    def remove_unused(self, trip_ids: set[str]) -> None:
+        """ Removes frequencies, whose trip does not exist. """
+        self.entries = [entry for entry in self.entries
+                        if entry.trip_id in trip_ids]
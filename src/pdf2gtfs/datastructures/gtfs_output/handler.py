@@ -9,25 +9,27 @@ from datetime import datetime
 from pathlib import Path
 from statistics import mean
 from time import sleep
-from typing import TYPE_CHECKING
-from zipfile import ZipFile
-
-from holidays.utils import country_holidays
+from typing import Hashable, TYPE_CHECKING
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
 
 from pdf2gtfs.config import Config
+from pdf2gtfs.datastructures.gtfs_output import BaseContainer
 from pdf2gtfs.datastructures.gtfs_output.agency import GTFSAgency
 from pdf2gtfs.datastructures.gtfs_output.calendar import (
     GTFSCalendar, GTFSCalendarEntry)
 from pdf2gtfs.datastructures.gtfs_output.calendar_dates import (
     GTFSCalendarDates
     )
+from pdf2gtfs.datastructures.gtfs_output.frequencies import GTFSFrequencies
+from pdf2gtfs.datastructures.gtfs_output.holiday_cache import get_holidays
+from pdf2gtfs.datastructures.gtfs_output.route_analysis import RouteAnalysis
 from pdf2gtfs.datastructures.gtfs_output.routes import GTFSRoutes
 from pdf2gtfs.datastructures.gtfs_output.stop import (
     GTFSStopEntry, GTFSStops, LocationType, WheelchairBoarding,
     )
 from pdf2gtfs.datastructures.gtfs_output.stop_times import (
-    GTFSStopTimes, GTFSStopTimesEntry, Time)
-from pdf2gtfs.datastructures.gtfs_output.trips import GTFSTrips
+    GTFSStopTimes, GTFSStopTimesEntry, Time, TripStopTimes)
+from pdf2gtfs.datastructures.gtfs_output.trips import GTFSTrips, GTFSTripsEntry
 from pdf2gtfs.datastructures.timetable.entries import (
     TimeTableEntry, TimeTableRepeatEntry
     )
@@ -35,7 +37,7 @@ from pdf2gtfs.locate.finder.loc_nodes import ENode, MNode, Node
 from pdf2gtfs.user_input.cli import (
     ask_overwrite_existing_file, handle_annotations, select_agency
     )
-from pdf2gtfs.utils import UIDGenerator
+from pdf2gtfs.utils import _UIDGenerator
 
 
 if TYPE_CHECKING:
@@ -60,15 +62,23 @@ class GTFSHandler:
     an interface to query them. """
 
     def __init__(self) -> None:
+        # Each handler creates a new feed, which uses its own IDs.
+        self.uid_generator = _UIDGenerator(Config.uid_prefix)
         self.temp_dir = tempfile.TemporaryDirectory(prefix="pdf2gtfs_")
         temp_dir_path = Path(self.temp_dir.name)
-        self._agency = GTFSAgency(temp_dir_path)
-        self._stops = GTFSStops(temp_dir_path)
-        self._routes = GTFSRoutes(temp_dir_path, self.get_default_agency_id())
-        self._calendar = GTFSCalendar(temp_dir_path)
-        self._trips = GTFSTrips(temp_dir_path)
+        self._agency = GTFSAgency(temp_dir_path, self.uid_generator)
+        self._stops = GTFSStops(temp_dir_path, self.uid_generator)
+        self._routes = GTFSRoutes(temp_dir_path, self.get_default_agency_id(),
+                                  self.uid_generator)
+        self._calendar = GTFSCalendar(temp_dir_path, self.uid_generator)
+        self._trips = GTFSTrips(temp_dir_path, self.uid_generator)
         self._stop_times = GTFSStopTimes(temp_dir_path)
         self._calendar_dates = GTFSCalendarDates(temp_dir_path)
+        self._frequencies = GTFSFrequencies(temp_dir_path)
+        self._route_analysis: RouteAnalysis | None = None
+        self._unused_trips_removed = True
+        # Signature of the route, service and stop times -> trip_id.
+        self._trip_signatures: dict[Hashable, str] = {}
 
     def __del__(self) -> None:
         self.temp_dir.cleanup()
@@ -108,6 +118,23 @@ class GTFSHandler:
         """ The calendar dates. """
         return self._calendar_dates
 
+    @property
+    def frequencies(self) -> GTFSFrequencies:
+        """ The frequencies. """
+        return self._frequencies
+
+    @property
+    def route_analysis(self) -> RouteAnalysis:
+        """ The stops and travel times of each route.
+
+        Created once, after all timetables were added. Adding timetables
+        or changing the stop_ids of the stops invalidates it.
+        """
+        if self._route_analysis is None:
+            self._remove_unused_trips()
+            self._route_analysis = RouteAnalysis(self.trips, self.stop_times)
+        return self._route_analysis
+
     def get_default_agency_id(self) -> str:
         """ Return the first agency, if only a single one exists.
         Otherwise, let the user select the correct agency. """
@@ -119,15 +146,56 @@ class GTFSHandler:
         """ Add the entries of the timetable. """
         if not timetable.stops.stops:
             return
+        self._route_analysis = None
+        self._unused_trips_removed = False
         self.add_timetable_stops(timetable)
         self.generate_routes(timetable)
 
+        trip_count = len(self.trips.entries)
         stop_times = self.generate_stop_times(timetable.entries)
+        new_trips = {trip.trip_id: trip
+                     for trip in self.trips.entries[trip_count:]}
         # Add generated stoptimes to ours.
+        duplicate_count = 0
         for times in stop_times:
+            if self._is_duplicate_trip(new_trips, times):
+                duplicate_count += 1
+                continue
             self.stop_times.merge(times)
-        self.trips.remove_unused(self.stop_times)
-        self.generate_calendar_dates()
+        if duplicate_count:
+            logger.info(f"Skipped {duplicate_count} trips, because trips "
+                        f"with the same stop times were already added.")
+        # Unused trips and the calendar_dates are handled once,
+        #  after all timetables were added.
+
+    def _is_duplicate_trip(self, trips: dict[str, GTFSTripsEntry],
+                           times: TripStopTimes) -> bool:
+        """ Check if an equal trip was already added.
+
+        Two trips are equal, if they have the same route, service and
+        stop times. The frequencies of a duplicate trip are added to the
+        existing trip instead.
+
+        :param trips: The trips that may be duplicates, by trip_id.
+        :param times: The stop times of a single trip.
+        :return: True, if the trip is a duplicate and should be skipped.
+        """
+        if not times.entries:
+            return False
+        trip = trips.get(times.entries[0].trip_id)
+        if trip is None:
+            return False
+        signature = (trip.route_id, trip.service_id, times.get_signature())
+        existing_trip_id = self._trip_signatures.setdefault(
+            signature, trip.trip_id)
+        if existing_trip_id == trip.trip_id:
+            return False
+        logger.debug(f"Trip '{trip.trip_id}' is a duplicate of trip "
+                     f"'{existing_trip_id}'.")
+        for frequency in self.frequencies.get_with_trip_id(trip.trip_id):
+            self.frequencies.add(existing_trip_id, frequency.start_time,
+                                 frequency.end_time, frequency.headway_secs)
+        return True
 
     def add_timetable_stops(self, timetable: TimeTable) -> None:
         """ Create the stops for the given timetables. """
@@ -142,7 +210,7 @@ class GTFSHandler:
             self.routes.add_from_entry(entry)
 
     def generate_stop_times(self, entries: list[TimeTableEntry]
-                            ) -> list[GTFSStopTimes]:
+                            ) -> list[TripStopTimes]:
         """ Generate the full StopTimes of the given entries.
 
         Will remember the previous StopTimes created and use the previous and
@@ -159,11 +227,11 @@ class GTFSHandler:
                 return False
             return not calendar_entry.same_days(previous_calendar_entry)
 
-        def create_stop_times() -> GTFSStopTimes:
+        def create_stop_times() -> TripStopTimes:
             """ Creates the StopTimes for the current entry. """
 
             trip = trip_factory()
-            _stop_times = GTFSStopTimes(Path(self.temp_dir.name))
+            _stop_times = TripStopTimes()
             _stop_times.add_multiple(
                 trip.trip_id, self.stops, service_day_offset, entry.values)
             return _stop_times
@@ -210,8 +278,13 @@ class GTFSHandler:
                 continue
 
             # Create StopTimes between previous and current.
-            stop_times += GTFSStopTimes.add_repeat(
-                previous, current, repeat.intervals, trip_factory)
+            if Config.use_frequencies:
+                stop_times += GTFSStopTimes.add_repeat_as_frequency(
+                    previous, current, repeat.intervals, trip_factory,
+                    self.frequencies)
+            else:
+                stop_times += GTFSStopTimes.add_repeat(
+                    previous, current, repeat.intervals, trip_factory)
             repeat = None
 
         return stop_times
@@ -225,16 +298,13 @@ class GTFSHandler:
         holiday_dates, non_holiday_dates = self.calendar.group_by_holiday()
 
         years = sorted([date.year for date in Config.gtfs_date_bounds])
-        years = list(range(years[0], years[1] + 1))
-        holidays = country_holidays(Config.holiday_code[0],
-                                    Config.holiday_code[1],
-                                    years=years)
+        holidays = get_holidays(Config.holiday_code[0],
+                                Config.holiday_code[1], years[0], years[1])
 
-        for holiday in holidays:
-            for date in holiday_dates:
-                self.calendar_dates.add(date.service_id, holiday, True)
-            for date in non_holiday_dates:
-                self.calendar_dates.add(date.service_id, holiday, False)
+        for date in holiday_dates:
+            self.calendar_dates.add_multiple(date.service_id, holidays, True)
+        for date in non_holiday_dates:
+            self.calendar_dates.add_multiple(date.service_id, holidays, False)
 
     def add_annotation_dates(self) -> None:
         """ Add a new CalendarDateEntry for every annotation,
@@ -255,36 +325,46 @@ class GTFSHandler:
                     service.disable()
                 self.calendar_dates.add_multiple(
                     service.service_id, dates, not default)
+            self.calendar.invalidate_index()
+
+    def _remove_unused_trips(self) -> None:
+        """ Remove the trips without stop times and their frequencies.
+
+        Only done once for all timetables, unless new ones were added.
+        """
+        if self._unused_trips_removed:
+            return
+        self.trips.remove_unused(self.stop_times)
+        self.frequencies.remove_unused(
+            {trip.trip_id for trip in self.trips.entries})
+        self._unused_trips_removed = True
 
     def _remove_unused_routes(self) -> None:
-        used_route_ids = set([trip.route_id for trip in self.trips.entries])
-        for route in list(self.routes.entries):
-            if route.route_id in used_route_ids:
-                continue
-            self.routes.entries.remove(route)
+        self._remove_unused_trips()
+        used_route_ids = {trip.route_id for trip in self.trips.entries}
+        self.routes.entries = [route for route in self.routes.entries
+                               if route.route_id in used_route_ids]
 
     def write_files(self) -> None:
-        """ Write all gtfs files to a temporary directory. """
+        """ Write all gtfs files into the output archive. """
         # Final steps before output.
         self._remove_unused_routes()
+        self.generate_calendar_dates()
         self.add_annotation_dates()
-        # Write the files to the temp dir.
-        self.agency.write()
-        self.stops.write()
-        self.routes.write()
-        self.calendar.write()
-        self.trips.write()
-        self.stop_times.write()
-        self.calendar_dates.write()
-
         self.create_zip_archive()
 
-    def get_gtfs_filepaths(self) -> list[Path]:
-        """ Return all gpptfs files. """
-        paths = [self.agency.fp, self.calendar.fp, self.calendar_dates.fp,
-                 self.routes.fp, self.stop_times.fp, self.stops.fp,
-                 self.trips.fp]
-        return paths
+    def get_gtfs_containers(self) -> list[BaseContainer]:
+        """ Return the containers of all gtfs files. """
+        containers = [self.agency, self.calendar, self.calendar_dates,
+                      self.routes, self.stop_times, self.stops, self.trips]
+        # The frequencies are optional.
+        if self.frequencies.entries:
+            containers.append(self.frequencies)
+        return containers
+
+    def get_gtfs_filenames(self) -> list[str]:
+        """ Return the names of all gtfs files within the archive. """
+        return [container.fp.name for container in self.get_gtfs_containers()]
 
     def create_zip_archive(self) -> None:
         """ Creates the final gtfs zip archive. """
@@ -305,23 +385,29 @@ class GTFSHandler:
             sleep(1)
             return self.create_zip_archive()
 
-        with ZipFile(archive_path, mode="w") as zip_file:
-            for path in self.get_gtfs_filepaths():
-                zip_file.write(path, arcname=path.name)
+        level = Config.output_compression_level
+        compression = ZIP_DEFLATED if level else ZIP_STORED
+        # The files are streamed into the archive, without writing them
+        # to the temporary directory first.
+        with ZipFile(archive_path, mode="w", compression=compression,
+                     compresslevel=level or None) as zip_file:
+            for container in self.get_gtfs_containers():
+                container.write_to_zip(zip_file)
 
     def get_stops_of_route(self, route_id: str) -> list[GTFSStopEntry]:
         """ Returns all stops of the given route. """
-        trips = self.trips.get_with_route_id(route_id)
-        trip_stop_times = [self.stop_times.get_with_trip_id(trip.trip_id)
-                           for trip in trips]
-        # Only need a single trip, trips of the same route use the same stops.
-        stop_ids = [stop_time.stop_id for stop_time in trip_stop_times[0]]
+        stop_ids = self.route_analysis.get_stop_ids(route_id)
         return [self.stops.get_by_stop_id(stop_id) for stop_id in stop_ids]
 
     def get_avg_time_between_stops(self, route_id: str,
                                    stop_id1: str, stop_id2: str) -> Time:
         """ Calculate the average travel time between the two stops. """
 
+        avg_time = self.route_analysis.get_avg_time_between(
+            route_id, stop_id1, stop_id2)
+        if avg_time is not None:
+            return Time(seconds=avg_time.total_seconds)
+
         def _aligned_stop_times(times1: list[GTFSStopTimesEntry],
                                 times2: list[GTFSStopTimesEntry]) -> bool:
             if len(times1) != len(times2):
@@ -333,21 +419,23 @@ class GTFSHandler:
                     return False
             return True
 
-        trip_ids = [t.trip_id for t in self.trips.get_with_route_id(route_id)]
+        trip_ids = {t.trip_id for t in self.trips.get_with_route_id(route_id)}
         stop_times1 = self.stop_times.get_with_stop_id(trip_ids, stop_id1)
         stop_times2 = self.stop_times.get_with_stop_id(trip_ids, stop_id2)
         if not _aligned_stop_times(stop_times1, stop_times2):
             return Time()
 
-        times = []
+        durations = []
         for s1, s2 in zip(stop_times1, stop_times2):
-            t_diff = s2.arrival_time - s1.departure_time
-            if not t_diff:
+            duration = (s2.arrival_time.total_seconds
+                        - s1.departure_time.total_seconds)
+            # Negative durations are treated as zero and skipped as well.
+            if duration <= 0:
                 continue
-            times.append(abs(t_diff.to_hours()))
-        if not times:
+            durations.append(duration)
+        if not durations:
             return Time()
-        return Time.from_hours(mean(times))
+        return Time(seconds=round(mean(durations)))
 
     def get_used_stops(self) -> list[GTFSStopEntry]:
         """ Return a list of GTFSStopEntries, which are used in the PDF. """
@@ -356,8 +444,9 @@ class GTFSHandler:
     def get_sorted_route_ids(self) -> list[str]:
         """ Return all route_ids, sorted desc. by the number of stops. """
         route_ids: list[str] = [r.route_id for r in self.routes.entries]
+        analysis = self.route_analysis
         return sorted(route_ids, reverse=True,
-                      key=lambda r: len(self.get_stops_of_route(r)))
+                      key=lambda r: len(analysis.get_stop_ids(r)))
 
     @staticmethod
     def _add_coordinates(stop: GTFSStopEntry, node: Node) -> None:
@@ -378,25 +467,26 @@ class GTFSHandler:
 
         stop.set_location(*node.loc, True)
 
-    def _add_ifopt_as_id(self, stop: GTFSStopEntry, ifopt: str | None) -> None:
+    def _add_ifopt_as_id(self, stop: GTFSStopEntry, ifopt: str | None,
+                         new_stop_ids: dict[str, str]) -> None:
         """ Update stops using the locations, such that each stop uses its
-        nodes' IFOPT, if it exists and is not used elsewhere in the feed. """
+        nodes' IFOPT, if it exists and is not used elsewhere in the feed.
+
+        The stop_times are not updated. Instead, the old and new stop_id
+        are added to new_stop_ids, to update all stop_times at once.
+        """
         if not ifopt or stop.stop_id == ifopt:
             return
         # Check if ID is used for something else already.
-        if UIDGenerator.is_used(ifopt):
+        if self.uid_generator.is_used(ifopt):
             msg = (f"Found a stop location for the stop '{stop.stop_name}' "
                    f"that uses the same IFOPT '{ifopt}' as an already "
                    f"existing stop.")
             logger.warning(msg)
             return
-        # Update stop_times.
-        for stop_time in self.stop_times:
-            if stop_time.stop_id == stop.id:
-                stop_time.stop_id = ifopt
-        # Update stop.
-        stop.stop_id = ifopt
-        UIDGenerator.skip(ifopt)
+        new_stop_ids[stop.stop_id] = ifopt
+        self.stops.set_stop_id(stop, ifopt)
+        self.uid_generator.skip(ifopt)
 
     @staticmethod
     def _add_wheelchair_boarding(stop: GTFSStopEntry, wheelchair: str | None
@@ -426,6 +516,7 @@ class GTFSHandler:
                            "for each stop manually.")
             return
         logger.info("Adding coordinates and additional information to stops.")
+        new_stop_ids: dict[str, str] = {}
         for stop_id, node in locations.items():
             # We should not update existing nodes.
             if isinstance(node, ENode):
@@ -438,5 +529,9 @@ class GTFSHandler:
             self._use_osm_gtfs_name(stop, node.osm_node.gtfs_name)
 
             # This needs to be the last function called by update_stops.
-            self._add_ifopt_as_id(stop, node.osm_node.ref_ifopt)
+            self._add_ifopt_as_id(
+                stop, node.osm_node.ref_ifopt, new_stop_ids)
+        self.stop_times.replace_stop_ids(new_stop_ids)
+        self.stops.invalidate_index()
+        self._route_analysis = None
         logger.info("Done.")
@@ -0,0 +1,89 @@
+""" Provides the holidays used to create the calendar_dates.
+
+Creating the holidays can be expensive for some countries/subdivisions.
+Therefore, the holidays are cached, both in memory and in the cache
+directory, for each combination of country, subdivision and years.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import logging
+from pathlib import Path
+
+import holidays
+from holidays.utils import country_holidays
+
+from pdf2gtfs.utils import get_and_create_cache_dir
+
+
+logger = logging.getLogger(__name__)
+
+_holidays: dict[tuple[str, str | None, int, int], tuple[dt.date, ...]] = {}
+
+
+def get_holiday_cache_path(country: str, subdivision: str | None,
+                           first_year: int, last_year: int) -> Path:
+    """ Return the path of the file containing the cached holidays. """
+    cache_dir = get_and_create_cache_dir().joinpath("holidays")
+    cache_dir.mkdir(exist_ok=True)
+    name = f"{country}_{subdivision or ''}_{first_year}_{last_year}.json"
+    return cache_dir.joinpath(name)
+
+
+def _read_holiday_cache(path: Path) -> list[dt.date] | None:
+    """ Return the holidays of the given cache file.
+
+    :param path: The path of the cache file.
+    :return: The holidays or None, if the cache does not exist, is invalid
+        or was created using a different version of the holidays library.
+    """
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as fil:
+            data = json.load(fil)
+        if data["version"] != holidays.__version__:
+            return None
+        return [dt.date.fromisoformat(date) for date in data["holidays"]]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Could not read the cached holidays from '{path}'. "
+                       f"Reason: '{e}'")
+        return None
+
+
+def _write_holiday_cache(path: Path, dates: list[dt.date]) -> None:
+    data = {"version": holidays.__version__,
+            "holidays": [date.isoformat() for date in dates]}
+    try:
+        with open(path, "w", encoding="utf-8") as fil:
+            json.dump(data, fil, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not write the holidays to '{path}'. "
+                       f"Reason: '{e}'")
+
+
+def get_holidays(country: str, subdivision: str | None,
+                 first_year: int, last_year: int) -> tuple[dt.date, ...]:
+    """ Return the holidays of the country/subdivision in the given years.
+
+    :param country: The country code, e.g. "DE".
+    :param subdivision: The subdivision code, e.g. "BW", or None.
+    :param first_year: The first year, whose holidays are returned.
+    :param last_year: The last year, whose holidays are returned.
+    :return: The sorted dates of all holidays. A tuple is returned,
+        because the same holidays are returned on each call.
+    """
+    key = country, subdivision, first_year, last_year
+    if key in _holidays:
+        return _holidays[key]
+
+    path = get_holiday_cache_path(*key)
+    dates = _read_holiday_cache(path)
+    if dates is None:
+        years = list(range(first_year, last_year + 1))
+        dates = sorted(country_holidays(country, subdivision, years=years))
+        _write_holiday_cache(path, dates)
+    _holidays[key] = tuple(dates)
+    return _holidays[key]
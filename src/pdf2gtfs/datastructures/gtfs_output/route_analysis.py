@@ -0,0 +1,60 @@
+""" Provides the RouteAnalysis, a snapshot of the stops and travel times
+of each route, which is used by the location detection. """
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pdf2gtfs.datastructures.gtfs_output.stop_times import Time
+
+
+if TYPE_CHECKING:
+    from pdf2gtfs.datastructures.gtfs_output.stop_times import GTFSStopTimes
+    from pdf2gtfs.datastructures.gtfs_output.trips import GTFSTrips
+
+
+class RouteAnalysis:
+    """ The stops of each route and the travel times between them.
+
+    The snapshot is created once all timetables were added. It is not
+    updated, if the trips or stop_times change afterwards. Instead, a new
+    snapshot needs to be created.
+    """
+
+    def __init__(self, trips: GTFSTrips, stop_times: GTFSStopTimes) -> None:
+        self.stop_ids: dict[str, list[str]] = {}
+        self.travel_times: dict[str, list[Time]] = {}
+        self._pair_times: dict[tuple[str, str, str], Time] = {}
+        self._analyze(trips, stop_times)
+
+    def _analyze(self, trips: GTFSTrips, stop_times: GTFSStopTimes) -> None:
+        trip_ids_of_routes: dict[str, list[str]] = {}
+        for trip in trips.entries:
+            trip_ids_of_routes.setdefault(trip.route_id, []).append(
+                trip.trip_id)
+
+        for route_id, trip_ids in trip_ids_of_routes.items():
+            # Trips of the same route use the same stops.
+            stop_ids = [stop_time.stop_id for stop_time
+                        in stop_times.get_with_trip_id(trip_ids[0])]
+            travel_times = stop_times.get_travel_times(trip_ids, stop_ids)
+            self.stop_ids[route_id] = stop_ids
+            self.travel_times[route_id] = travel_times
+            for pair in zip(stop_ids, stop_ids[1:], travel_times):
+                self._pair_times.setdefault((route_id, *pair[:2]), pair[2])
+
+    def get_stop_ids(self, route_id: str) -> list[str]:
+        """ Return the stop_ids of the given route, in order. """
+        return self.stop_ids.get(route_id, [])
+
+    def get_avg_time_between(self, route_id: str, stop_id1: str,
+                             stop_id2: str) -> Time | None:
+        """ Return the average travel time between the two stops.
+
+        :param route_id: The route_id of the route.
+        :param stop_id1: The stop_id of the first stop.
+        :param stop_id2: The stop_id of the stop after the first stop.
+        :return: The average travel time or None, if the second stop
+            does not directly follow the first one in the route.
+        """
+        return self._pair_times.get((route_id, stop_id1, stop_id2))
@@ -6,15 +6,14 @@ from dataclasses import dataclass, Field
 from enum import IntEnum
 from pathlib import Path
 from time import strptime
-from typing import TYPE_CHECKING
-
-import pandas as pd
+from typing import Mapping, TYPE_CHECKING
 
 from pdf2gtfs.datastructures.gtfs_output import BaseContainer, BaseDataClass
 
 
 if TYPE_CHECKING:
     from pdf2gtfs.datastructures.timetable.entries import TimeTableEntry
+    from pdf2gtfs.utils import _UIDGenerator
 
 
 def get_route_type(value: str) -> RouteType | None:
@@ -82,10 +81,11 @@ class GTFSRouteEntry(BaseDataClass):
 
     def __init__(
             self, agency_id: str, short_name: str, long_name: str,
-            route_id: str = None, route_type: RouteType = None) -> None:
+            route_id: str = None, route_type: RouteType = None,
+            uid_generator: _UIDGenerator | None = None) -> None:
         from pdf2gtfs.config import Config
 
-        super().__init__(route_id)
+        super().__init__(route_id, uid_generator)
         self.route_id = self.id
         self.agency_id = agency_id
         self.route_long_name = long_name
@@ -105,9 +105,13 @@ class GTFSRouteEntry(BaseDataClass):
                 self.route_short_name == other.route_short_name and
                 self.route_long_name == other.route_long_name)
 
+    def get_key(self) -> tuple[str, str, str]:
+        """ The route_id is not used, to be consistent with __eq__. """
+        return self.agency_id, self.route_short_name, self.route_long_name
+
     @staticmethod
-    def from_series(s: pd.Series) -> GTFSRouteEntry:
-        """ Creates a new GTFSTrip from the given series. """
+    def from_series(s: Mapping[str, str]) -> GTFSRouteEntry:
+        """ Creates a new GTFSRouteEntry from the given row. """
         return GTFSRouteEntry(s["agency_id"], s["route_short_name"],
                               s["route_long_name"], s["route_id"],
                               get_route_type(s["route_type"]))
@@ -116,13 +120,15 @@ class GTFSRouteEntry(BaseDataClass):
 class GTFSRoutes(BaseContainer):
     """ Used to create 'routes.txt'. """
 
-    def __init__(self, path: Path, agency_id: str) -> None:
-        super().__init__("routes.txt", GTFSRouteEntry, path)
+    def __init__(self, path: Path, agency_id: str,
+                 uid_generator: _UIDGenerator | None = None) -> None:
+        super().__init__("routes.txt", GTFSRouteEntry, path, uid_generator)
         self.agency_id: str = agency_id
 
     def add(self, short_name: str = "", long_name: str = "") -> GTFSRouteEntry:
         """ Create a new entry with the given short_name and long_name. """
-        route = GTFSRouteEntry(self.agency_id, short_name, long_name)
+        route = GTFSRouteEntry(self.agency_id, short_name, long_name,
+                               uid_generator=self.uid_generator)
         return super()._add(route)
 
     def get(self, short_name: str, long_name: str) -> GTFSRouteEntry:
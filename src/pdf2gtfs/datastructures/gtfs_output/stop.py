@@ -6,14 +6,17 @@ import logging
 from dataclasses import dataclass, Field
 from enum import IntEnum
 from pathlib import Path
-
-import pandas as pd
+from typing import Mapping, TYPE_CHECKING
 
 from pdf2gtfs.config import Config
 from pdf2gtfs.datastructures.gtfs_output import BaseContainer, BaseDataClass
 from pdf2gtfs.utils import normalize_name
 
 
+if TYPE_CHECKING:
+    from pdf2gtfs.utils import _UIDGenerator
+
+
 MAX_EDIT_DISTANCE = 3
 logger = logging.getLogger(__name__)
 
@@ -119,8 +122,9 @@ class GTFSStopEntry(BaseDataClass):
     location_type: LocationType
     wheelchair_boarding: WheelchairBoarding
 
-    def __init__(self, name: str, stop_id: str = None) -> None:
-        super().__init__(stop_id)
+    def __init__(self, name: str, stop_id: str = None,
+                 uid_generator: _UIDGenerator | None = None) -> None:
+        super().__init__(stop_id, uid_generator)
         self.stop_id = self.id
         self.stop_name = name
         self.normalized_name = normalize_name(name)
@@ -159,8 +163,8 @@ class GTFSStopEntry(BaseDataClass):
         return super().get_field_value(field)
 
     @staticmethod
-    def from_series(s: pd.Series) -> GTFSStopEntry:
-        """ Creates a new GTFSStop from the given series. """
+    def from_series(s: Mapping[str, str]) -> GTFSStopEntry:
+        """ Creates a new GTFSStopEntry from the given row. """
         stop = GTFSStopEntry(s["stop_name"], s["stop_id"])
         try:
             lat = float(s["stop_lat"])
@@ -178,11 +182,38 @@ class GTFSStopEntry(BaseDataClass):
 
 
 class GTFSStops(BaseContainer):
-    """ Used to create the 'stops.txt'. """
+    """ Used to create the 'stops.txt'.
+
+    The stops are indexed by both their normalized name and their stop_id.
+    Like the index of the BaseContainer, entries appended directly to the
+    entries are added to the indexes, but if the stop_id of an entry is
+    changed directly, either set_stop_id or invalidate_index need to be used.
+    """
     entries: list[GTFSStopEntry]
 
-    def __init__(self, path: Path) -> None:
-        super().__init__("stops.txt", GTFSStopEntry, path)
+    def __init__(self, path: Path,
+                 uid_generator: _UIDGenerator | None = None) -> None:
+        self._name_index: dict[str, GTFSStopEntry] = {}
+        self._stop_id_index: dict[str, GTFSStopEntry] = {}
+        self._lookup_count = 0
+        super().__init__("stops.txt", GTFSStopEntry, path, uid_generator)
+
+    def invalidate_index(self) -> None:
+        """ Invalidate the index and the lookups of the entries. """
+        super().invalidate_index()
+        self._name_index = {}
+        self._stop_id_index = {}
+        self._lookup_count = 0
+
+    def _update_lookups(self) -> None:
+        """ Add the entries, that were added since the last update,
+        to the name and stop_id indexes. """
+        if self._lookup_count > len(self.entries):
+            self.invalidate_index()
+        for entry in self.entries[self._lookup_count:]:
+            self._name_index.setdefault(entry.normalized_name, entry)
+            self._stop_id_index.setdefault(entry.stop_id, entry)
+        self._lookup_count = len(self.entries)
 
     def add(self, stop_name: str) -> None:
         """ Add a GTFSStop with the given stop_name. """
@@ -190,26 +221,37 @@ class GTFSStops(BaseContainer):
         if entry:
             entry.used_in_timetable = True
             return
-        entry = GTFSStopEntry(stop_name)
+        entry = GTFSStopEntry(stop_name, uid_generator=self.uid_generator)
         entry.used_in_timetable = True
         super()._add(entry)
 
-    def get(self, stop_name: str) -> GTFSStopEntry:
+    def get(self, stop_name: str) -> GTFSStopEntry | None:
         """ Return the GTFSStop with the given stop_name. """
-        for entry in self.entries:
-            if entry.normalized_name != normalize_name(stop_name):
-                continue
-            return entry
+        self._update_lookups()
+        return self._name_index.get(normalize_name(stop_name))
 
     def get_by_stop_id(self, stop_id: str) -> GTFSStopEntry:
         """ Return the GTFSStop with the given stop_id.
 
         If no such GTFSStop exists, a KeyError is raised.
         """
-        for entry in self.entries:
-            if entry.stop_id == stop_id:
-                return entry
-        raise KeyError(f"No stop with stop_id '{stop_id}'.")
+        self._update_lookups()
+        entry = self._stop_id_index.get(stop_id)
+        if entry is not None and entry.stop_id != stop_id:
+            # The stop_id was changed directly.
+            self.invalidate_index()
+            return self.get_by_stop_id(stop_id)
+        if entry is None:
+            raise KeyError(f"No stop with stop_id '{stop_id}'.")
+        return entry
+
+    def set_stop_id(self, entry: GTFSStopEntry, stop_id: str) -> None:
+        """ Change the stop_id of the given entry and update the index. """
+        self._update_lookups()
+        if self._stop_id_index.get(entry.stop_id) is entry:
+            del self._stop_id_index[entry.stop_id]
+        entry.stop_id = stop_id
+        self._stop_id_index.setdefault(stop_id, entry)
 
     def get_existing_stops(self, stop_ids: list[str]
                            ) -> dict[str, tuple[float, float]]:
@@ -3,30 +3,74 @@
 from __future__ import annotations
 
 import logging
+from abc import ABC, abstractmethod
 from dataclasses import dataclass, fields
 from datetime import datetime as dt
-from itertools import cycle
+from itertools import cycle, groupby
+from operator import attrgetter
 from pathlib import Path
 from statistics import mean
+from typing import (
+    Hashable, Iterable, Iterator, Mapping, TYPE_CHECKING, TypeAlias)
 
+import numpy as np
 import pandas as pd
 
 from pdf2gtfs.config import Config
-from pdf2gtfs.datastructures.gtfs_output import BaseContainer, BaseDataClass
+from pdf2gtfs.datastructures.gtfs_output import (
+    BaseContainer, BaseDataClass, str_wrap)
 from pdf2gtfs.datastructures.gtfs_output.stop import GTFSStops
 from pdf2gtfs.datastructures.gtfs_output.trips import Trip_Factory
 from pdf2gtfs.datastructures.timetable.stops import Stop
 
 
+if TYPE_CHECKING:
+    from pdf2gtfs.datastructures.gtfs_output.frequencies import (
+        GTFSFrequencies)
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
 class Time:
-    """ Dataclass used to compare and convert times. """
-    hours: int = 0
-    minutes: int = 0
-    seconds: int = 0
+    """ A time of a service day, which can be greater than 24 hours.
+
+    Stored as the number of seconds since the start of the service day.
+    """
+    __slots__ = ("total_seconds",)
+
+    def __init__(self, hours: int = 0, minutes: int = 0, seconds: int = 0
+                 ) -> None:
+        self._set(hours, minutes, seconds)
+
+    def _set(self, hours: int, minutes: int, seconds: int) -> None:
+        self.total_seconds = int(hours * 3600 + minutes * 60 + seconds)
+
+    @property
+    def hours(self) -> int:
+        """ The (full) hours. """
+        return self.total_seconds // 3600
+
+    @hours.setter
+    def hours(self, hours: int) -> None:
+        self._set(hours, self.minutes, self.seconds)
+
+    @property
+    def minutes(self) -> int:
+        """ The (full) minutes, without the hours. """
+        return self.total_seconds // 60 % 60
+
+    @minutes.setter
+    def minutes(self, minutes: int) -> None:
+        self._set(self.hours, minutes, self.seconds)
+
+    @property
+    def seconds(self) -> int:
+        """ The seconds, without the hours and minutes. """
+        return self.total_seconds % 60
+
+    @seconds.setter
+    def seconds(self, seconds: int) -> None:
+        self._set(self.hours, self.minutes, seconds)
 
     @staticmethod
     def from_string(time_string: str, fmt: str = None) -> Time:
@@ -51,70 +95,53 @@ class Time:
 
     def to_output(self) -> str:
         """ Returns the time in ISO-8601 format. """
-        return f"{self.hours:02}:{self.minutes:02}:{self.seconds:02}"
+        minutes, seconds = divmod(self.total_seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours:02}:{minutes:02}:{seconds:02}"
 
     def copy(self) -> Time:
         """ Returns a new Time object with the same values. """
-        return Time(self.hours, self.minutes, self.seconds)
+        return Time(seconds=self.total_seconds)
 
     def __repr__(self) -> str:
         return f"'{self.to_output()}'"
 
     def __bool__(self) -> bool:
-        return bool(self.hours or self.minutes or self.seconds)
+        return self.total_seconds != 0
 
     def __radd__(self, other) -> Time:
         return self.__add__(other)
 
     def __add__(self, other: Time) -> Time:
-        seconds = self.seconds + other.seconds
-        minute_delta = seconds // 60
-        minutes = self.minutes + other.minutes + minute_delta
-        hour_delta = minutes // 60
-        hours = self.hours + other.hours + hour_delta
-        return Time(hours,
-                    minutes - hour_delta * 60,
-                    seconds - minute_delta * 60)
+        return Time(seconds=self.total_seconds + other.total_seconds)
 
     def __eq__(self, other: Time) -> bool:
-        return (self.hours == other.hours and
-                self.minutes == other.minutes and
-                self.seconds == other.seconds)
+        if not isinstance(other, Time):
+            return NotImplemented
+        return self.total_seconds == other.total_seconds
+
+    def __hash__(self) -> int:
+        return hash(self.total_seconds)
 
     def __lt__(self, other: Time) -> bool:
-        if self.hours != other.hours:
-            return self.hours < other.hours
-        if self.minutes != other.minutes:
-            return self.minutes < other.minutes
-        return self.seconds < other.seconds
+        return self.total_seconds < other.total_seconds
 
     def __le__(self, other: Time) -> bool:
-        return self == other or self < other
+        return self.total_seconds <= other.total_seconds
 
     def __gt__(self, other: Time) -> bool:
-        return not self <= other
+        return self.total_seconds > other.total_seconds
 
     def __sub__(self, other: Time) -> Time:
         if not isinstance(other, Time):
             raise TypeError(f"Can only substract Time from "
                             f"Time, not '{type(other)}'.")
-        hours = self.hours - other.hours
-        minutes = self.minutes - other.minutes
-        seconds = self.seconds - other.seconds
-        if seconds < 0:
-            minutes += seconds // 60
-            seconds = seconds % 60
-        if minutes < 0:
-            hours += minutes // 60
-            minutes = minutes % 60
-        time = Time(hours, minutes, seconds)
-        if time < Time():
-            return Time()
-        return time
+        # Negative times are not allowed.
+        return Time(seconds=max(0, self.total_seconds - other.total_seconds))
 
     def to_hours(self) -> float:
         """ Returns a float describing the time in hours. """
-        return self.hours + self.minutes / 60 + self.seconds / 3600
+        return self.total_seconds / 3600
 
     @staticmethod
     def from_hours(hours: float) -> Time:
@@ -148,14 +175,22 @@ class GTFSStopTimesEntry(BaseDataClass):
         self.arrival_time = arrival_time
         self.departure_time = departure_time or arrival_time.copy()
 
-    def duplicate(self, trip_id: str) -> GTFSStopTimesEntry:
-        """ Return a new instance of this entry with the given trip_id. """
+    def duplicate(self, trip_id: str, offset: int = 0
+                  ) -> GTFSStopTimesEntry:
+        """ Return a new instance of this entry with the given trip_id.
+
+        :param trip_id: The trip_id of the new entry.
+        :param offset: The number of seconds the times are shifted by.
+        :return: The new entry.
+        """
+        arrival = Time(seconds=self.arrival_time.total_seconds + offset)
+        departure = Time(seconds=self.departure_time.total_seconds + offset)
         return GTFSStopTimesEntry(trip_id, self.stop_id, self.stop_sequence,
-                                  self.arrival_time, self.departure_time)
+                                  arrival, departure)
 
     @staticmethod
-    def from_series(s: pd.Series) -> GTFSStopTimesEntry:
-        """ Creates a new GTFSTrip from the given series. """
+    def from_series(s: Mapping[str, str]) -> GTFSStopTimesEntry:
+        """ Creates a new GTFSStopTimesEntry from the given row. """
         arr_time = Time.from_gtfs(s["arrival_time"])
         dep_time = Time.from_gtfs(s["departure_time"])
         return GTFSStopTimesEntry(s["trip_id"], s["stop_id"],
@@ -168,6 +203,16 @@ class GTFSStopTimesEntry(BaseDataClass):
         return True
 
 
+def gtfs_times_to_seconds(times: pd.Series) -> np.ndarray:
+    """ Return the number of seconds of each of the gtfs time strings.
+
+    Like Time.from_gtfs, invalid time strings are treated as 0.
+    """
+    parts = times.str.extract(r"^\s*(\d+):(\d+):(\d+)\s*$").astype(float)
+    seconds = parts[0] * 3600 + parts[1] * 60 + parts[2]
+    return seconds.fillna(0).to_numpy(dtype=np.int64)
+
+
 def get_repeat_deltas(deltas: list[int]) -> cycle[Time]:
     """ Return a cycle of the repeat deltas, depending on the strategy. """
     if Config.repeat_strategy == "mean":
@@ -175,12 +220,40 @@ def get_repeat_deltas(deltas: list[int]) -> cycle[Time]:
     return cycle([Time.from_minutes(delta) for delta in deltas])
 
 
-class GTFSStopTimes(BaseContainer):
-    """ Used to create the 'stop_times.txt.'. """
+def get_repeat_offsets(start: int, end: int, deltas: list[int]) -> list[int]:
+    """ Return the offsets of all trips created by a repeat column.
+
+    :param start: The time (in seconds) of the trip before the column.
+    :param end: The time (in seconds) of the trip after the column.
+    :param deltas: The deltas (in minutes) between two trips.
+    :return: The offsets (in seconds) relative to start, of every
+        repeated trip that occurs before end.
+    """
+    delta_cycle = get_repeat_deltas(deltas)
+    delta_seconds = [next(delta_cycle).total_seconds for _ in deltas]
+    if sum(delta_seconds) <= 0:
+        logger.warning(f"Can not repeat trips using the deltas {deltas}.")
+        return []
+    offsets = []
+    offset = 0
+    for delta in cycle(delta_seconds):
+        offset += delta
+        if start + offset >= end:
+            break
+        offsets.append(offset)
+    return offsets
+
+
+class StopTimesMixin(ABC):
+    """ Methods used by both the GTFSStopTimes and the TripStopTimes. """
     entries: list[GTFSStopTimesEntry]
 
-    def __init__(self, path: Path) -> None:
-        super().__init__("stop_times.txt", GTFSStopTimesEntry, path)
+    @abstractmethod
+    def _add(self, entry: GTFSStopTimesEntry) -> GTFSStopTimesEntry:
+        """ Add the entry, unless an equal entry exists already.
+
+        :return: The existing entry or the added entry.
+        """
 
     def add(self, trip_id: str, stop_id: str, sequence: int,
             arrival: Time, departure: Time = None) -> GTFSStopTimesEntry:
@@ -208,34 +281,37 @@ class GTFSStopTimes(BaseContainer):
             time = Time.from_string(time_string)
             if time < prev_time:
                 service_day_delta += Time(24)
-            prev_time = time.copy()
+            prev_time = time
             time += service_day_delta
 
             # Consecutive stops with the same name indicate arrival/departure
             if last_gtfs_stop and last_gtfs_stop == gtfs_stop:
-                last_entry.departure_time = time
+                self._set_departure_time(last_entry, time)
                 continue
 
             last_gtfs_stop = gtfs_stop
-            stop_id = gtfs_stops.get(stop.normalized_name).stop_id
-            last_entry = self.add(trip_id, stop_id, seq, time)
+            last_entry = self.add(trip_id, gtfs_stop.stop_id, seq, time)
             entries.append(last_entry)
 
         return entries
 
-    def merge(self, other: GTFSStopTimes):
-        """ Merge two stop_times files.
+    @staticmethod
+    def _set_departure_time(entry: GTFSStopTimesEntry, time: Time) -> None:
+        """ Set the departure time of an entry, that was already added. """
+        entry.departure_time = time
 
-        No actual merging happens.
-        """
-        self.entries += other.entries
+    def _duplicate_with_trip_id(self, trip_id: str, offset: int = 0
+                                ) -> TripStopTimes:
+        """ Creates a new instance with updated copies of the entries.
 
-    def _duplicate_with_trip_id(self, trip_id) -> GTFSStopTimes:
-        """ Creates a new instance with updated copies of the entries. """
-        new = GTFSStopTimes(self.fp.parent)
+        :param trip_id: The trip_id of the copies.
+        :param offset: The number of seconds the copies are shifted by.
+        :return: The stop times of the new trip.
+        """
+        new = TripStopTimes()
 
         for entry in self.entries:
-            new._add(entry.duplicate(trip_id))
+            new._add(entry.duplicate(trip_id, offset))
         return new
 
     def shift(self, amount: Time):
@@ -245,23 +321,53 @@ class GTFSStopTimes(BaseContainer):
             entry.departure_time += amount
 
     @staticmethod
-    def add_repeat(previous: GTFSStopTimes, next_: GTFSStopTimes,
-                   deltas: list[int], trip_factory: Trip_Factory):
-        """ Create new stop_times for all times between previous and next. """
+    def add_repeat(previous: StopTimesMixin, next_: StopTimesMixin,
+                   deltas: list[int], trip_factory: Trip_Factory
+                   ) -> list[TripStopTimes]:
+        """ Create new stop_times for all times between previous and next.
+
+        The offsets of all new trips are calculated upfront, using the
+        arrival times at the first stop shared by previous and next_.
+        """
         assert previous < next_
-        delta_cycle = get_repeat_deltas(deltas)
-        new_stop_times = []
+        start, end = previous._get_first_shared_arrivals(next_)
+        offsets = get_repeat_offsets(
+            start.total_seconds, end.total_seconds, deltas)
+        return [previous._duplicate_with_trip_id(trip_factory().trip_id,
+                                                 offset)
+                for offset in offsets]
 
-        while True:
-            trip = trip_factory()
-            new = previous._duplicate_with_trip_id(trip.trip_id)
-            new.shift(next(delta_cycle))
-            if new > next_:
-                break
-            new_stop_times.append(new)
-            previous = new
+    @staticmethod
+    def add_repeat_as_frequency(
+            previous: StopTimesMixin, next_: StopTimesMixin,
+            deltas: list[int], trip_factory: Trip_Factory,
+            frequencies: GTFSFrequencies) -> list[TripStopTimes]:
+        """ Create a template trip for all times between previous and next.
+
+        The template trip is repeated using a single frequency. If the trips
+        are not evenly spaced (e.g. because of the 'cycle' repeat_strategy),
+        all trips are created instead, using add_repeat.
+        """
+        assert previous < next_
+        start, end = previous._get_first_shared_arrivals(next_)
+        offsets = get_repeat_offsets(
+            start.total_seconds, end.total_seconds, deltas)
+        if not offsets:
+            return []
+        headway = offsets[0]
+        if any(offset != headway * (i + 1)
+               for i, offset in enumerate(offsets)):
+            logger.info("Could not use a frequency for the repeat column, "
+                        "because its trips are not evenly spaced.")
+            return StopTimesMixin.add_repeat(
+                previous, next_, deltas, trip_factory)
 
-        return new_stop_times
+        trip_id = trip_factory().trip_id
+        template = previous._duplicate_with_trip_id(trip_id, headway)
+        start_time = template.entries[0].arrival_time
+        end_time = start_time + Time(seconds=headway * len(offsets))
+        frequencies.add(trip_id, start_time, end_time, headway)
+        return [template]
 
     def _get_entry_from_stop_id(self, stop_id: str
                                 ) -> GTFSStopTimesEntry | None:
@@ -270,37 +376,733 @@ class GTFSStopTimes(BaseContainer):
                 return entry
         return None
 
-    def __lt__(self, other: GTFSStopTimes):
+    def _get_first_shared_arrivals(self, other: StopTimesMixin
+                                   ) -> tuple[Time, Time] | None:
+        """ Return the arrival times of both self and other, at the first
+        stop of self, that is used by other as well. """
+        other_entries = {}
+        for other_entry in other.entries:
+            other_entries.setdefault(other_entry.stop_id, other_entry)
         for entry in self.entries:
-            other_entry = other._get_entry_from_stop_id(entry.stop_id)
-            if not other_entry:
-                continue
-            return entry.arrival_time < other_entry.arrival_time
+            other_entry = other_entries.get(entry.stop_id)
+            if other_entry is not None:
+                return entry.arrival_time, other_entry.arrival_time
+        return None
 
-        return False
+    def __lt__(self, other: StopTimesMixin):
+        arrivals = self._get_first_shared_arrivals(other)
+        return arrivals is not None and arrivals[0] < arrivals[1]
 
-    def __le__(self, other: GTFSStopTimes):
+    def __le__(self, other: StopTimesMixin):
         return self == other or self < other
 
-    def __gt__(self, other: GTFSStopTimes):
+    def __gt__(self, other: StopTimesMixin):
         return not self.__lt__(other) and not self.__eq__(other)
 
-    def __ge__(self, other: GTFSStopTimes):
+    def __ge__(self, other: StopTimesMixin):
         return self == other or self > other
 
-    def get_with_stop_id(self, trip_ids: list[str], stop_id: str
+
+class TripStopTimes(StopTimesMixin):
+    """ The stop times of a single trip.
+
+    Unlike the GTFSStopTimes, this is not backed by a file, i.e. creating
+    it does not read the input files. Used as a buffer for the stop times
+    of a trip, before they are merged into the GTFSStopTimes.
+    """
+
+    def __init__(self) -> None:
+        self.entries: list[GTFSStopTimesEntry] = []
+        self._index: dict[Hashable, GTFSStopTimesEntry] = {}
+
+    def _add(self, entry: GTFSStopTimesEntry) -> GTFSStopTimesEntry:
+        key = entry.get_key()
+        existing_entry = self._index.get(key)
+        if existing_entry is not None and existing_entry == entry:
+            return existing_entry
+        self._index[key] = entry
+        self.entries.append(entry)
+        return entry
+
+    def _set_departure_time(self, entry: GTFSStopTimesEntry, time: Time
+                            ) -> None:
+        """ Set the departure time and update the key of the entry. """
+        if self._index.get(entry.get_key()) is entry:
+            del self._index[entry.get_key()]
+        entry.departure_time = time
+        self._index.setdefault(entry.get_key(), entry)
+
+    def shift(self, amount: Time):
+        """ Shift all entries by the given amount. """
+        super().shift(amount)
+        self._index = {entry.get_key(): entry for entry in self.entries}
+
+    def get_signature(self) -> tuple[tuple[str, int, int, int], ...]:
+        """ Return the stop_id, stop_sequence, arrival and departure
+        (in seconds) of each entry. Unlike the entries, the signature
+        does not depend on the trip_id. """
+        return tuple((entry.stop_id, entry.stop_sequence,
+                      entry.arrival_time.total_seconds,
+                      entry.departure_time.total_seconds)
+                     for entry in self.entries)
+
+    def __eq__(self, other: StopTimesMixin) -> bool:
+        if len(self.entries) != len(other.entries):
+            return False
+        return all(entry1 == entry2 for entry1, entry2
+                   in zip(self.entries, other.entries))
+
+    def __iter__(self) -> Iterator[GTFSStopTimesEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}: {self.entries!r}"
+
+
+# The stop_ids and stop_sequences of the stop times of a trip.
+Pattern: TypeAlias = tuple[tuple[str, ...], tuple[int, ...]]
+
+
+class _TripBlock:
+    """ Consecutive stop times of a single trip.
+
+    The stop_ids and stop_sequences are stored in the pattern, while the
+    arrival and departure times are stored as seconds in arrays. While
+    entries are appended to the block, the times are stored in lists and
+    the block has no pattern.
+    """
+    __slots__ = ("trip_id", "pattern_id", "arrivals", "departures")
+
+    def __init__(self, trip_id: str, pattern_id: int,
+                 arrivals: np.ndarray, departures: np.ndarray) -> None:
+        self.trip_id = trip_id
+        self.pattern_id = pattern_id
+        self.arrivals = arrivals
+        self.departures = departures
+
+    def __len__(self) -> int:
+        return len(self.arrivals)
+
+
+class StopTimeView(GTFSStopTimesEntry):
+    """ A single stop time of a TripPatternStore.
+
+    Behaves like a GTFSStopTimesEntry, but reads its values from and writes
+    them to the store. Because the times are created on access, changing
+    the returned Time does not change the store; the time needs to be set.
+    Unlike other entries, a view has no id, because creating the views
+    would use up the ids of the UIDGenerator otherwise.
+    """
+
+    # noinspection PyMissingConstructor
+    def __init__(self, store: TripPatternStore, block: _TripBlock, pos: int
+                 ) -> None:
+        self._store = store
+        self._block = block
+        self._pos = pos
+
+    @property
+    def trip_id(self) -> str:
+        """ The trip_id of the trip of the stop time. """
+        return self._block.trip_id
+
+    @property
+    def stop_id(self) -> str:
+        """ The stop_id, stored in the pattern of the trip. """
+        return self._store.get_pattern(self._block)[0][self._pos]
+
+    @stop_id.setter
+    def stop_id(self, stop_id: str) -> None:
+        self._store.set_pattern_value(self._block, self._pos, 0, stop_id)
+
+    @property
+    def stop_sequence(self) -> int:
+        """ The stop_sequence, stored in the pattern of the trip. """
+        return self._store.get_pattern(self._block)[1][self._pos]
+
+    @stop_sequence.setter
+    def stop_sequence(self, sequence: int) -> None:
+        self._store.set_pattern_value(self._block, self._pos, 1, sequence)
+
+    @property
+    def arrival_time(self) -> Time:
+        """ The arrival time, stored in the arrivals of the trip. """
+        return Time(seconds=int(self._block.arrivals[self._pos]))
+
+    @arrival_time.setter
+    def arrival_time(self, time: Time) -> None:
+        self._store.set_time(self._block, self._pos, 0, time.total_seconds)
+
+    @property
+    def departure_time(self) -> Time:
+        """ The departure time, stored in the departures of the trip. """
+        return Time(seconds=int(self._block.departures[self._pos]))
+
+    @departure_time.setter
+    def departure_time(self, time: Time) -> None:
+        self._store.set_time(self._block, self._pos, 1, time.total_seconds)
+
+
+class TripPatternStore:
+    """ Columnar storage for the stop times of many trips.
+
+    Most trips of a timetable visit the same stops in the same order.
+    These trips share a pattern, which contains the stop_ids and the
+    stop_sequences. For each trip, only the arrival and departure times
+    are stored, in arrays. The stop times are accessed using StopTimeViews.
+
+    Entries appended one at a time are added to the open block, which
+    stores its values in lists. The open block is closed, i.e. its pattern
+    is interned and its times are turned into arrays, before the store is
+    accessed in any other way.
+    """
+
+    def __init__(self) -> None:
+        self.patterns: list[Pattern | None] = []
+        self._pattern_ids: dict[Pattern, int] = {}
+        self._pattern_usage: list[int] = []
+        self.blocks: list[_TripBlock] = []
+        self._trip_blocks: dict[str, list[int]] = {}
+        # Secondary indexes, mapping stop_ids to positions/blocks.
+        self._stop_positions: dict[int, dict[str, list[int]]] = {}
+        self._stop_blocks: dict[str, list[int]] | None = None
+        self._length = 0
+        self._views: tuple[StopTimeView, ...] | None = None
+        # The block entries are appended to and its stop_ids/sequences.
+        self._open_block: _TripBlock | None = None
+        self._open_pattern: tuple[list[str], list[int]] = ([], [])
+        self._open_index: dict[tuple[str, int, int, int], int] = {}
+
+    def _intern(self, pattern: Pattern) -> int:
+        """ Return the id of the given pattern, adding it if necessary. """
+        pattern_id = self._pattern_ids.get(pattern)
+        if pattern_id is None:
+            pattern_id = len(self.patterns)
+            self._pattern_ids[pattern] = pattern_id
+            self.patterns.append(pattern)
+            self._pattern_usage.append(0)
+        self._pattern_usage[pattern_id] += 1
+        return pattern_id
+
+    def _release(self, pattern_id: int) -> None:
+        """ Remove the pattern, if it is no longer used by any block. """
+        self._pattern_usage[pattern_id] -= 1
+        if self._pattern_usage[pattern_id] > 0:
+            return
+        del self._pattern_ids[self.patterns[pattern_id]]
+        self.patterns[pattern_id] = None
+        self._stop_positions.pop(pattern_id, None)
+
+    def _set_pattern(self, block: _TripBlock, pattern: Pattern) -> None:
+        old_pattern_id = block.pattern_id
+        block.pattern_id = self._intern(pattern)
+        self._release(old_pattern_id)
+        self._stop_blocks = None
+
+    def _open(self, block: _TripBlock) -> None:
+        """ Allow appending stop times to the given (last) block. """
+        if block.pattern_id is not None:
+            stop_ids, sequences = self.patterns[block.pattern_id]
+            self._release(block.pattern_id)
+            block.pattern_id = None
+            block.arrivals = block.arrivals.tolist()
+            block.departures = block.departures.tolist()
+            self._stop_blocks = None
+        else:
+            stop_ids, sequences = (), ()
+        self._open_block = block
+        self._open_pattern = list(stop_ids), list(sequences)
+        self._open_index = {}
+        values = zip(stop_ids, sequences, block.arrivals, block.departures)
+        for pos, key in enumerate(values):
+            self._open_index.setdefault(key, pos)
+
+    def _close(self) -> None:
+        """ Intern the pattern of the open block and turn its times into
+        arrays. Needs to be called, before the store is accessed. """
+        block = self._open_block
+        if block is None:
+            return
+        self._open_block = None
+        self._open_index = {}
+        stop_ids, sequences = self._open_pattern
+        block.pattern_id = self._intern((tuple(stop_ids), tuple(sequences)))
+        block.arrivals = np.array(block.arrivals, dtype=np.int64)
+        block.departures = np.array(block.departures, dtype=np.int64)
+        self._stop_blocks = None
+
+    def get_pattern(self, block: _TripBlock) -> Pattern:
+        """ Return the pattern of the given block. """
+        if block is self._open_block:
+            self._close()
+        return self.patterns[block.pattern_id]
+
+    def _get_stop_positions(self, pattern_id: int) -> dict[str, list[int]]:
+        """ Return the positions of each stop_id in the given pattern. """
+        positions = self._stop_positions.get(pattern_id)
+        if positions is None:
+            positions = {}
+            for pos, stop_id in enumerate(self.patterns[pattern_id][0]):
+                positions.setdefault(stop_id, []).append(pos)
+            self._stop_positions[pattern_id] = positions
+        return positions
+
+    def _add_to_stop_blocks(self, block_id: int) -> None:
+        pattern_id = self.blocks[block_id].pattern_id
+        for stop_id in self._get_stop_positions(pattern_id):
+            self._stop_blocks.setdefault(stop_id, []).append(block_id)
+
+    def _get_stop_blocks(self) -> dict[str, list[int]]:
+        """ Return the ids of the blocks that use each stop_id. """
+        if self._stop_blocks is None:
+            self._stop_blocks = {}
+            for block_id in range(len(self.blocks)):
+                self._add_to_stop_blocks(block_id)
+        return self._stop_blocks
+
+    def set_pattern_value(self, block: _TripBlock, pos: int,
+                          column: int, value: str | int) -> None:
+        """ Set the stop_id (column 0) or stop_sequence (column 1) of the
+        stop time at pos of the block.
+
+        :param block: The block of the stop time.
+        :param pos: The position of the stop time in the block.
+        :param column: The column of the value in the pattern.
+        :param value: The new value.
+        """
+        pattern = list(self.get_pattern(block))
+        values = list(pattern[column])
+        values[pos] = value
+        pattern[column] = tuple(values)
+        self._set_pattern(block, tuple(pattern))
+
+    def set_time(self, block: _TripBlock, pos: int, column: int,
+                 seconds: int) -> None:
+        """ Set the arrival (column 0) or departure (column 1) time of the
+        stop time at pos of the block.
+
+        If the block is open, the stop time is moved to its new key in the
+        index of the open block.
+        """
+        times = block.departures if column else block.arrivals
+        if block is not self._open_block:
+            times[pos] = seconds
+            return
+        stop_ids, sequences = self._open_pattern
+        key = (stop_ids[pos], sequences[pos],
+               block.arrivals[pos], block.departures[pos])
+        if self._open_index.get(key) == pos:
+            del self._open_index[key]
+        times[pos] = seconds
+        key = (stop_ids[pos], sequences[pos],
+               block.arrivals[pos], block.departures[pos])
+        self._open_index.setdefault(key, pos)
+
+    def _rebuild_trip_blocks(self) -> None:
+        self._trip_blocks = {}
+        for i, block in enumerate(self.blocks):
+            self._trip_blocks.setdefault(block.trip_id, []).append(i)
+
+    def add_block(self, trip_id: str, stop_ids: Iterable[str],
+                  sequences: Iterable[int], arrivals: Iterable[int],
+                  departures: Iterable[int]) -> _TripBlock:
+        """ Add the stop times of a trip.
+
+        :param trip_id: The trip_id of all stop times.
+        :param stop_ids: The stop_ids of the stop times.
+        :param sequences: The stop_sequences of the stop times.
+        :param arrivals: The arrival times, in seconds.
+        :param departures: The departure times, in seconds.
+        :return: The new block, containing the stop times.
+        """
+        self._close()
+        pattern_id = self._intern((tuple(stop_ids), tuple(sequences)))
+        block = _TripBlock(trip_id, pattern_id,
+                           np.array(arrivals, dtype=np.int64),
+                           np.array(departures, dtype=np.int64))
+        self._trip_blocks.setdefault(trip_id, []).append(len(self.blocks))
+        self.blocks.append(block)
+        if self._stop_blocks is not None:
+            self._add_to_stop_blocks(len(self.blocks) - 1)
+        self._length += len(block)
+        self._views = None
+        return block
+
+    def add_entries(self, entries: Iterable[GTFSStopTimesEntry]) -> None:
+        """ Add the entries, adding a block for each consecutive run of
+        entries with the same trip_id. """
+        for trip_id, group in groupby(entries, attrgetter("trip_id")):
+            group = list(group)
+            self.add_block(
+                trip_id,
+                [entry.stop_id for entry in group],
+                [entry.stop_sequence for entry in group],
+                [entry.arrival_time.total_seconds for entry in group],
+                [entry.departure_time.total_seconds for entry in group])
+
+    def add_columns(self, trip_ids: list[str], stop_ids: list[str],
+                    sequences: list[int], arrivals: np.ndarray,
+                    departures: np.ndarray) -> None:
+        """ Add the stop times given as columns, adding a block for each
+        consecutive run of stop times with the same trip_id.
+
+        :param trip_ids: The trip_id of each stop time.
+        :param stop_ids: The stop_id of each stop time.
+        :param sequences: The stop_sequence of each stop time.
+        :param arrivals: The arrival times, in seconds.
+        :param departures: The departure times, in seconds.
+        """
+        start = 0
+        for trip_id, group in groupby(trip_ids):
+            end = start + sum(1 for _ in group)
+            self.add_block(trip_id, stop_ids[start:end], sequences[start:end],
+                           arrivals[start:end], departures[start:end])
+            start = end
+
+    def append_entry(self, entry: GTFSStopTimesEntry) -> StopTimeView:
+        """ Append the entry to the last block, if it has the same trip_id.
+
+        Appending is done in constant time, by appending to the open block.
+
+        :param entry: The entry that is added.
+        :return: A view on the stop time that was added.
+        """
+        block = self.blocks[-1] if self.blocks else None
+        if block is None or block.trip_id != entry.trip_id:
+            self._close()
+            block = _TripBlock(entry.trip_id, None, [], [])
+            self._trip_blocks.setdefault(block.trip_id, []).append(
+                len(self.blocks))
+            self.blocks.append(block)
+        if block is not self._open_block:
+            self._close()
+            self._open(block)
+
+        arrival = entry.arrival_time.total_seconds
+        departure = entry.departure_time.total_seconds
+        stop_ids, sequences = self._open_pattern
+        key = entry.stop_id, entry.stop_sequence, arrival, departure
+        self._open_index.setdefault(key, len(block))
+        stop_ids.append(entry.stop_id)
+        sequences.append(entry.stop_sequence)
+        block.arrivals.append(arrival)
+        block.departures.append(departure)
+        self._length += 1
+        self._views = None
+        return StopTimeView(self, block, len(block) - 1)
+
+    def _find_position(self, entry: GTFSStopTimesEntry
+                       ) -> tuple[int, int] | None:
+        arrival = entry.arrival_time.total_seconds
+        departure = entry.departure_time.total_seconds
+        for block_id in self._trip_blocks.get(entry.trip_id, []):
+            block = self.blocks[block_id]
+            if block is self._open_block:
+                # Prevents closing the open block, when appending entries.
+                key = entry.stop_id, entry.stop_sequence, arrival, departure
+                pos = self._open_index.get(key)
+                if pos is not None:
+                    return block_id, pos
+                continue
+            stop_ids, sequences = self.patterns[block.pattern_id]
+            same_times = ((block.arrivals == arrival)
+                          & (block.departures == departure))
+            for pos in np.flatnonzero(same_times):
+                if (stop_ids[pos] == entry.stop_id
+                        and sequences[pos] == entry.stop_sequence):
+                    return block_id, int(pos)
+        return None
+
+    def find(self, entry: GTFSStopTimesEntry) -> StopTimeView | None:
+        """ Return a view on the first stop time equal to entry or None. """
+        position = self._find_position(entry)
+        if position is None:
+            return None
+        block_id, pos = position
+        return StopTimeView(self, self.blocks[block_id], pos)
+
+    def remove(self, entry: GTFSStopTimesEntry) -> None:
+        """ Remove the first stop time equal to entry, if it exists. """
+        self._close()
+        position = self._find_position(entry)
+        if position is None:
+            return
+        block_id, pos = position
+        block = self.blocks[block_id]
+        self._length -= 1
+        self._views = None
+        if len(block) == 1:
+            self._release(block.pattern_id)
+            del self.blocks[block_id]
+            self._rebuild_trip_blocks()
+            self._stop_blocks = None
+            return
+        stop_ids, sequences = self.patterns[block.pattern_id]
+        self._set_pattern(block, (stop_ids[:pos] + stop_ids[pos + 1:],
+                                  sequences[:pos] + sequences[pos + 1:]))
+        block.arrivals = np.delete(block.arrivals, pos)
+        block.departures = np.delete(block.departures, pos)
+
+    def get_travel_times(self, trip_ids: Iterable[str], stop_ids: list[str]
+                         ) -> list[int]:
+        """ Return the mean travel times between consecutive stops.
+
+        The durations are calculated for all blocks of a pattern at once.
+        Only positive durations are used for the mean.
+
+        :param trip_ids: The trip_ids of the trips that are used.
+        :param stop_ids: The stop_ids of the stops, in order.
+        :return: The mean travel time (in seconds) from each stop to the next
+            one. If the stop times of the two stops can not be paired, i.e.
+            some trip does not visit both stops in that order, or no duration
+            is positive, the travel time is 0.
+        """
+        self._close()
+        pair_count = max(len(stop_ids) - 1, 0)
+        sums = [0] * pair_count
+        counts = [0] * pair_count
+        aligned = [True] * pair_count
+
+        pattern_blocks: dict[int, list[_TripBlock]] = {}
+        for trip_id in set(trip_ids):
+            for block_id in self._trip_blocks.get(trip_id, []):
+                block = self.blocks[block_id]
+                pattern_blocks.setdefault(block.pattern_id, []).append(block)
+
+        for pattern_id, blocks in pattern_blocks.items():
+            positions = self._get_stop_positions(pattern_id)
+            sequences = self.patterns[pattern_id][1]
+            arrivals = np.vstack([block.arrivals for block in blocks])
+            departures = np.vstack([block.departures for block in blocks])
+            for i in range(pair_count):
+                starts = positions.get(stop_ids[i], [])
+                ends = positions.get(stop_ids[i + 1], [])
+                if len(starts) != len(ends) or any(
+                        sequences[start] >= sequences[end]
+                        for start, end in zip(starts, ends)):
+                    aligned[i] = False
+                    continue
+                if not starts:
+                    continue
+                durations = arrivals[:, ends] - departures[:, starts]
+                durations = durations[durations > 0]
+                sums[i] += int(durations.sum())
+                counts[i] += durations.size
+
+        return [round(sums[i] / counts[i]) if aligned[i] and counts[i] else 0
+                for i in range(pair_count)]
+
+    def get_trip_ids(self) -> set[str]:
+        """ Return the trip_ids of all stop times. """
+        return set(self._trip_blocks)
+
+    def _get_views(self, block_ids: Iterable[int]) -> Iterator[StopTimeView]:
+        self._close()
+        for block_id in block_ids:
+            block = self.blocks[block_id]
+            for pos in range(len(block)):
+                yield StopTimeView(self, block, pos)
+
+    def get_with_trip_id(self, trip_id: str) -> list[StopTimeView]:
+        """ Return views on all stop times with the given trip_id. """
+        return list(self._get_views(self._trip_blocks.get(trip_id, [])))
+
+    def get_views(self) -> tuple[StopTimeView, ...]:
+        """ Return views on all stop times, in the order they were added.
+
+        The views are cached until stop times are added or removed.
+        """
+        if self._views is None:
+            self._views = tuple(self)
+        return self._views
+
+    def get_with_stop_id(self, trip_ids: Iterable[str], stop_id: str
+                         ) -> list[StopTimeView]:
+        """ Return views on all stop times with the given stop_id, whose
+        trip_id is one of trip_ids.
+
+        Depending on which is smaller, either the blocks of the trips or
+        the blocks using the stop are checked.
+        """
+        self._close()
+        trip_ids = set(trip_ids)
+        stop_block_ids = self._get_stop_blocks().get(stop_id, [])
+        trip_block_ids = [block_id for trip_id in trip_ids
+                          for block_id in self._trip_blocks.get(trip_id, [])]
+        if len(trip_block_ids) < len(stop_block_ids):
+            block_ids = sorted(trip_block_ids)
+        else:
+            block_ids = stop_block_ids
+
+        views = []
+        for block_id in block_ids:
+            block = self.blocks[block_id]
+            if block.trip_id not in trip_ids:
+                continue
+            positions = self._get_stop_positions(block.pattern_id)
+            for pos in positions.get(stop_id, []):
+                views.append(StopTimeView(self, block, pos))
+        return views
+
+    def shift(self, seconds: int) -> None:
+        """ Shift the times of all stop times by the given seconds. """
+        self._close()
+        for block in self.blocks:
+            block.arrivals += seconds
+            block.departures += seconds
+
+    def replace_stop_ids(self, new_stop_ids: dict[str, str]) -> None:
+        """ Replace the stop_ids of all stop times in a single pass.
+
+        :param new_stop_ids: Maps the old stop_ids to the new ones.
+            All stop_ids are replaced at the same time, i.e. the new
+            stop_ids are not replaced again.
+        """
+        self._close()
+        # Each pattern is only updated once, regardless of its usage.
+        new_patterns: dict[int, Pattern | None] = {}
+        for block in self.blocks:
+            pattern_id = block.pattern_id
+            if pattern_id not in new_patterns:
+                stop_ids, sequences = self.patterns[pattern_id]
+                pattern = None
+                if any(stop_id in new_stop_ids for stop_id in stop_ids):
+                    stop_ids = tuple(new_stop_ids.get(stop_id, stop_id)
+                                     for stop_id in stop_ids)
+                    pattern = stop_ids, sequences
+                new_patterns[pattern_id] = pattern
+            if new_patterns[pattern_id] is not None:
+                self._set_pattern(block, new_patterns[pattern_id])
+
+    def to_output(self) -> Iterator[str]:
+        """ Return the stop times, as they would be found in a GTFS file.
+
+        The order of the values is the same as the one of the fields of
+        the GTFSStopTimesEntry.
+        """
+        def _wrap(value: str | int) -> str:
+            return str_wrap(value) if isinstance(value, str) else str(value)
+
+        self._close()
+        for block in self.blocks:
+            trip_id = _wrap(block.trip_id)
+            stop_ids, sequences = self.patterns[block.pattern_id]
+            times = zip(block.arrivals.tolist(), block.departures.tolist())
+            for stop_id, sequence, (arrival, departure) in zip(
+                    stop_ids, sequences, times):
+                arrival = Time(seconds=arrival).to_output()
+                departure = Time(seconds=departure).to_output()
+                yield (f"{trip_id},{arrival},{departure},"
+                       f"{_wrap(stop_id)},{_wrap(sequence)}")
+
+    def __iter__(self) -> Iterator[StopTimeView]:
+        return self._get_views(range(len(self.blocks)))
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class GTFSStopTimes(StopTimesMixin, BaseContainer):
+    """ Used to create the 'stop_times.txt.'.
+
+    The stop times are stored in a TripPatternStore; the entries are views
+    on the stop times of the store.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._store = TripPatternStore()
+        super().__init__("stop_times.txt", GTFSStopTimesEntry, path)
+
+    @property
+    def entries(self) -> tuple[StopTimeView, ...]:
+        """ Views on all stop times, in the order they were added.
+
+        The entries are read-only; use add/remove or set the entries instead.
+        """
+        return self._store.get_views()
+
+    @entries.setter
+    def entries(self, entries: list[GTFSStopTimesEntry]) -> None:
+        self._store = TripPatternStore()
+        self._store.add_entries(entries)
+        self.invalidate_index()
+
+    def load_input_files(self) -> None:
+        """ Add the stop times of the input files directly to the store,
+        without creating an entry for each of them. """
+        self._store = TripPatternStore()
+        for df in self.read_input_dfs():
+            self._store.add_columns(
+                df["trip_id"].tolist(), df["stop_id"].tolist(),
+                df["stop_sequence"].astype(int).tolist(),
+                gtfs_times_to_seconds(df["arrival_time"]),
+                gtfs_times_to_seconds(df["departure_time"]))
+        self.invalidate_index()
+
+    def _find(self, new_entry: GTFSStopTimesEntry) -> StopTimeView | None:
+        return self._store.find(new_entry)
+
+    def _add(self, entry: GTFSStopTimesEntry) -> GTFSStopTimesEntry:
+        existing_entry = self._find(entry)
+        if existing_entry is not None:
+            return existing_entry
+        return self._store.append_entry(entry)
+
+    def _extend(self, entries: list[GTFSStopTimesEntry]) -> None:
+        self._store.add_entries(entries)
+
+    def remove(self, entry: GTFSStopTimesEntry) -> None:
+        """ Remove the given entry, if it exists. """
+        self._store.remove(entry)
+
+    def merge(self, other: StopTimesMixin):
+        """ Merge two stop_times files.
+
+        No actual merging happens.
+        """
+        self._extend(other.entries)
+
+    def shift(self, amount: Time):
+        """ Shift all entries by the given amount. """
+        self._store.shift(amount.total_seconds)
+
+    def replace_stop_ids(self, new_stop_ids: dict[str, str]) -> None:
+        """ Replace the stop_ids of all entries, using the mapping of old
+        to new stop_ids. """
+        self._store.replace_stop_ids(new_stop_ids)
+
+    def get_trip_ids(self) -> set[str]:
+        """ Return the trip_ids used by any entry. """
+        return self._store.get_trip_ids()
+
+    def get_travel_times(self, trip_ids: Iterable[str], stop_ids: list[str]
+                         ) -> list[Time]:
+        """ Return the mean travel time between each pair of consecutive
+        stops, over all trips with the given trip_ids. """
+        travel_times = self._store.get_travel_times(trip_ids, stop_ids)
+        return [Time(seconds=seconds) for seconds in travel_times]
+
+    def get_with_stop_id(self, trip_ids: Iterable[str], stop_id: str
                          ) -> list[GTFSStopTimesEntry]:
-        """ Return all StopTimesEntries using the given stop_id. """
-        entries = []
-        for entry in self.entries:
-            if entry.stop_id == stop_id and entry.trip_id in trip_ids:
-                entries.append(entry)
-        return entries
+        """ Return all StopTimesEntries using the given stop_id, whose
+        trip_id is one of trip_ids. Uses the trip_id and stop_id indexes. """
+        return self._store.get_with_stop_id(trip_ids, stop_id)
 
     def get_with_trip_id(self, trip_id: str) -> list[GTFSStopTimesEntry]:
-        """ Return all StopTimesEntries using the given trip_id. """
-        stop_times = []
-        for stop_time in self.entries:
-            if stop_time.trip_id == trip_id:
-                stop_times.append(stop_time)
-        return stop_times
+        """ Return all StopTimesEntries using the given trip_id.
+        Uses the trip_id index. """
+        return self._store.get_with_trip_id(trip_id)
+
+    def get_output_lines(self) -> Iterator[str]:
+        """ Return the lines of the entries, as they would be found
+        within the gtfs file. """
+        return self._store.to_output()
+
+    def __iter__(self) -> Iterator[GTFSStopTimesEntry]:
+        return iter(self._store)
+
+    def __len__(self) -> int:
+        return len(self._store)
@@ -4,15 +4,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, TYPE_CHECKING, TypeAlias
-
-import pandas as pd
+from typing import Callable, Mapping, TYPE_CHECKING, TypeAlias
 
 from pdf2gtfs.datastructures.gtfs_output import BaseContainer, BaseDataClass
 
 
 if TYPE_CHECKING:
     from pdf2gtfs.datastructures.gtfs_output.stop_times import GTFSStopTimes
+    from pdf2gtfs.utils import _UIDGenerator
 
 Trip_Factory: TypeAlias = Callable[[], "GTFSTripsEntry"]
 
@@ -24,16 +23,16 @@ class GTFSTripsEntry(BaseDataClass):
     route_id: str
     service_id: str
 
-    def __init__(self, route_id: str, service_id: str, trip_id: str = None
-                 ) -> None:
-        super().__init__(trip_id)
+    def __init__(self, route_id: str, service_id: str, trip_id: str = None,
+                 uid_generator: _UIDGenerator | None = None) -> None:
+        super().__init__(trip_id, uid_generator)
         self.trip_id = self.id
         self.route_id = route_id
         self.service_id = service_id
 
     @staticmethod
-    def from_series(s: pd.Series) -> GTFSTripsEntry:
-        """ Creates a new GTFSTrip from the given series. """
+    def from_series(s: Mapping[str, str]) -> GTFSTripsEntry:
+        """ Creates a new GTFSTripsEntry from the given row. """
         return GTFSTripsEntry(s["route_id"], s["service_id"], s["trip_id"])
 
 
@@ -41,19 +40,16 @@ class GTFSTrips(BaseContainer):
     """ Used to create the 'trips.txt'. """
     entries: list[GTFSTripsEntry]
 
-    def __init__(self, path: Path) -> None:
-        super().__init__("trips.txt", GTFSTripsEntry, path)
+    def __init__(self, path: Path,
+                 uid_generator: _UIDGenerator | None = None) -> None:
+        super().__init__("trips.txt", GTFSTripsEntry, path, uid_generator)
 
     def add(self, route_id: str, service_id: str) -> GTFSTripsEntry:
         """ Add a single trip with the given route_id and service_id. """
-        entry = GTFSTripsEntry(route_id, service_id)
+        entry = GTFSTripsEntry(route_id, service_id,
+                               uid_generator=self.uid_generator)
         return self._add(entry)
 
-    def remove(self, entry: GTFSTripsEntry) -> None:
-        """ Remove the given entry. """
-        if entry in self.entries:
-            self.entries.remove(entry)
-
     def get_factory(self, service_id: str, route_id: str) -> Trip_Factory:
         """ Returns a function which creates a new TripEntry for the given
         service and route. """
@@ -65,11 +61,9 @@ class GTFSTrips(BaseContainer):
 
     def remove_unused(self, stop_times: GTFSStopTimes) -> None:
         """ Removes trips, which are not used by any stop_times entries. """
-        trip_ids = {entry.trip_id for entry in stop_times.entries}
-        for entry in list(self.entries):
-            if entry.trip_id in trip_ids:
-                continue
-            self.entries.remove(entry)
+        trip_ids = stop_times.get_trip_ids()
+        self.entries = [entry for entry in self.entries
+                        if entry.trip_id in trip_ids]
 
     def get_with_route_id(self, route_id: str) -> list[GTFSTripsEntry]:
         """ Return all trips with the given route_id. """
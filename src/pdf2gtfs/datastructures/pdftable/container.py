@@ -5,8 +5,8 @@ from __future__ import annotations
 import logging
 import re
 from abc import ABC, abstractmethod
+from collections import Counter
 from operator import attrgetter
-from statistics import mean
 from typing import Callable, Generic, Iterator, TYPE_CHECKING, TypeVar
 
 from pdf2gtfs.config import Config
@@ -18,6 +18,8 @@ from pdf2gtfs.datastructures.pdftable.enums import (
 if TYPE_CHECKING:
     from pdf2gtfs.datastructures.pdftable.pdftable import Cols, Rows, PDFTable
     from pdf2gtfs.datastructures.pdftable.field import Field
+    from pdf2gtfs.datastructures.pdftable.lists import (
+        ColumnList, FieldContainerList, RowList)
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,9 @@ class BaseContainerReference(Generic[ContainerT], ABC):
             old_value.remove_field(obj)
 
         setattr(obj, self.private_name, value)
+        # The type of the field depends on its row and column, so the
+        #  statistics of both need to be updated.
+        obj.update_container_stats()
 
 
 class FieldRowReference(BaseContainerReference["Row"]):
@@ -54,6 +59,65 @@ class FieldColumnReference(BaseContainerReference["Column"]):
     pass
 
 
+class FieldStats:
+    """ Running statistics of the fields of a FieldContainer.
+
+    The statistics are updated whenever a field is added/removed or the
+    text/type of a field changes, which allows the type detection of the
+    FieldContainer to run without scanning all of its fields. The type of
+    a field changes, if its text, its row/column or the type of its
+    row/column changes; in each case, the statistics of both the row and
+    the column of the field are updated.
+    """
+
+    def __init__(self) -> None:
+        self.field_types: dict[Field, FieldType] = {}
+        self.empty_count = 0
+        self.text_length = 0
+        self.type_counts: Counter[FieldType] = Counter()
+        self.repeat_intervals: dict[tuple, list[str]] = {}
+
+    @property
+    def field_count(self) -> int:
+        """ The number of fields. """
+        return len(self.field_types)
+
+    @property
+    def mean_text_length(self) -> float:
+        """ The mean text length of all fields or 0, if there are none. """
+        if not self.field_count:
+            return 0
+        return self.text_length / self.field_count
+
+    def add(self, field: Field) -> None:
+        """ Add the statistics of the given field. """
+        if field in self.field_types:
+            self.remove(field)
+        typ = field.type
+        self.field_types[field] = typ
+        self.empty_count += field.text == ""
+        self.text_length += len(field.text)
+        self.type_counts[typ] += 1
+        self.repeat_intervals = {}
+
+    def remove(self, field: Field) -> None:
+        """ Remove the statistics of the given field.
+
+        Needs to be called before the text of the field is changed.
+        """
+        typ = self.field_types.pop(field, None)
+        if typ is None:
+            return
+        self.empty_count -= field.text == ""
+        self.text_length -= len(field.text)
+        self.type_counts[typ] -= 1
+        self.repeat_intervals = {}
+
+    def has_type(self, typ: FieldType) -> bool:
+        """ Whether any of the fields has the given typ. """
+        return self.type_counts[typ] > 0
+
+
 class FieldContainer(BBoxObject):
     """ Base class for Row/Column. """
 
@@ -64,6 +128,7 @@ class FieldContainer(BBoxObject):
         BBoxObject.__init__(self, bbox)
         self.table = table
         self._type = None
+        self._stats = FieldStats()
 
     @property
     def fields(self) -> list[Field]:
@@ -75,8 +140,34 @@ class FieldContainer(BBoxObject):
         for field in fields:
             self.add_reference_to_field(field)
         self._fields = fields
+        self._update_stats()
         self.set_bbox_from_fields()
 
+    @property
+    def stats(self) -> FieldStats:
+        """ The statistics of our fields. """
+        # The fields may have been changed directly.
+        if self._stats.field_count != len(self._fields):
+            self._update_stats()
+        return self._stats
+
+    def _update_stats(self) -> None:
+        """ Recalculate the statistics of all fields. """
+        self._stats = FieldStats()
+        for field in self._fields:
+            self._stats.add(field)
+
+    def _set_type(self, typ) -> None:
+        """ Set the type, updating the statistics that depend on it.
+
+        The type of a field depends on the type of its row and column.
+        """
+        if self._type == typ:
+            return
+        self._type = typ
+        for field in self.fields:
+            field.update_container_stats()
+
     @property
     def table(self) -> TableT:
         """ The table the FieldContainer is part of. """
@@ -86,6 +177,16 @@ class FieldContainer(BBoxObject):
     def table(self, table: TableT):
         self._table = table
 
+    @property
+    def container_list(self) -> FieldContainerList | None:
+        """ The list of the table, which contains this FieldContainer. """
+        return None
+
+    @property
+    def index(self) -> int:
+        """ Return the index of this FieldContainer in the table. """
+        return self.container_list.index(self)
+
     def has_type(self) -> bool:
         """ Whether the FieldContainer has any type. """
         return self._type is not None
@@ -101,6 +202,7 @@ class FieldContainer(BBoxObject):
     def _add_field_at_index(self, new_field: Field, index: int):
         self.fields.insert(index, new_field)
         self.add_reference_to_field(new_field)
+        self._stats.add(new_field)
 
     def remove_field(self, field: Field) -> None:
         """ Remove the field from this container.
@@ -110,6 +212,7 @@ class FieldContainer(BBoxObject):
         """
         try:
             self.fields.remove(field)
+            self._stats.remove(field)
         except ValueError:
             logger.debug(
                 "Tried to deregister a field, which is not in fields.")
@@ -137,8 +240,8 @@ class FieldContainer(BBoxObject):
         if the index should be incremented.
         """
         fields_list: list[list[Field]] = [[] for _ in splitters]
-        splitters_iter = iter(splitters)
-        current_splitter = next(splitters_iter)
+        splitters_iter = enumerate(splitters)
+        splitter_idx, current_splitter = next(splitters_iter)
         last_split = False
         idx = 0
         fields_copy = list(self.fields)
@@ -147,8 +250,8 @@ class FieldContainer(BBoxObject):
             field = fields_copy[current_field_id]
             if next_idx(current_splitter, field) and not last_split:
                 try:
-                    idx = splitters.index(current_splitter)
-                    current_splitter = next(splitters_iter)
+                    idx = splitter_idx
+                    splitter_idx, current_splitter = next(splitters_iter)
                 except StopIteration:
                     last_split = True
                 continue
@@ -159,7 +262,7 @@ class FieldContainer(BBoxObject):
 
     def has_field_of_type(self, typ: FieldType) -> bool:
         """ Whether the FieldContainer contains a field with the given typ. """
-        return any(map(lambda f: f.type == typ, self.fields))
+        return self.stats.has_type(typ)
 
     @staticmethod
     @abstractmethod
@@ -195,9 +298,9 @@ class Row(FieldContainer):
         return row
 
     @property
-    def index(self) -> int:
-        """ Return the index of this row in the table. """
-        return self.table.rows.index(self)
+    def container_list(self) -> RowList:
+        """ The rows of the table. """
+        return self.table.rows
 
     def add_field(self, new_field: Field):
         """ Add new_field to our fields, maintaining proper order. """
@@ -216,7 +319,7 @@ class Row(FieldContainer):
 
     def update_type(self) -> None:
         """ Set the type. """
-        self._type = self._detect_type()
+        self._set_type(self._detect_type())
 
     def _detect_type(self) -> RowType:
         if self.has_field_of_type(FieldType.HEADER):
@@ -254,6 +357,11 @@ class Column(FieldContainer):
         self.fields: list[Field] = fields or []
         self.intervals = None
 
+    @property
+    def container_list(self) -> ColumnList:
+        """ The columns of the table. """
+        return self.table.columns
+
     @property
     def header_text(self) -> str:
         """ Return the header text of the column, if it exists or "". """
@@ -263,26 +371,27 @@ class Column(FieldContainer):
     def type(self) -> ColumnType:
         """ The type of the column. If no type is set, it will be updated. """
         if not self._type:
-            self._type = self._detect_type()
+            self._set_type(self._detect_type())
         return self._type
 
     @type.setter
     def type(self, value: ColumnType) -> None:
-        self._type = value
+        self._set_type(value)
 
     def _detect_type(self) -> ColumnType:
+        stats = self.stats
+
         def _constains_long_strings() -> bool:
             """ Returns if the column contains long strings. """
-            return mean(map(lambda f: len(f.text), self.fields)) > 8
+            return stats.mean_text_length > 8
 
         def _is_sparse() -> bool:
             """ Returns if the column is sparse.
 
             Checks if more than 50% of fields of the column are empty.
             """
-            empty_field_count = sum(map(lambda f: f.text == "", self.fields))
             # Use max() to prevent ZeroDivisionError.
-            return (len(self.fields) / max(1, empty_field_count)) <= 0.5
+            return (stats.field_count / max(1, stats.empty_count)) <= 0.5
 
         has_data_field = self.has_field_of_type(FieldType.DATA)
 
@@ -317,10 +426,15 @@ class Column(FieldContainer):
         repeat_identifier in
         our fields. If both exist, try to get the repeat interval.
         """
+        key = tuple(map(tuple, Config.repeat_identifier))
+        cached_intervals = self.stats.repeat_intervals.get(key)
+        if cached_intervals is not None:
+            return list(cached_intervals)
         intervals = []
         for start, end in Config.repeat_identifier:
             intervals += self._get_repeat_intervals(start, end)
-        return intervals
+        self.stats.repeat_intervals[key] = intervals
+        return list(intervals)
 
     def has_repeat_interval(self) -> bool:
         """ Check if the column contains at least one interval. """
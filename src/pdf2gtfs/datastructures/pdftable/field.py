@@ -25,9 +25,39 @@ class Field(BBoxObject):
 
     def __init__(self, bbox: BBox, text: str):
         super().__init__(bbox)
-        self.text = text.strip()
         self._row = None
         self._column = None
+        self._text = text.strip()
+
+    @property
+    def text(self) -> str:
+        """ The text of the field. """
+        return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        containers = self._get_containers()
+        for container in containers:
+            container.stats.remove(self)
+        self._text = text
+        for container in containers:
+            container.stats.add(self)
+
+    def _get_containers(self) -> list[Row | Column]:
+        """ Return the row/column of the field, if they exist. """
+        containers = [self._row, self._column]
+        return [container for container in containers
+                if container and self in container.stats.field_types]
+
+    def update_container_stats(self) -> None:
+        """ Update the statistics of our row/column.
+
+        Needs to be called, whenever the type of the field may have changed
+        without a change of its text, e.g. if the type of its row changed
+        or if the field was moved to a different row/column.
+        """
+        for container in self._get_containers():
+            container.stats.add(self)
 
     @property
     def type(self) -> FieldType:
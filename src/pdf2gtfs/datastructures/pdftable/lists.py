@@ -23,6 +23,7 @@ class FieldContainerList(Generic[FieldContainerT], ABC):
 
     def __init__(self, table: tbl.PDFTable):
         self._objects: list[FieldContainerT] = []
+        self._positions: dict[FieldContainerT, int] = {}
         self.table = table
 
     @property
@@ -37,13 +38,18 @@ class FieldContainerList(Generic[FieldContainerT], ABC):
 
     def add(self, obj: FieldContainerT):
         """ Add the given object, updating its references. """
+        self._positions[obj] = len(self._objects)
         self._objects.append(obj)
         # Update table reference of the object.
         obj.table = self.table
 
+    def _update_positions(self) -> None:
+        """ Rebuild the position map, after the order of objects changed. """
+        self._positions = {obj: i for i, obj in enumerate(self._objects)}
+
     def _get_neighbour(self, current: FieldContainerT, delta: int
                        ) -> FieldContainerT | None:
-        neighbour_index = self._objects.index(current) + delta
+        neighbour_index = self.index(current) + delta
         valid_index = 0 <= neighbour_index < len(self._objects)
 
         return self._objects[neighbour_index] if valid_index else None
@@ -57,8 +63,14 @@ class FieldContainerList(Generic[FieldContainerT], ABC):
         return self._get_neighbour(current, 1)
 
     def index(self, obj: FieldContainerT) -> int:
-        """ Return the index of the given object. """
-        return self._objects.index(obj)
+        """ Return the index of the given object.
+
+        :raises ValueError: If the object is not part of this list.
+        """
+        try:
+            return self._positions[obj]
+        except KeyError:
+            raise ValueError(f"{obj} is not in {self.__class__.__name__}.")
 
     @classmethod
     def from_list(cls, table: tbl.PDFTable, objects: list[FieldContainerT]
@@ -105,6 +117,7 @@ class RowList(FieldContainerList[Row]):
     def __init__(self, table: tbl.PDFTable):
         super().__init__(table)
         self._objects: list[Row] = []
+        self._positions: dict[Row, int] = {}
 
     @property
     def mean_row_field_count(self) -> float:
@@ -118,3 +131,4 @@ class RowList(FieldContainerList[Row]):
         for obj in other.objects:
             self.add(obj)
         self._objects.sort(key=attrgetter("bbox.y0"))
+        self._update_positions()
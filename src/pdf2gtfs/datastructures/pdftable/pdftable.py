@@ -6,7 +6,7 @@ from __future__ import annotations
 import logging
 from operator import attrgetter
 from pathlib import Path
-from typing import Callable, TypeAlias
+from typing import Callable, TYPE_CHECKING, TypeAlias
 
 from pdf2gtfs.config import Config
 from pdf2gtfs.datastructures.pdftable.container import (
@@ -19,6 +19,9 @@ from pdf2gtfs.datastructures.pdftable.lists import ColumnList, RowList
 from pdf2gtfs.datastructures.timetable.table import TimeTable
 
 
+if TYPE_CHECKING:
+    from pdf2gtfs.datastructures.pdftable.field import Field
+
 logger = logging.getLogger(__name__)
 Tables: TypeAlias = list["PDFTable"]
 Rows: TypeAlias = list[Row]
@@ -63,35 +66,61 @@ class PDFTable:
         return self.columns.empty or self.rows.empty
 
     def generate_columns_from_rows(self) -> None:
-        """ Create columns from the given rows. """
-
-        def _generate_single_field_columns() -> Cols:
-            """ Generate single-field columns from the rows. """
-            field_columns = [Column.from_field(self, field)
-                             for row in rows for field in row]
-            return sorted(field_columns, key=attrgetter("bbox.x0"))
-
-        def _merge_overlapping_columns(field_columns: Cols) -> Cols:
-            """ Merges overlapping field_columns. """
-            first_field = field_columns.pop(0).fields[0]
-            cols: Cols = [Column.from_field(self, first_field)]
-
-            for column in field_columns:
-                previous_column = cols[-1]
-                # Begin new column, if the current column is not overlapping.
-                if previous_column.bbox.x1 <= column.bbox.x0:
-                    cols.append(Column.from_field(self, column.fields[0]))
+        """ Create columns from the given rows.
+
+        The fields are sorted by their x0 coordinate and a new column is
+        started, whenever a field does not overlap with the previous column.
+        """
+
+        def _get_column_labels(fields: list[Field]) -> list[int]:
+            """ Return the label of the column of each of the fields. """
+            labels = []
+            label = -1
+            x1 = None
+            for field in fields:
+                if x1 is None or x1 <= field.bbox.x0:
+                    label += 1
+                    x1 = field.bbox.x1
+                x1 = max(x1, field.bbox.x1)
+                labels.append(label)
+            return labels
+
+        def _merge_fields_of_same_row(fields: list[Field]) -> list[Field]:
+            """ Merge fields of the same row into the first one. """
+            first_fields: dict[Row, Field] = {}
+            merged_fields = []
+            for field in fields:
+                first_field = first_fields.get(field.row)
+                if first_field is None:
+                    first_fields[field.row] = field
+                    merged_fields.append(field)
                     continue
-
-                previous_column.add_field(column.fields[0])
-            return cols
+                if (field.bbox.x0 - first_field.bbox.x1) != 0:
+                    field.text = " " + field.text
+                first_field.merge(field)
+                field.column = None
+            return merged_fields
 
         rows = self.rows.of_types(
             [RowType.DATA, RowType.ANNOTATION, RowType.ROUTE_INFO])
         if not rows:
             return
 
-        columns = _merge_overlapping_columns(_generate_single_field_columns())
+        fields = sorted([field for row in rows for field in row],
+                        key=attrgetter("bbox.x0"))
+        fields_list: list[list[Field]] = []
+        for field, label in zip(fields, _get_column_labels(fields)):
+            if label == len(fields_list):
+                fields_list.append([])
+            fields_list[label].append(field)
+
+        columns = []
+        for column_fields in fields_list:
+            order = {field: i for i, field in enumerate(column_fields)}
+            column_fields = _merge_fields_of_same_row(column_fields)
+            # Fields with the same y0 are in reverse order of insertion.
+            column_fields.sort(key=lambda f: (f.bbox.y0, -order[f]))
+            columns.append(Column(self, column_fields))
         self.columns = columns
 
     def fix_split_stopnames(self) -> None:
@@ -169,11 +198,12 @@ class PDFTable:
             """ Splits the current tables' rows such that each split starts
             with a splitter_row and assigns each split to a table. """
             rows_list = [[] for _ in splitter_rows]
-            first_is_splitter = self.rows[0] in splitter_rows
+            splitter_row_set = set(splitter_rows)
+            first_is_splitter = self.rows[0] in splitter_row_set
             idx = -1 if first_is_splitter else 0
 
             for row in self.rows:
-                if row in splitter_rows:
+                if row in splitter_row_set:
                     idx += 1
                 rows_list[idx].append(row)
 
@@ -0,0 +1,97 @@
+""" Provides the TableAnalysis, which caches the results of scans
+over the rows/cols of a Table. """
+
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, TYPE_CHECKING
+
+from pdf2gtfs.datastructures.table.direction import H, Orientation
+
+
+if TYPE_CHECKING:
+    from pdf2gtfs.datastructures.table.cell import C
+    from pdf2gtfs.datastructures.table.table import Table
+
+
+class TableAnalysis:
+    """ Caches values that require a scan over (parts of) the Table.
+
+    The cache consists of two parts: The position of each Cell, which only
+    changes when the structure of the Table changes (i.e., when Cells are
+    linked/unlinked), and values that depend on the Types and texts of the
+    Cells (e.g., whether a row contains a TimeCell, or the stops).
+    The latter are invalidated, when the Type of any Cell changes.
+    """
+
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        self._positions: dict[int, tuple[int, int]] | None = None
+        self._values: dict[Hashable, Any] = {}
+
+    def invalidate(self, structure: bool = True) -> None:
+        """ Invalidate the cached values.
+
+        :param structure: If True, the positions of the Cells are
+            invalidated as well. Otherwise, only the values that depend
+            on the Types/texts of the Cells are invalidated.
+        """
+        if structure:
+            self._positions = None
+        self._values = {}
+
+    def _get_positions(self) -> dict[int, tuple[int, int]]:
+        if self._positions is None:
+            positions = {}
+            for row_id, row_starter in enumerate(self.table.left.col):
+                for col_id, cell in enumerate(row_starter.row):
+                    positions[id(cell)] = row_id, col_id
+            self._positions = positions
+        return self._positions
+
+    def get_series_id(self, cell: C, o: Orientation) -> int | None:
+        """ Return the index of the Cell's row (H) or col (V).
+
+        :param cell: The Cell.
+        :param o: The Orientation of the series.
+        :return: The index of the series or None,
+            if the Cell can not be reached from the Table.
+        """
+        position = self._get_positions().get(id(cell))
+        if position is None:
+            return None
+        return position[0] if o == H else position[1]
+
+    def get(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """ Return the cached value for key, calculating it if necessary.
+
+        :param key: The key of the value.
+        :param func: Used to calculate the value, if it is not cached.
+        :return: The (cached) value.
+        """
+        if key not in self._values:
+            self._values[key] = func()
+        return self._values[key]
+
+    def get_series_value(self, name: str, cell: C, o: Orientation,
+                         func: Callable[[], Any]) -> Any:
+        """ Return the cached value of the Cell's row/col.
+
+        :param name: The name of the value.
+        :param cell: Any Cell of the series.
+        :param o: The Orientation of the series.
+        :param func: Used to calculate the value, if it is not cached.
+        :return: The (cached) value. If the Cell is not part of the Table,
+            the value is calculated, but not cached.
+        """
+        series_id = self.get_series_id(cell, o)
+        if series_id is None:
+            return func()
+        return self.get((name, o.name, series_id), func)
+
+
+def get_analysis(cell: C) -> TableAnalysis | None:
+    """ Return the TableAnalysis of the Cell's Table, if it exists. """
+    table = cell.table
+    if table is None:
+        return None
+    return table.analysis
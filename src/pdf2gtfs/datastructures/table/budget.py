@@ -0,0 +1,66 @@
+""" Provides the budget used to limit the time spent on a single page. """
+
+from __future__ import annotations
+
+from time import monotonic
+
+from pdf2gtfs.config import Config
+
+
+class PageBudgetExceeded(Exception):
+    """ Raised, if the table detection of a page exceeds its budget. """
+    pass
+
+
+class _PageBudget:
+    """ Tracks the elapsed time and the number of operations of the table
+    detection of the current page.
+
+    The time is measured using a monotonic clock, so changes of the system
+    clock do not affect the budget.
+
+    The budget is only checked between start and stop. This way, Tables
+    can still be used without a budget (e.g. in the tests).
+    """
+
+    def __init__(self) -> None:
+        self.start_time: float | None = None
+        self.operations = 0
+
+    @property
+    def active(self) -> bool:
+        """ Whether the budget of a page is currently tracked. """
+        return self.start_time is not None
+
+    def start(self) -> None:
+        """ Start tracking the budget of a new page. """
+        self.start_time = monotonic()
+        self.operations = 0
+
+    def stop(self) -> None:
+        """ Stop tracking the budget. """
+        self.start_time = None
+        self.operations = 0
+
+    def check(self, operations: int = 1) -> None:
+        """ Add the given number of operations and check the budget.
+
+        :param operations: The number of operations that were performed.
+        :raises PageBudgetExceeded: If either the time or operation budget
+            of the page is exceeded.
+        """
+        if not self.active:
+            return
+        self.operations += operations
+        max_operations = Config.page_operation_budget
+        if max_operations and self.operations > max_operations:
+            raise PageBudgetExceeded(
+                f"Exceeded the operation budget of {max_operations}.")
+        max_time = Config.page_time_budget
+        duration = monotonic() - self.start_time
+        if max_time and duration > max_time:
+            raise PageBudgetExceeded(
+                f"Exceeded the time budget of {max_time:.2f} seconds.")
+
+
+PageBudget = _PageBudget()
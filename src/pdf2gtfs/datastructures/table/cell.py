@@ -111,8 +111,10 @@ class Cell(BBoxObject):
         """
         current_neighbor: OC = self.get_neighbor(d)
         setattr(self, d.p_attr, None)
+        self.invalidate_analysis()
         if current_neighbor:
             setattr(current_neighbor, d.opposite.p_attr, None)
+            current_neighbor.invalidate_analysis()
 
     def set_neighbor(self, d: Direction, cell: C) -> None:
         """ Set this Cell's neighbor in the given Direction to the given Cell.
@@ -129,6 +131,7 @@ class Cell(BBoxObject):
 
         setattr(self, d.p_attr, cell)
         setattr(cell, d.opposite.p_attr, self)
+        self.invalidate_analysis()
         cell.table = self.table
         # Set the current neighbor as neighbor of the new neighbor
         #  in the same Direction, to ensure not to break transitivity.
@@ -179,7 +182,18 @@ class Cell(BBoxObject):
 
     @table.setter
     def table(self, table: Table | None) -> None:
+        self.invalidate_analysis()
         self._table = table
+        self.invalidate_analysis()
+
+    def invalidate_analysis(self, structure: bool = True) -> None:
+        """ Invalidate the cached analysis of the Cell's Table, if any.
+
+        :param structure: Whether the structure of the Table changed, or
+            only the Type/text of the Cell.
+        """
+        if self._table is not None:
+            self._table.analysis.invalidate(structure)
 
     def iter(self, d: Direction = None, complete: bool = True,
              *, o: Orientation = None) -> Generator[C]:
@@ -341,6 +355,7 @@ class Cell(BBoxObject):
         """
         self.bbox.merge(cell.bbox)
         self.text += f"{merge_char}{cell.text}"
+        self.invalidate_analysis(False)
         for d in D:
             if ignore_neighbors and d in ignore_neighbors:
                 continue
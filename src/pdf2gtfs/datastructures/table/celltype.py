@@ -13,6 +13,7 @@ from math import floor, log2
 from more_itertools import collapse, substrings_indexes
 
 from pdf2gtfs.config import Config
+from pdf2gtfs.datastructures.table.analysis import get_analysis
 from pdf2gtfs.datastructures.table.direction import (
     D, Direction, E, H, N, Orientation, S, V, W,
     )
@@ -91,6 +92,7 @@ class CellType:
         # We need the possible Types for the Type inference.
         if not self.possible_types:
             self.guess_type()
+        previous_type = self.inferred_type or self.guess_type()
 
         inferred_types = {}
         for t, possibility in self.possible_types.items():
@@ -103,6 +105,9 @@ class CellType:
         # Return the Type with the highest score.
         self.inferred_types = inferred_types
         self.inferred_type = get_argmax_key(self.inferred_types)
+        # Values that depend on the Types of the Cells need to be updated.
+        if self.inferred_type != previous_type:
+            self.cell.invalidate_analysis(False)
         return self.inferred_type
 
 
@@ -319,8 +324,15 @@ def cell_row_contains_type(cell: C, typ: T) -> bool:
     :return: True if there is at least one Cell with the given Type.
         False, otherwise.
     """
+    def _row_contains_type() -> bool:
+        return any(map(func, cell.row))
+
     func = cell_has_type_wrapper(typ)
-    return any(map(func, cell.row))
+    analysis = get_analysis(cell)
+    if analysis is None:
+        return _row_contains_type()
+    return analysis.get_series_value(
+        f"contains_{typ.name}", cell, H, _row_contains_type)
 
 
 def cell_col_contains_type(cell: C, typ: T) -> bool:
@@ -331,8 +343,15 @@ def cell_col_contains_type(cell: C, typ: T) -> bool:
     :return: True if there is at least one Cell with the given Type.
         False, otherwise.
     """
+    def _col_contains_type() -> bool:
+        return any(map(func, cell.col))
+
     func = cell_has_type_wrapper(typ)
-    return any(map(func, cell.col))
+    analysis = get_analysis(cell)
+    if analysis is None:
+        return _col_contains_type()
+    return analysis.get_series_value(
+        f"contains_{typ.name}", cell, V, _col_contains_type)
 
 
 def cell_neighbor_has_type(cell: C, typ: T, direct_neighbor: bool = False,
@@ -655,12 +674,22 @@ def get_time_aligned_letter_ratio(starter: C, o: Orientation) -> float:
 
     Only considers those Cells that are in a TimeCell's row or col.
     Symbols refers here to all characters that are not letters.
+    The result is cached for the whole row/col, if the Cell is in a Table.
 
     :param starter: This Cell's row/col will be used to calculate the ratio.
     :param o: Whether to check the row or col of the Cell.
     :return: The ratio between letters and non-letters in all of the starter's
         row/col. 0 if no letters, 1 if no non-letters.
     """
+    analysis = get_analysis(starter)
+    if analysis is None:
+        return _get_time_aligned_letter_ratio(starter, o)
+    return analysis.get_series_value(
+        "letter_ratio", starter, o,
+        lambda: _get_time_aligned_letter_ratio(starter, o))
+
+
+def _get_time_aligned_letter_ratio(starter: C, o: Orientation) -> float:
     from pdf2gtfs.datastructures.table.cell import EmptyCell
 
     # Get all cells of the Cell's row/col.
@@ -684,10 +713,20 @@ def get_time_aligned_avg_text_length(starter: C, o: Orientation) -> float:
     """ Calculate the average text length of starter's row/col.
 
     Only considers those Cells that are in a TimeCell's row or col.
+    The result is cached for the whole row/col, if the Cell is in a Table.
 
     :param starter: This Cell's row/col will be used to get the text length.
     :param o: Whether to check the row or col of the Cell.
     """
+    analysis = get_analysis(starter)
+    if analysis is None:
+        return _get_time_aligned_avg_text_length(starter, o)
+    return analysis.get_series_value(
+        "avg_text_length", starter, o,
+        lambda: _get_time_aligned_avg_text_length(starter, o))
+
+
+def _get_time_aligned_avg_text_length(starter: C, o: Orientation) -> float:
     from pdf2gtfs.datastructures.table.cell import EmptyCell
 
     cells = starter.iter(o=o)
@@ -0,0 +1,318 @@
+""" Provides the detection of Tables using the ruling lines of the page.
+
+Many PDFs draw the borders of the Cells as vector graphics. If these exist,
+the grid of the Table can be created directly from them, instead of
+creating it iteratively from the positions of the Cells. Rulings that are
+connected to each other form a grid, which allows detecting multiple
+Tables on the same page.
+"""
+
+from __future__ import annotations
+
+import logging
+from operator import attrgetter
+
+import numpy as np
+from more_itertools import collapse
+from pdfminer.layout import LTCurve, LTLine, LTPage, LTRect
+
+from pdf2gtfs.datastructures.pdftable.bbox import BBox
+from pdf2gtfs.datastructures.table.cell import C, Cs, EmptyCell
+from pdf2gtfs.datastructures.table.direction import E, S
+from pdf2gtfs.datastructures.table.table import link_cells, Table
+
+
+logger = logging.getLogger(__name__)
+
+# The maximum thickness in points of a line, to be considered a ruling.
+MAX_RULING_WIDTH = 2.
+# Rulings that are closer to each other than this (in points) are merged.
+RULING_TOLERANCE = 2.
+# The minimum number of rulings in each Orientation.
+MIN_RULING_COUNT = 3
+
+
+def get_rulings(page: LTPage) -> np.ndarray:
+    """ Return the line segments of all rulings of the page.
+
+    Lines/rectangles that are thin in one dimension are used as rulings
+    directly; the edges of all other rectangles are used instead.
+
+    :param page: The page containing the lines/rectangles.
+    :return: An array with one row (x0, y0, x1, y1) per ruling, where
+        horizontal rulings have y0 == y1 and vertical rulings x0 == x1.
+        The y-coordinates use the top-left corner of the page as origin.
+    """
+    rulings = []
+    curves = [obj for obj in collapse(page, base_type=LTCurve)
+              if isinstance(obj, (LTLine, LTRect))]
+    for curve in curves:
+        x0, x1 = curve.x0, curve.x1
+        y0 = page.y1 - curve.y1
+        y1 = page.y1 - curve.y0
+        is_h_ruling = curve.height <= MAX_RULING_WIDTH < curve.width
+        is_v_ruling = curve.width <= MAX_RULING_WIDTH < curve.height
+        if is_h_ruling:
+            y = (y0 + y1) / 2
+            rulings.append((x0, y, x1, y))
+        elif is_v_ruling:
+            x = (x0 + x1) / 2
+            rulings.append((x, y0, x, y1))
+        elif isinstance(curve, LTRect) and min(curve.width, curve.height):
+            rulings += [(x0, y0, x1, y0), (x0, y1, x1, y1),
+                        (x0, y0, x0, y1), (x1, y0, x1, y1)]
+    return np.array(rulings, dtype=float).reshape(-1, 4)
+
+
+def group_rulings(rulings: np.ndarray) -> list[np.ndarray]:
+    """ Split the rulings into groups of connected rulings.
+
+    Two rulings are connected, if they touch or cross each other.
+
+    :param rulings: The rulings, as returned by get_rulings.
+    :return: The rulings of each group.
+    """
+    lower = rulings[:, :2] - RULING_TOLERANCE / 2
+    upper = rulings[:, 2:] + RULING_TOLERANCE / 2
+    group_ids = np.full(len(rulings), -1)
+    group_count = 0
+    for start in range(len(rulings)):
+        if group_ids[start] >= 0:
+            continue
+        group_ids[start] = group_count
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            connected = ((lower <= upper[i]).all(axis=1)
+                         & (lower[i] <= upper).all(axis=1)
+                         & (group_ids < 0))
+            new_ids = np.flatnonzero(connected)
+            group_ids[new_ids] = group_count
+            stack += new_ids.tolist()
+        group_count += 1
+    return [rulings[group_ids == i] for i in range(group_count)]
+
+
+def get_ruling_positions(rulings: np.ndarray
+                         ) -> tuple[list[float], list[float]]:
+    """ Return the positions of the horizontal and vertical rulings.
+
+    :param rulings: The rulings, as returned by get_rulings.
+    :return: The y-coordinates of the horizontal rulings and the
+        x-coordinates of the vertical rulings.
+    """
+    is_h_ruling = rulings[:, 1] == rulings[:, 3]
+    h_rulings = rulings[is_h_ruling, 1].tolist()
+    v_rulings = rulings[~is_h_ruling, 0].tolist()
+    return cluster_positions(h_rulings), cluster_positions(v_rulings)
+
+
+def cluster_positions(positions: list[float]) -> list[float]:
+    """ Merge positions that are close to each other into their mean.
+
+    :param positions: The positions of the rulings.
+    :return: The sorted, merged positions.
+    """
+    if not positions:
+        return []
+    positions = np.sort(np.array(positions))
+    split_ids = np.flatnonzero(np.diff(positions) > RULING_TOLERANCE) + 1
+    return [float(cluster.mean())
+            for cluster in np.split(positions, split_ids)]
+
+
+def assign_cells_to_slots(cells: Cs, h_rulings: list[float],
+                          v_rulings: list[float]
+                          ) -> tuple[np.ndarray, np.ndarray]:
+    """ Calculate the grid slot of each Cell, based on the Cells' center.
+
+    :param cells: The Cells that will be assigned.
+    :param h_rulings: The sorted y-coordinates of the horizontal rulings.
+    :param v_rulings: The sorted x-coordinates of the vertical rulings.
+    :return: The row and column index of each Cell. Cells outside the grid
+        have an index of -1 in the respective Orientation.
+    """
+    bboxes = np.array([[c.bbox.x0, c.bbox.y0, c.bbox.x1, c.bbox.y1]
+                       for c in cells]).reshape(-1, 4)
+    x_centers = (bboxes[:, 0] + bboxes[:, 2]) / 2
+    y_centers = (bboxes[:, 1] + bboxes[:, 3]) / 2
+    col_ids = np.searchsorted(v_rulings, x_centers) - 1
+    row_ids = np.searchsorted(h_rulings, y_centers) - 1
+    col_ids[(col_ids < 0) | (col_ids >= len(v_rulings) - 1)] = -1
+    row_ids[(row_ids < 0) | (row_ids >= len(h_rulings) - 1)] = -1
+    return row_ids, col_ids
+
+
+def get_slots(h_rulings: list[float], v_rulings: list[float],
+              time_cells: Cs, other_cells: Cs
+              ) -> dict[tuple[int, int], Cs] | None:
+    """ Return the Cells in each slot of the grid, formed by the rulings.
+
+    :param h_rulings: The sorted y-coordinates of the horizontal rulings.
+    :param v_rulings: The sorted x-coordinates of the vertical rulings.
+    :param time_cells: The TimeCells of the grid.
+    :param other_cells: All other Cells of the page.
+    :return: The Cells of each non-empty slot, or None, if the rulings
+        do not form a grid that is consistent with the TimeCells.
+    """
+    cells = time_cells + other_cells
+    row_ids, col_ids = assign_cells_to_slots(cells, h_rulings, v_rulings)
+    time_count = len(time_cells)
+    # Every TimeCell needs to be inside the grid.
+    if (row_ids[:time_count] < 0).any() or (col_ids[:time_count] < 0).any():
+        return None
+
+    slots: dict[tuple[int, int], Cs] = {}
+    for cell, row_id, col_id in zip(cells, row_ids, col_ids):
+        if row_id < 0 or col_id < 0:
+            continue
+        slots.setdefault((int(row_id), int(col_id)), []).append(cell)
+
+    time_cell_ids = set(map(id, time_cells))
+    # Each slot may contain only a single TimeCell and no other Cells.
+    for slot_cells in slots.values():
+        if len(slot_cells) > 1 and any(id(c) in time_cell_ids
+                                       for c in slot_cells):
+            return None
+    return slots
+
+
+def slots_to_grid(slots: dict[tuple[int, int], Cs], h_rulings: list[float],
+                  v_rulings: list[float], time_cells: Cs, other_cells: Cs
+                  ) -> list[list[C]]:
+    """ Create the grid of Cells, by merging the Cells of each slot.
+
+    :param slots: The Cells of each slot, as returned by get_slots.
+    :param h_rulings: The sorted y-coordinates of the horizontal rulings.
+    :param v_rulings: The sorted x-coordinates of the vertical rulings.
+    :param time_cells: The TimeCells of the grid.
+    :param other_cells: All other Cells of the page. Those Cells that are
+        added to the grid are removed from this list.
+    :return: The grid (i.e., a list of rows).
+    """
+    time_cell_ids = set(map(id, time_cells))
+    grid: list[list[C | None]] = [[None] * (len(v_rulings) - 1)
+                                  for _ in range(len(h_rulings) - 1)]
+    for (row_id, col_id), slot_cells in slots.items():
+        slot_cells.sort(key=attrgetter("bbox.y0", "bbox.x0"))
+        for cell in slot_cells[1:]:
+            slot_cells[0].merge(cell)
+            other_cells.remove(cell)
+        grid[row_id][col_id] = slot_cells[0]
+        if id(slot_cells[0]) not in time_cell_ids:
+            other_cells.remove(slot_cells[0])
+
+    return fill_grid(grid, h_rulings, v_rulings)
+
+
+def create_grid(h_rulings: list[float], v_rulings: list[float],
+                time_cells: Cs, other_cells: Cs) -> list[list[C]] | None:
+    """ Create the grid of Cells, using the given rulings.
+
+    :param h_rulings: The sorted y-coordinates of the horizontal rulings.
+    :param v_rulings: The sorted x-coordinates of the vertical rulings.
+    :param time_cells: The TimeCells of the grid.
+    :param other_cells: All other Cells of the page. Those Cells that are
+        added to the grid are removed from this list.
+    :return: The grid (i.e., a list of rows) or None, if the rulings
+        do not form a grid that is consistent with the TimeCells.
+    """
+    slots = get_slots(h_rulings, v_rulings, time_cells, other_cells)
+    if slots is None:
+        return None
+    return slots_to_grid(slots, h_rulings, v_rulings, time_cells, other_cells)
+
+
+def fill_grid(grid: list[list[C | None]], h_rulings: list[float],
+              v_rulings: list[float]) -> list[list[C]]:
+    """ Remove the rows/cols without Cells and fill the remaining gaps.
+
+    :param grid: The grid, where None represents a slot without Cells.
+    :param h_rulings: The sorted y-coordinates of the horizontal rulings.
+    :param v_rulings: The sorted x-coordinates of the vertical rulings.
+    :return: The grid, with an EmptyCell in place of every None.
+    """
+    row_ids = [i for i, row in enumerate(grid)
+               if any(cell is not None for cell in row)]
+    col_ids = [j for j in range(len(v_rulings) - 1)
+               if any(row[j] is not None for row in grid)]
+    filled_grid = []
+    for i in row_ids:
+        filled_grid.append([])
+        for j in col_ids:
+            cell = grid[i][j]
+            if cell is None:
+                cell = EmptyCell()
+                cell.bbox = BBox(v_rulings[j], h_rulings[i],
+                                 v_rulings[j + 1], h_rulings[i + 1])
+            filled_grid[-1].append(cell)
+    return filled_grid
+
+
+def create_tables_from_rulings(page: LTPage, time_cells: Cs,
+                               other_cells: Cs) -> list[Table] | None:
+    """ Create a Table for each grid formed by the ruling lines of the page.
+
+    :param page: The page containing the rulings.
+    :param time_cells: The TimeCells of the page.
+    :param other_cells: All other Cells of the page. Those Cells that are
+        added to any of the Tables are removed from this list.
+    :return: The Tables, or None if the grids are not consistent or do not
+        contain all TimeCells. In the latter case, the Cells are not modified.
+    """
+    if not time_cells:
+        return None
+    candidates = list(other_cells)
+    covered_ids: set[int] = set()
+    grids_slots = []
+    for rulings in group_rulings(get_rulings(page)):
+        h_rulings, v_rulings = get_ruling_positions(rulings)
+        if min(len(h_rulings), len(v_rulings)) < MIN_RULING_COUNT:
+            continue
+        row_ids, col_ids = assign_cells_to_slots(
+            time_cells, h_rulings, v_rulings)
+        grid_time_cells = [
+            cell for cell, row_id, col_id in zip(time_cells, row_ids, col_ids)
+            if row_id >= 0 and col_id >= 0 and id(cell) not in covered_ids]
+        if not grid_time_cells:
+            continue
+        slots = get_slots(h_rulings, v_rulings, grid_time_cells, candidates)
+        if slots is None:
+            logger.info("The ruling lines of the page do not form a "
+                        "grid that is consistent with the TimeCells.")
+            return None
+        # Prevent Cells from being added to multiple grids.
+        slot_cell_ids = {id(c) for cells in slots.values() for c in cells}
+        candidates = [c for c in candidates if id(c) not in slot_cell_ids]
+        covered_ids |= set(map(id, grid_time_cells))
+        grids_slots.append((slots, h_rulings, v_rulings, grid_time_cells))
+
+    if len(covered_ids) != len(time_cells):
+        if grids_slots:
+            logger.info("The grids formed by the ruling lines of the page "
+                        "do not contain all TimeCells.")
+        return None
+
+    remaining_cells = list(other_cells)
+    tables = []
+    for slots, h_rulings, v_rulings, grid_time_cells in grids_slots:
+        grid = slots_to_grid(slots, h_rulings, v_rulings,
+                             grid_time_cells, remaining_cells)
+        logger.info(f"Created a table with {len(grid)} rows and "
+                    f"{len(grid[0])} columns using the ruling lines.")
+        tables.append(table_from_grid(grid))
+    other_cells[:] = remaining_cells
+    return tables
+
+
+def table_from_grid(grid: list[list[C]]) -> Table:
+    """ Link the Cells of the grid and create a Table from them.
+
+    :param grid: A list of rows, where each row has the same length.
+    :return: A new Table containing all Cells of the grid.
+    """
+    for row in grid:
+        link_cells(E, row)
+    for col in zip(*grid):
+        link_cells(S, list(col))
+    return Table(grid[0][0], grid[-1][-1])
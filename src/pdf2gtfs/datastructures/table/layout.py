@@ -0,0 +1,273 @@
+""" Provides layout templates, which store the position of the tables of
+previously read pages. These are used to skip most of the table detection,
+when reading documents with (nearly) the same layout. """
+
+from __future__ import annotations
+
+import json
+import logging
+from hashlib import sha1
+from pathlib import Path
+
+from pdf2gtfs.config import Config
+from pdf2gtfs.datastructures.pdftable.bbox import BBox
+from pdf2gtfs.datastructures.table.cell import Cs
+from pdf2gtfs.datastructures.table.table import Table
+from pdf2gtfs.utils import get_and_create_cache_dir
+
+
+logger = logging.getLogger(__name__)
+
+# The maximum difference in points between two page sizes,
+#  for a template to be used on a page.
+PAGE_SIZE_TOLERANCE = 2.
+# The relative distance the regions are padded with, when checking
+#  whether a Cell is within a region.
+REGION_PADDING = 0.01
+# The maximum number of templates stored per key.
+MAX_TEMPLATE_COUNT = 20
+
+
+def get_template_key() -> str:
+    """ Return the key used to store/load the templates.
+
+    If no layout_template_key was given, the key will be derived from the
+    config values that influence the table detection.
+    """
+    if Config.layout_template_key:
+        return "".join(char if char.isalnum() else "_"
+                       for char in Config.layout_template_key)
+    values = [Config.time_format, Config.split_orientations,
+              Config.table_expansion_directions, Config.merge_split_tables,
+              sorted(Config.header_values), Config.repeat_identifier]
+    return sha1(repr(values).encode("utf-8")).hexdigest()[:16]
+
+
+def get_template_path() -> Path:
+    """ Return the path of the file containing the templates. """
+    template_dir = get_and_create_cache_dir().joinpath("layout_templates")
+    template_dir.mkdir(exist_ok=True)
+    return template_dir.joinpath(f"{get_template_key()}.json")
+
+
+class TableRegion:
+    """ The region of a single table on the page, relative to the page size.
+
+    Also stores the Orientation of the stops, to be able to
+    verify that a table created using the region is valid. If the table
+    did not contain enough stops, the stop_orientation is empty instead.
+    """
+
+    def __init__(self, x0: float, y0: float, x1: float, y1: float,
+                 stop_orientation: str) -> None:
+        self.x0 = x0
+        self.y0 = y0
+        self.x1 = x1
+        self.y1 = y1
+        self.stop_orientation = stop_orientation
+
+    @staticmethod
+    def from_table(table: Table, width: float, height: float) -> TableRegion:
+        """ Create a new region from the given table.
+
+        :param table: The table, which was detected on the page.
+        :param width: The width of the page.
+        :param height: The height of the page.
+        :return: A new region, with coordinates relative to the page size.
+        """
+        bbox = table.bbox
+        o, stops = table.find_stops()
+        stop_orientation = o.name if len(stops) >= 3 else ""
+        return TableRegion(bbox.x0 / width, bbox.y0 / height,
+                           bbox.x1 / width, bbox.y1 / height,
+                           stop_orientation)
+
+    def to_bbox(self, width: float, height: float) -> BBox:
+        """ Return the (padded) absolute BBox of the region. """
+        pad_x = REGION_PADDING * width
+        pad_y = REGION_PADDING * height
+        return BBox(self.x0 * width - pad_x, self.y0 * height - pad_y,
+                    self.x1 * width + pad_x, self.y1 * height + pad_y)
+
+    def contains(self, bbox: BBox, width: float, height: float) -> bool:
+        """ Whether the center of the given BBox lies within the region. """
+        region = self.to_bbox(width, height)
+        x = (bbox.x0 + bbox.x1) / 2
+        y = (bbox.y0 + bbox.y1) / 2
+        return region.x0 <= x <= region.x1 and region.y0 <= y <= region.y1
+
+    def to_dict(self) -> dict[str, float | str]:
+        return {"x0": self.x0, "y0": self.y0, "x1": self.x1, "y1": self.y1,
+                "stop_orientation": self.stop_orientation}
+
+    @staticmethod
+    def from_dict(data: dict[str, float | str]) -> TableRegion:
+        return TableRegion(data["x0"], data["y0"], data["x1"], data["y1"],
+                           data["stop_orientation"])
+
+    def __eq__(self, other: TableRegion) -> bool:
+        return (abs(self.x0 - other.x0) <= REGION_PADDING
+                and abs(self.y0 - other.y0) <= REGION_PADDING
+                and abs(self.x1 - other.x1) <= REGION_PADDING
+                and abs(self.y1 - other.y1) <= REGION_PADDING
+                and self.stop_orientation == other.stop_orientation)
+
+
+class LayoutTemplate:
+    """ The layout of a single page, i.e. the regions of all its tables.
+
+    Only the regions (and the stop orientation of each region) are stored.
+    The columns, the header/stop/days positions and the cell types are
+    still detected for each region, because this is cheap compared to
+    splitting the table of the full page.
+    """
+
+    def __init__(self, width: float, height: float,
+                 regions: list[TableRegion]) -> None:
+        self.width = width
+        self.height = height
+        self.regions = regions
+
+    def fits_page(self, width: float, height: float) -> bool:
+        """ Whether the template was created using a page of the same size.
+        """
+        return (abs(self.width - width) <= PAGE_SIZE_TOLERANCE
+                and abs(self.height - height) <= PAGE_SIZE_TOLERANCE)
+
+    def assign_cells(self, time_cells: Cs) -> list[Cs] | None:
+        """ Assign each of the TimeCells to the region containing it.
+
+        :param time_cells: The TimeCells of the page.
+        :return: A list of Cells for each region or None, if either any
+            of the Cells is not contained in exactly one region or
+            if any of the regions does not contain any Cells.
+        """
+        groups: list[Cs] = [[] for _ in self.regions]
+        for cell in time_cells:
+            region_ids = [i for i, region in enumerate(self.regions)
+                          if region.contains(cell.bbox,
+                                             self.width, self.height)]
+            if len(region_ids) != 1:
+                return None
+            groups[region_ids[0]].append(cell)
+        if not all(groups):
+            return None
+        return groups
+
+    def to_dict(self) -> dict:
+        return {"width": self.width, "height": self.height,
+                "regions": [region.to_dict() for region in self.regions]}
+
+    @staticmethod
+    def from_dict(data: dict) -> LayoutTemplate:
+        regions = [TableRegion.from_dict(region)
+                   for region in data["regions"]]
+        return LayoutTemplate(data["width"], data["height"], regions)
+
+    def __eq__(self, other: LayoutTemplate) -> bool:
+        return (self.fits_page(other.width, other.height)
+                and self.regions == other.regions)
+
+
+class LayoutLibrary:
+    """ Persistent collection of LayoutTemplates, stored in the cache. """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path if path else get_template_path()
+        self.templates: list[LayoutTemplate] = []
+        self.changed = False
+        self.read()
+
+    def read(self) -> None:
+        """ Read the templates from the template file, if it exists. """
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as fil:
+                data = json.load(fil)
+            self.templates = [LayoutTemplate.from_dict(template)
+                              for template in data["templates"]]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not read the layout templates from "
+                           f"'{self.path}'. Reason: '{e}'")
+            self.templates = []
+
+    def write(self) -> None:
+        """ Write the templates to the template file, if they changed. """
+        if not self.changed:
+            return
+        data = {"templates": [template.to_dict()
+                              for template in self.templates]}
+        try:
+            with open(self.path, "w", encoding="utf-8") as fil:
+                json.dump(data, fil, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not write the layout templates to "
+                           f"'{self.path}'. Reason: '{e}'")
+            return
+        self.changed = False
+
+    def learn(self, tables: list[Table], width: float, height: float
+              ) -> None:
+        """ Add a new template, based on the given tables.
+
+        The most recently learned/used templates are matched first.
+
+        :param tables: The tables that were detected on the page.
+        :param width: The width of the page.
+        :param height: The height of the page.
+        """
+        if not tables:
+            return
+        regions = [TableRegion.from_table(table, width, height)
+                   for table in tables]
+        template = LayoutTemplate(width, height, regions)
+        if template in self.templates:
+            self.templates.remove(template)
+        self.templates.insert(0, template)
+        del self.templates[MAX_TEMPLATE_COUNT:]
+        self.changed = True
+
+    def match(self, time_cells: Cs, width: float, height: float
+              ) -> tuple[LayoutTemplate, list[Cs]] | None:
+        """ Find the first template that can be used for the given Cells.
+
+        The matched template is moved to the front, so it is checked first
+        when matching the next page.
+
+        :param time_cells: The TimeCells of the page.
+        :param width: The width of the page.
+        :param height: The height of the page.
+        :return: The template and the TimeCells of each of its regions,
+            or None, if no template fits.
+        """
+        for i, template in enumerate(self.templates):
+            if not template.fits_page(width, height):
+                continue
+            groups = template.assign_cells(time_cells)
+            if groups is None:
+                continue
+            if i > 0:
+                self.templates.insert(0, self.templates.pop(i))
+                self.changed = True
+            return template, groups
+        return None
+
+
+def tables_match_template(tables: list[Table], template: LayoutTemplate
+                          ) -> bool:
+    """ Check that the tables created using the template are valid.
+
+    :param tables: The tables created using the regions of the template.
+    :param template: The template used.
+    :return: True, if each table has enough stops and the stops have the
+        same Orientation as the ones of the table used to create the region.
+        Tables of regions without stops are not checked.
+    """
+    for table, region in zip(tables, template.regions, strict=True):
+        if not region.stop_orientation:
+            continue
+        o, stops = table.find_stops()
+        if len(stops) < 3 or o.name != region.stop_orientation:
+            return False
+    return True
@@ -0,0 +1,283 @@
+""" Provides the extraction of Tables from the structure tree of tagged PDFs.
+
+Tagged (i.e., accessible) PDFs may contain a logical structure, where each
+table is represented by Table/TR/TH/TD elements. These elements reference
+the text of the page using marked-content ids (MCIDs). If the structure
+exists, the Tables can be created directly from it, without having to
+infer the table structure from the position of the text.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, TypeAlias
+
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LTChar
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import PDFObjRef, resolve1
+from pdfminer.psparser import PSLiteral
+
+from pdf2gtfs.datastructures.table.cell import (
+    C, Cell, EmptyCell, get_bbox_from_chars,
+    )
+from pdf2gtfs.datastructures.table.grid import table_from_grid
+from pdf2gtfs.datastructures.table.table import Table
+
+
+logger = logging.getLogger(__name__)
+
+# The page objid and the MCID of a marked-content sequence.
+MCKey: TypeAlias = tuple[int | None, int]
+
+ROW_PARENTS = ("THead", "TBody", "TFoot")
+CELL_TYPES = ("TH", "TD")
+
+
+class MarkedContentAggregator(PDFPageAggregator):
+    """ PDFPageAggregator, that stores the chars of each marked-content
+    sequence, based on its MCID. """
+
+    def __init__(self, rsrcmgr: PDFResourceManager) -> None:
+        super().__init__(rsrcmgr)
+        self.page_objid: int | None = None
+        self.mcids: list[int | None] = []
+        self.mcid_chars: dict[MCKey, list[LTChar]] = {}
+
+    def begin_tag(self, tag: PSLiteral, props: Any = None) -> None:
+        mcid = props.get("MCID") if isinstance(props, dict) else None
+        self.mcids.append(mcid)
+
+    def end_tag(self) -> None:
+        if self.mcids:
+            self.mcids.pop()
+
+    def render_char(self, *args, **kwargs) -> float:
+        adv = super().render_char(*args, **kwargs)
+        # Use the innermost sequence with an MCID.
+        mcid = next((m for m in reversed(self.mcids) if m is not None), None)
+        if mcid is not None:
+            key = (self.page_objid, mcid)
+            self.mcid_chars.setdefault(key, []).append(self.cur_item._objs[-1])
+        return adv
+
+
+def get_name(obj: Any) -> str:
+    """ Return the name of the given PDF name object. """
+    obj = resolve1(obj)
+    if isinstance(obj, PSLiteral):
+        obj = obj.name
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    return str(obj)
+
+
+class StructureTree:
+    """ The structure tree of a tagged PDF. """
+
+    def __init__(self, root: dict) -> None:
+        self.root = root
+        role_map = resolve1(root.get("RoleMap", {})) or {}
+        self.role_map = {get_name(key): get_name(value)
+                         for key, value in role_map.items()}
+
+    def get_type(self, elem: dict) -> str:
+        """ Return the standard structure type of the element. """
+        typ = get_name(elem.get("S", ""))
+        # Custom types may be mapped to other custom types.
+        seen = set()
+        while typ in self.role_map and typ not in seen:
+            seen.add(typ)
+            typ = self.role_map[typ]
+        return typ
+
+    @staticmethod
+    def get_kids(elem: dict) -> list[Any]:
+        """ Return the resolved kids of the element. """
+        kids = resolve1(elem.get("K", []))
+        if not isinstance(kids, list):
+            kids = [kids]
+        return [resolve1(kid) for kid in kids]
+
+    @staticmethod
+    def is_struct_elem(obj: Any) -> bool:
+        return isinstance(obj, dict) and "S" in obj
+
+    def find_elements(self, typ: str) -> list[dict]:
+        """ Return all elements of the given type, in document order.
+
+        Elements of the given type are not searched for nested elements.
+        """
+        elements = []
+        stack = list(reversed(self.get_kids(self.root)))
+        while stack:
+            elem = stack.pop()
+            if not self.is_struct_elem(elem):
+                continue
+            if self.get_type(elem) == typ:
+                elements.append(elem)
+                continue
+            stack += reversed(self.get_kids(elem))
+        return elements
+
+    def get_rows(self, table: dict) -> list[list[dict]]:
+        """ Return the cell elements of each row of the table. """
+        rows = []
+        for kid in self.get_kids(table):
+            if not self.is_struct_elem(kid):
+                continue
+            typ = self.get_type(kid)
+            if typ in ROW_PARENTS:
+                rows += self.get_rows(kid)
+            elif typ == "TR":
+                rows.append([cell for cell in self.get_kids(kid)
+                             if self.is_struct_elem(cell)
+                             and self.get_type(cell) in CELL_TYPES])
+        return rows
+
+    def get_mc_keys(self, elem: dict, page: int | None = None
+                    ) -> list[MCKey]:
+        """ Return the keys of all marked-content sequences of the element.
+
+        :param elem: The structure element.
+        :param page: The objid of the page of the parent element.
+        :return: The keys of all sequences referenced by elem or its kids.
+        """
+        page = get_page_objid(elem, page)
+        keys = []
+        for kid in self.get_kids(elem):
+            if isinstance(kid, int):
+                keys.append((page, kid))
+            elif self.is_struct_elem(kid):
+                keys += self.get_mc_keys(kid, page)
+            elif isinstance(kid, dict) and "MCID" in kid:
+                keys.append((get_page_objid(kid, page), kid["MCID"]))
+        return keys
+
+
+def get_page_objid(obj: dict, default: int | None) -> int | None:
+    """ Return the objid of the page referenced by obj, if it exists. """
+    page = obj.get("Pg")
+    if isinstance(page, PDFObjRef):
+        return page.objid
+    return default
+
+
+def chars_to_text(lt_chars: list[LTChar]) -> str:
+    """ Join the text of the chars, adding spaces between words/lines.
+
+    Tagged PDFs often position words instead of using space chars.
+    """
+    from pdf2gtfs.reader import _fix_cid_text
+
+    text = ""
+    prev = None
+    for char in lt_chars:
+        if prev is not None:
+            gap = char.x0 - prev.x1
+            new_line = abs(char.y0 - prev.y0) > prev.height / 2
+            if new_line or gap > prev.width / 3:
+                text += " "
+        text += _fix_cid_text(char.get_text())
+        prev = char
+    return " ".join(text.split())
+
+
+def create_cell(lt_chars: list[LTChar], page_height: float) -> C:
+    """ Create a Cell from the given chars or an EmptyCell, if there are none.
+    """
+    text = chars_to_text(lt_chars)
+    if not text:
+        return EmptyCell()
+    bbox = get_bbox_from_chars(lt_chars, page_height)
+    font = lt_chars[0].font
+    fontname = font.fontname if font else None
+    return Cell(text, bbox, font, fontname, lt_chars[0].fontsize)
+
+
+def create_table(rows: list[list[list[LTChar]]], page_height: float
+                 ) -> Table | None:
+    """ Create a Table from the chars of each cell of each row.
+
+    Rows with fewer cells (e.g., because of spanning cells)
+    are filled with EmptyCells. Rows/cols without text are dropped.
+
+    :param rows: The chars of each cell of each row.
+    :param page_height: The height of the page the table is on.
+    :return: The Table or None, if the table does not contain any text.
+    """
+    col_count = max(map(len, rows), default=0)
+    grid = [[create_cell(chars, page_height) for chars in row]
+            + [EmptyCell() for _ in range(col_count - len(row))]
+            for row in rows]
+    grid = [row for row in grid
+            if not all(isinstance(c, EmptyCell) for c in row)]
+    if not grid:
+        return None
+    col_ids = [i for i in range(col_count)
+               if not all(isinstance(row[i], EmptyCell) for row in grid)]
+    grid = [[row[i] for i in col_ids] for row in grid]
+    return table_from_grid(grid)
+
+
+def get_tables_from_structure_tree(file: str | Path,
+                                   page_ids: list[int] | None
+                                   ) -> dict[int, list[Table]] | None:
+    """ Create the Tables using the structure tree of the PDF.
+
+    :param file: The path to the PDF.
+    :param page_ids: The 0-indexed pages to read or None for all pages.
+    :return: The Tables of each page, with the keys being the pageid used by
+        pdfminer. None, if the PDF does not contain any Table elements
+        with text on the given pages.
+    """
+    with open(file, "rb") as fil:
+        document = PDFDocument(PDFParser(fil))
+        root = resolve1(document.catalog.get("StructTreeRoot"))
+        if not isinstance(root, dict):
+            return None
+        tree = StructureTree(root)
+        table_elements = tree.find_elements("Table")
+        if not table_elements:
+            return None
+
+        rsrcmgr = PDFResourceManager()
+        device = MarkedContentAggregator(rsrcmgr)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        # Maps each page's objid to its pageid and height.
+        pages: dict[int, tuple[int, float]] = {}
+        for page_id, page in enumerate(PDFPage.create_pages(document)):
+            if page_ids is not None and page_id not in page_ids:
+                continue
+            device.page_objid = page.pageid
+            interpreter.process_page(page)
+            lt_page = device.get_result()
+            pages[page.pageid] = lt_page.pageid, lt_page.y1
+
+    page_tables: dict[int, list[Table]] = {}
+    for table_element in table_elements:
+        rows = []
+        default_page = get_page_objid(table_element, None)
+        table_page = None
+        for row in tree.get_rows(table_element):
+            rows.append([])
+            for cell in row:
+                keys = tree.get_mc_keys(cell, default_page)
+                if table_page is None and keys:
+                    table_page = keys[0][0]
+                rows[-1].append([char for key in keys
+                                 for char in device.mcid_chars.get(key, [])])
+        # Skip tables on pages that were not read.
+        if table_page not in pages:
+            continue
+        pageid, page_height = pages[table_page]
+        table = create_table(rows, page_height)
+        if table is None:
+            continue
+        page_tables.setdefault(pageid, []).append(table)
+    # The structure tree is not usable, if none of the tables contain text.
+    return page_tables if page_tables else None
@@ -13,7 +13,9 @@ from more_itertools import (
 
 from pdf2gtfs.config import Config
 from pdf2gtfs.datastructures.pdftable.bbox import BBox
+from pdf2gtfs.datastructures.table.analysis import TableAnalysis
 from pdf2gtfs.datastructures.table.bounds import select_adjacent_cells
+from pdf2gtfs.datastructures.table.budget import PageBudget
 from pdf2gtfs.datastructures.table.cell import (
     Cell, EmptyCell, C, Cs, OC,
     )
@@ -21,6 +23,7 @@ from pdf2gtfs.datastructures.table.celltype import T
 from pdf2gtfs.datastructures.table.direction import (
     D, Direction, E, H, N, Orientation, S, V, W,
     )
+from pdf2gtfs.p2g_logging import LazyMessage
 from pdf2gtfs.utils import (
     bbox_is_indented, get_stop_base_name,
     text_starts_with_delimiter,
@@ -71,6 +74,7 @@ class Table:
     Able to expand in all Directions using adjacent Cells.
     """
     def __init__(self, first_cell: C, last_cell: C):
+        self.analysis = TableAnalysis(self)
         self.bboxes: dict[int: int] = {}
         self._left = None
         self._right = None
@@ -229,6 +233,7 @@ class Table:
         if self.potential_cells is None:
             raise Exception("Potential Cells must be added to this Table, "
                             "before trying to expand it.")
+        PageBudget.check()
         normal = d.o.normal
         ref_cells = list(self.get_end(d).iter(o=normal))
 
@@ -385,14 +390,15 @@ class Table:
                         break
         return values
 
-    def _print(self, getter_func: Callable[[C], str],
-               align_func: Callable[[C], str] = lambda _: "^",
-               col_count: int | None = None) -> None:
-        """ Print the Cells of the Table to stdout.
+    def _render(self, getter_func: Callable[[C], str],
+                align_func: Callable[[C], str] = lambda _: "^",
+                col_count: int | None = None) -> str:
+        """ Render the Cells of the Table as text.
 
         :param getter_func: A function used to get the value that is printed.
         :param align_func: A function used to align each value.
         :param col_count: The maximum number of columns to print.
+        :return: The rendered Table, one line per row.
         """
         rows = [cell.row for cell in self.left.col]
         cols = [cell.col for cell in self.top.row]
@@ -406,12 +412,13 @@ class Table:
                       for i, f in enumerate(row)][:col_count]
             lines += [delim.lstrip() + delim.join(values) + delim.rstrip()]
 
-        logger.info("\n" + "\n".join(lines))
+        return "\n".join(lines)
 
-    def print(self, col_count: int | None = 8) -> None:
-        """ Print the Table to stdout.
+    def render(self, col_count: int | None = 8) -> str:
+        """ Render the text of each Cell of the Table.
 
         :param col_count: The maximum number of columns that will be printed.
+        :return: The rendered Table.
         """
         def get_text_align(c) -> str:
             """ Right align all TimeCells; left align everything else.
@@ -421,19 +428,36 @@ class Table:
             """
             return ">" if c.has_type(T.Time, strict=True) else "<"
 
-        self._print(attrgetter("text"), get_text_align, col_count)
+        return self._render(attrgetter("text"), get_text_align, col_count)
 
-    def print_types(self, col_count: int = None) -> None:
-        """ Print the inferred type of each Cell, instead of its text.
+    def render_types(self, col_count: int = None) -> str:
+        """ Render the inferred type of each Cell, instead of its text.
 
         :param col_count: The maximum number of columns that will be printed.
+        :return: The rendered Table.
         """
         def _get_type_name(c: C) -> str:
             if isinstance(c, EmptyCell):
                 return ""
             return c.get_type().name
 
-        self._print(_get_type_name, col_count=col_count)
+        return self._render(_get_type_name, col_count=col_count)
+
+    def print(self, col_count: int | None = 8) -> None:
+        """ Log the Table on the debug level.
+
+        The Table is only rendered, if the record is actually emitted.
+
+        :param col_count: The maximum number of columns that will be printed.
+        """
+        logger.debug("\n%s", LazyMessage(self.render, col_count))
+
+    def print_types(self, col_count: int = None) -> None:
+        """ Log the inferred type of each Cell on the debug level.
+
+        :param col_count: The maximum number of columns that will be printed.
+        """
+        logger.debug("\n%s", LazyMessage(self.render_types, col_count))
 
     def to_file(self, fname: Path) -> None:
         """ Export the Table to the given Path as .csv file. """
@@ -488,6 +512,7 @@ class Table:
 
         tables = []
         for group in cell_groups:
+            PageBudget.check()
             head = group[0]
             # The splitter should not implicitly be part of any Table.
             if head.table != self:
@@ -511,6 +536,7 @@ class Table:
 
         bound = normal.lower.coordinate
         for group in grouped_cells:
+            PageBudget.check()
             group_bbox = BBox.from_bboxes([f.bbox for f in group])
             for i, table_cell in enumerate(table_cells[idx:], idx):
                 table_bbox: BBox = self.get_bbox_of(table_cell.iter(o=o))
@@ -715,6 +741,7 @@ class Table:
 
         :return: The Orientation of the Stops, as well as the list of stops,
             with each Stop's row/col index based on Orientation.
+            The result is cached until the Table or the Types change.
         """
         def _find_stops(o: Orientation, start: C | None = None
                         ) -> list[tuple[int, C]]:
@@ -728,9 +755,15 @@ class Table:
                 return series
             return []
 
-        v_stops = _find_stops(V)
-        h_stops = _find_stops(H)
-        return (V, v_stops) if len(v_stops) > len(h_stops) else (H, h_stops)
+        def _find_all_stops() -> tuple[Orientation, list[tuple[int, C]]]:
+            v_stops = _find_stops(V)
+            h_stops = _find_stops(H)
+            if len(v_stops) > len(h_stops):
+                return V, v_stops
+            return H, h_stops
+
+        o, stops = self.analysis.get("stops", _find_all_stops)
+        return o, list(stops)
 
     def infer_cell_types(self) -> None:
         """ Infer the CellTypes of each Cell.
@@ -742,6 +775,7 @@ class Table:
         #  only stop inference, when they no longer change.
         #  Should watch for loops then, though.
         for starter in self.left.row:
+            PageBudget.check()
             for cell in starter.col:
                 cell.type.infer_type_from_neighbors()
 
@@ -804,6 +838,8 @@ class Table:
         self.infer_cell_types()
         merge_stops(*self.find_stops())
         fix_stop_abbreviations([c for (_, c) in self.find_stops()[1]])
+        # The text of the stops may have changed.
+        self.analysis.invalidate(False)
         merge_consecutive_days()
         self.remove_duplicate_days(H, first_table)
 
@@ -853,6 +889,7 @@ class Table:
         for days in invalid_days:
             for day in days:
                 del day.type.possible_types[T.Days]
+                day.invalidate_analysis(False)
                 day.type.infer_type_from_neighbors()
 
     def of_type(self, typ: T, o: Orientation = V, single: bool = False,
@@ -872,19 +909,23 @@ class Table:
         :return: A list of lists,
             where each sublist contains Cells of the given Type.
         """
-        cells_of_type: list[list[C]] = []
-        for starter in self.left.iter(o=o.normal):
-            cells_of_type.append([])
-            for cell in starter.iter(o=o):
-                if cell.has_type(typ, strict=strict):
-                    cells_of_type[-1].append(cell)
-            if not cells_of_type[-1]:
-                cells_of_type.pop()
-            # Only return Cells of the first row/col
-            # that contains Cells of the given type.
-            if single and cells_of_type:
-                return cells_of_type
-        return cells_of_type
+        def _of_type() -> list[list[C]]:
+            cells_of_type: list[list[C]] = []
+            for starter in self.left.iter(o=o.normal):
+                cells_of_type.append([])
+                for cell in starter.iter(o=o):
+                    if cell.has_type(typ, strict=strict):
+                        cells_of_type[-1].append(cell)
+                if not cells_of_type[-1]:
+                    cells_of_type.pop()
+                # Only return Cells of the first row/col
+                # that contains Cells of the given type.
+                if single and cells_of_type:
+                    return cells_of_type
+            return cells_of_type
+
+        key = ("of_type", typ, o.name, single, strict)
+        return [list(series) for series in self.analysis.get(key, _of_type)]
 
     def replace_cell(self, cell: Cell, new_cell: Cell) -> None:
         if cell.prev:
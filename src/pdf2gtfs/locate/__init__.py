@@ -102,9 +102,8 @@ def get_unique_routes(handler: GTFSHandler) -> dict[str, list[GTFSStopEntry]]:
     def route_is_contained(contained_route_id: str) -> bool:
         """ Return if the route is contained by any other. """
 
-        def _route_contains_stops(
-                container: list[GTFSStopEntry], stops: list[GTFSStopEntry]
-                ) -> bool:
+        def _route_contains_stops(container: list[str], stops: list[str]
+                                  ) -> bool:
             """ Return if all stops are in container, in the right order. """
             # No need to check for length, as r1 has at least the length of r2.
             # Copy to prevent changing the list using pop.
@@ -115,15 +114,16 @@ def get_unique_routes(handler: GTFSHandler) -> dict[str, list[GTFSStopEntry]]:
 
             return not stops
 
-        route_stops = handler.get_stops_of_route(contained_route_id)
+        route_stop_ids = analysis.get_stop_ids(contained_route_id)
 
         for existing_route_id in routes:
-            existing_stops = handler.get_stops_of_route(existing_route_id)
-            if _route_contains_stops(existing_stops, route_stops):
+            existing_stop_ids = analysis.get_stop_ids(existing_route_id)
+            if _route_contains_stops(existing_stop_ids, route_stop_ids):
                 return True
 
         return False
 
+    analysis = handler.route_analysis
     route_ids = handler.get_sorted_route_ids()
 
     routes = {}
@@ -1,7 +1,5 @@
 """ Provides a fetcher for OSM data using QLever. """
 
-import os
-import platform
 from datetime import datetime as dt
 from io import BytesIO
 from logging import getLogger
@@ -14,7 +12,7 @@ import requests
 
 from pdf2gtfs.config import Config
 from pdf2gtfs.locate.finder.loc_nodes import OSMNode
-from pdf2gtfs.utils import normalize_series
+from pdf2gtfs.utils import get_and_create_cache_dir, normalize_series
 
 
 logger = getLogger(__name__)
@@ -151,58 +149,6 @@ class OSMFetcher:
         return dataframe
 
 
-def get_cache_dir(fallback_dir: Path) -> Path:
-    """ Return the system dependent path to the cache directory.
-
-If system is not one of linux or windows, return None instead.
-"""
-    if Config.cache_directory:
-        return Config.cache_directory
-    system = platform.system().lower()
-    if system == "windows":
-        return Path(os.path.expandvars("%LOCALAPPDATA%/pdf2gtfs/")).resolve()
-    if system == "linux":
-        return Path(os.path.expanduser("~/.cache/pdf2gtfs/")).resolve()
-
-    fallback_msg = f"Using fallback cache directory ({fallback_dir})."
-    logger.warning("Could not determine system platform. " + fallback_msg)
-    return fallback_dir
-
-
-def create_cache_dir(path: Path, fallback_dir: Path) -> Path:
-    """ Tries to create the cache directory.
-
-If creation fails, use the fallback cache directory.
-"""
-    fallback_msg = f"Using fallback cache directory ({fallback_dir})."
-    if path.exists():
-        if path.is_dir():
-            return path
-        logger.warning(f"Cache directory '{path}' appears to be a file. "
-                       f"You need to move or remove that file to use the "
-                       f"default system cache. " + fallback_msg)
-        return fallback_dir
-    try:
-        os.makedirs(path, exist_ok=True)
-        return path
-    except OSError as e:
-        logger.warning(f"Cache directory could not be created. "
-                       f"Reason: '{e}'\n" + fallback_msg)
-        return fallback_dir
-
-
-def get_and_create_cache_dir() -> Path:
-    """ Get the cache directory path. Create it, if it does not exist.
-
-    If this fails at any point, the src directory will be used as fallback.
-    """
-
-    fallback_dir = Config.source_dir
-    path = get_cache_dir(fallback_dir)
-    path = create_cache_dir(path, fallback_dir)
-    return path
-
-
 def get_osm_comments(include_date: bool = True) -> str:
     """ Return the comment that would be written to the top of the cache,
     if the cache would be created right now. Uses get_qlever_query. """
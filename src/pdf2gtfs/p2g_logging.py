@@ -3,6 +3,23 @@
 import logging
 import sys
 from logging import LogRecord
+from typing import Any, Callable
+
+
+class LazyMessage:
+    """ A log message, which is only created, if the record is emitted.
+
+    Used for messages that are expensive to create, e.g. the rendering
+    of a Table. Loggers and handlers, whose level is higher than the
+    level of the record, never create the message.
+    """
+
+    def __init__(self, func: Callable[..., str], *args: Any) -> None:
+        self.func = func
+        self.args = args
+
+    def __str__(self) -> str:
+        return self.func(*self.args)
 
 
 def disable_pdfminer_logger() -> None:
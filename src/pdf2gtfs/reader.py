@@ -27,14 +27,25 @@ from pdfminer.pdfdocument import PDFDocument
 from pdfminer.pdffont import PDFFont
 from pdfminer.pdfinterp import PDFGraphicState
 from pdfminer.pdfparser import PDFParser, PDFSyntaxError
+from pdfminer.psparser import PSException
 from pdfminer.utils import Matrix
 
 from pdf2gtfs.config import Config
 from pdf2gtfs.datastructures.pdftable import Char
 from pdf2gtfs.datastructures.pdftable.field import Field as PDFField
 from pdf2gtfs.datastructures.table.bounds import Bounds
+from pdf2gtfs.datastructures.table.budget import (
+    PageBudget, PageBudgetExceeded,
+    )
 from pdf2gtfs.datastructures.table.cell import C, Cell, Cs
 from pdf2gtfs.datastructures.table.celltype import T
+from pdf2gtfs.datastructures.table.grid import create_tables_from_rulings
+from pdf2gtfs.datastructures.table.structure import (
+    get_tables_from_structure_tree,
+    )
+from pdf2gtfs.datastructures.table.layout import (
+    LayoutLibrary, LayoutTemplate, tables_match_template,
+    )
 from pdf2gtfs.datastructures.table.table import (
     merge_tables, Table,
     )
@@ -131,10 +142,10 @@ def get_chars_dataframe(page: LTPage) -> pd.DataFrame:
         char = lt_char_to_dict(text_char, page.y1)
         # Ignore vertical text.
         if not text_char.upright:
-            msg = ("Char(text='{text}', x0={x0:.2f}, "
-                   "y0={y0:.2f}, x1={x1:.2f}, y1={y1:.2f})")
-            logger.debug(f"Skipping vertical char:\n\t"
-                         f"{msg.format(**char)}")
+            logger.debug("Skipping vertical char:\n\tChar(text='%s', "
+                         "x0=%.2f, y0=%.2f, x1=%.2f, y1=%.2f)",
+                         char["text"], char["x0"], char["y0"],
+                         char["x1"], char["y1"])
             continue
         char_list.append(char)
 
@@ -289,35 +300,102 @@ def assign_other_cells_to_tables(tables: list[Table], cells: Cs) -> None:
                                  if bounds.within_bounds(f)]
 
 
-def create_tables_from_page(page: LTPage) -> list[Table]:
-    """ Use the cells on the page to create the tables.
+def finalize_tables(tables: list[Table], other_cells: Cs) -> list[Table]:
+    """ Expand the given tables and infer the types of their Cells.
 
-    :param page: An LTPage.
-    :return: A list of tables, where each table is minimal in the sense
-        that it can not be easily split into multiple tables where each
-        table still contains a stop col/row; they are also maximal, in
-        the sense that no other cells exist on the page, that can be
-        attributed to the table in a simple manner.
+    :param tables: The (split) tables of the page.
+    :param other_cells: All Cells of the page, that are not TimeCells.
+    :return: The tables, merged if Config.merge_split_tables is True.
     """
-    time_cells, non_time_cells, invalid_cells = get_cells_from_page(page)
-    t = Table.from_time_cells(time_cells)
-    other_cells = non_time_cells
-    t.insert_repeat_cells(other_cells)
-    t.print(None)
-    tables = t.max_split(other_cells)
     assign_other_cells_to_tables(tables, other_cells)
     for t in tables:
         t.expand_all()
-        logger.info("Found the following table:")
+        logger.debug("Found the following table:")
         t.print(None)
         t.cleanup(tables[0] if t != tables[0] else None)
-        logger.info("With the following types:")
+        logger.debug("With the following types:")
         t.print_types()
     if Config.merge_split_tables:
         tables = merge_tables(tables)
     return tables
 
 
+def create_tables_from_template(template: LayoutTemplate, groups: list[Cs],
+                                other_cells: Cs) -> list[Table] | None:
+    """ Use the given (matching) layout template to create the tables.
+
+    Instead of splitting a single table containing all TimeCells, a table
+    is created for each region of the template, using its TimeCells.
+
+    :param template: The template that matched the page.
+    :param groups: The TimeCells of each region of the template.
+    :param other_cells: All Cells of the page, that are not TimeCells.
+    :return: The tables, or None if the tables created using
+        the template are invalid.
+    """
+    tables = []
+    for group in groups:
+        t = Table.from_time_cells(group)
+        t.insert_repeat_cells(other_cells)
+        tables.append(t)
+    tables = finalize_tables(tables, other_cells)
+    if (len(tables) != len(template.regions)
+            or not tables_match_template(tables, template)):
+        logger.info("The tables created using the layout template are "
+                    "invalid. Falling back to the full table detection.")
+        return None
+    logger.info("Created the tables using a layout template.")
+    return tables
+
+
+def create_tables_from_page(page: LTPage,
+                            layouts: LayoutLibrary | None = None
+                            ) -> list[Table]:
+    """ Use the cells on the page to create the tables.
+
+    If Config.use_ruling_lines is True, the ruling lines of the page are
+    used to create the tables first, falling back to the Cell-based
+    detection, if they do not form consistent grids.
+
+    :param page: An LTPage.
+    :param layouts: If given, the layout templates are used to skip the
+        splitting of the table. If none of the templates match the page,
+        the tables detected using the full detection are learned instead.
+    :return: A list of tables, where each table is minimal in the sense
+        that it can not be easily split into multiple tables where each
+        table still contains a stop col/row; they are also maximal, in
+        the sense that no other cells exist on the page, that can be
+        attributed to the table in a simple manner.
+    """
+    time_cells, other_cells, _ = get_cells_from_page(page)
+    match = None
+    if layouts is not None and time_cells:
+        match = layouts.match(time_cells, page.width, page.height)
+    if match is not None:
+        tables = create_tables_from_template(*match, other_cells)
+        if tables is not None:
+            return tables
+        # The Cells were linked while creating the tables, so we need to
+        #  recreate them, before we can use the full detection.
+        time_cells, other_cells, _ = get_cells_from_page(page)
+
+    tables = None
+    if Config.use_ruling_lines:
+        tables = create_tables_from_rulings(page, time_cells, other_cells)
+    if tables is not None:
+        for t in tables:
+            t.print(None)
+    else:
+        t = Table.from_time_cells(time_cells)
+        t.insert_repeat_cells(other_cells)
+        t.print(None)
+        tables = t.max_split(other_cells)
+    tables = finalize_tables(tables, other_cells)
+    if layouts is not None:
+        layouts.learn(tables, page.width, page.height)
+    return tables
+
+
 def tables_to_timetables(tables: list[Table]) -> list[TimeTable]:
     timetables = []
     for table in tables:
@@ -437,20 +515,82 @@ def tables_to_csv(page_id: int, tables: list[Table] | list[PDFTable]) -> None:
         table.to_file(path)
 
 
-def page_to_timetables(page: LTPage) -> list[TimeTable]:
-    """ Extract all timetables from the given page. """
+def tables_to_artifacts(page_id: int, tables: list[Table]) -> None:
+    """ Write the text and the types of the given tables to .txt files.
+
+    :param page_id: The page_id of the page the tables come from.
+    :param tables: The tables we want to export.
+    """
+    page = Config.pages.page_num(page_id)
+    artifact_dir = Config.output_dir.joinpath("artifacts")
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    input_name = Path(Config.filename).stem
+    logger.info(f"Writing the artifacts of the tables of page {page} "
+                f"to {artifact_dir}...")
+    for table_id, table in enumerate(tables, 1):
+        fname = f"{input_name}-{page:02}-{table_id:02}.txt"
+        with open(artifact_dir.joinpath(fname), "w", encoding="utf-8") as fil:
+            fil.write(table.render(None) + "\n\n")
+            fil.write(table.render_types() + "\n")
+
+
+def page_to_timetables_legacy(page: LTPage) -> list[TimeTable]:
+    """ Extract all timetables from the given page using the legacy
+    extraction algorithm. """
+    char_df = get_chars_dataframe(page)
+    pdf_tables = get_pdf_tables_from_df(char_df)
+    if Config.output_tables_as_csv:
+        tables_to_csv(page.pageid, pdf_tables)
+    return pdf_tables_to_timetables(pdf_tables)
+
+
+def page_to_timetables_with_budget(page: LTPage,
+                                   layouts: LayoutLibrary | None
+                                   ) -> list[TimeTable]:
+    """ Extract all timetables from the given page, while limiting
+    the time/number of operations spent on the table detection.
+
+    If the budget is exceeded, either the legacy extraction algorithm
+    is used or the page is skipped, based on Config.page_budget_fallback.
+
+    :param page: The page containing the timetables.
+    :param layouts: The layout templates used when creating the tables.
+    :return: The timetables of the page.
+    """
+    PageBudget.start()
+    try:
+        cell_tables = create_tables_from_page(page, layouts)
+        time_tables = tables_to_timetables(cell_tables)
+    except PageBudgetExceeded as e:
+        page_num = Config.pages.page_num(page.pageid)
+        if Config.page_budget_fallback == "legacy":
+            logger.warning(f"Page {page_num}: {e} Falling back to the "
+                           f"legacy extraction algorithm.")
+            return page_to_timetables_legacy(page)
+        logger.warning(f"Page {page_num}: {e} Skipping the page.")
+        return []
+    finally:
+        PageBudget.stop()
+    if Config.output_tables_as_csv:
+        tables_to_csv(page.pageid, cell_tables)
+    if Config.dump_table_artifacts:
+        tables_to_artifacts(page.pageid, cell_tables)
+    return time_tables
+
+
+def page_to_timetables(page: LTPage, layouts: LayoutLibrary | None = None
+                       ) -> list[TimeTable]:
+    """ Extract all timetables from the given page.
+
+    :param page: The page containing the timetables.
+    :param layouts: The layout templates used when creating the tables.
+    :return: The timetables of the page.
+    """
     if Config.use_legacy_extraction:
         logger.info("Using legacy extraction algorithm.")
-        char_df = get_chars_dataframe(page)
-        pdf_tables = get_pdf_tables_from_df(char_df)
-        if Config.output_tables_as_csv:
-            tables_to_csv(page.pageid, pdf_tables)
-        time_tables = pdf_tables_to_timetables(pdf_tables)
+        time_tables = page_to_timetables_legacy(page)
     else:
-        cell_tables = create_tables_from_page(page)
-        if Config.output_tables_as_csv:
-            tables_to_csv(page.pageid, cell_tables)
-        time_tables = tables_to_timetables(cell_tables)
+        time_tables = page_to_timetables_with_budget(page, layouts)
 
     logger.info(f"Number of tables found: {len(time_tables)}")
     return time_tables
@@ -496,6 +636,7 @@ class Reader:
 
         Remove invisible text (most likely used for OCR/etc.), as well as
         images and vector graphics, to improve the performance.
+        Vector graphics are kept, if the ruling lines are used.
         """
         if not preprocess_check():
             return
@@ -514,6 +655,9 @@ class Reader:
                    "-dFILTERVECTOR", "-dPRINTED=true", "-dFitPage",
                    "-dBlackText", "-q", "-dBATCH ",
                    f"-sOutputFile={self.tempfile.name}", str(self.filepath)]
+        # The ruling lines are vector graphics, so we need to keep them.
+        if Config.use_ruling_lines:
+            gs_args.remove("-dFILTERVECTOR")
 
         try:
             Ghostscript(*gs_args)
@@ -570,19 +714,60 @@ class Reader:
         logger.error(msg.format(pdf_pages, given_pages))
         sys.exit(INVALID_PAGES_QUIT_CODE)
 
+    def read_structure_tree(self) -> list[TimeTable] | None:
+        """ Return the timetables created using the structure tree.
+
+        :return: The timetables of all given pages, or None if the PDF is
+            not tagged or does not contain any usable Table elements.
+        """
+        logger.info("Checking the structure tree for tables...")
+        start = time()
+        try:
+            page_tables = get_tables_from_structure_tree(
+                self.filepath, Config.pages.page_ids)
+        except (PDFSyntaxError, PSException) as e:
+            logger.warning(f"Could not read the structure tree: {e}")
+            return None
+        if page_tables is None:
+            logger.info("No tables found in the structure tree. Continuing "
+                        "with the normal table detection...")
+            return None
+        logger.info(f"Reading the structure tree took: "
+                    f"{time() - start:.2f} seconds.")
+
+        timetables = []
+        for page_id, tables in page_tables.items():
+            tables = finalize_tables(tables, [])
+            if Config.output_tables_as_csv:
+                tables_to_csv(page_id, tables)
+            if Config.dump_table_artifacts:
+                tables_to_artifacts(page_id, tables)
+            timetables += tables_to_timetables(tables)
+        return timetables
+
     def read(self) -> list[TimeTable]:
         """ Return the timetables from all given pages. """
 
         self.assert_valid_pages()
+        if Config.use_structure_tree:
+            timetables = self.read_structure_tree()
+            if timetables is not None:
+                return timetables
         self.preprocess()
 
+        layouts = None
+        if Config.use_layout_templates and not Config.use_legacy_extraction:
+            layouts = LayoutLibrary()
+
         timetables = []
         start = time()
         for page in self.get_pages():
             page_num = Config.pages.page_num(page.pageid)
             logger.info(f"Basic reading of page {page_num} took: "
                         f"{time() - start:.2f} seconds.")
-            timetables += page_to_timetables(page)
+            timetables += page_to_timetables(page, layouts)
             start = time()
 
+        if layouts is not None:
+            layouts.write()
         return timetables
@@ -3,8 +3,13 @@
 from __future__ import annotations
 
 import functools
+import logging
+import os
+import platform
 import re
-from typing import TYPE_CHECKING, TypeAlias, TypeVar
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, TYPE_CHECKING, TypeAlias, TypeVar
 
 import pandas as pd
 
@@ -12,34 +17,100 @@ if TYPE_CHECKING:
     from pdf2gtfs.datastructures.pdftable.bbox import BBox
 
 
+logger = logging.getLogger(__name__)
+
+
 class _UIDGenerator:
-    def __init__(self) -> None:
+    """ Generates unique IDs of the form <prefix><int>.
+
+    Skipped IDs of the same form are stored as ints, all others as strings.
+    The generator can be used from multiple threads. Processes, which build
+    parts of the same feed, need to use generators with distinct prefixes.
+    """
+
+    def __init__(self, prefix: str = "") -> None:
+        self.prefix = prefix
         self.id: int | None = None
-        self.skip_ids: set[str] = set()
+        self._skipped_ints: set[int] = set()
+        self._skipped_strs: set[str] = set()
+        self._lock = Lock()
+
+    @property
+    def skip_ids(self) -> set[str]:
+        """ All skipped IDs. """
+        return ({f"{self.prefix}{i}" for i in self._skipped_ints}
+                | self._skipped_strs)
+
+    @skip_ids.setter
+    def skip_ids(self, skip_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._skipped_ints = set()
+            self._skipped_strs = set()
+        self.skip_many(skip_ids)
+
+    def reset(self, prefix: str | None = None) -> None:
+        """ Start generating IDs from 0 again, forgetting all skipped IDs.
+
+        :param prefix: The new prefix. If None, the prefix is not changed.
+        """
+        with self._lock:
+            if prefix is not None:
+                self.prefix = prefix
+            self.id = None
+            self._skipped_ints = set()
+            self._skipped_strs = set()
+
+    def _to_int(self, id_: str) -> int | None:
+        """ Return the int of the ID, if it has the form <prefix><int>. """
+        if not id_.startswith(self.prefix):
+            return None
+        number = id_[len(self.prefix):]
+        if not number.isdigit() or str(int(number)) != number:
+            return None
+        return int(number)
+
+    def _skip(self, skipped_id: str) -> None:
+        skipped_id = str(skipped_id)
+        number = self._to_int(skipped_id)
+        if number is None:
+            self._skipped_strs.add(skipped_id)
+        else:
+            self._skipped_ints.add(number)
 
     def skip(self, skipped_id: str) -> None:
         """ Skip the specified ID.
 
         The UIDGenerator never returns skipped IDs.
         """
-        self.skip_ids.add(str(skipped_id))
+        with self._lock:
+            self._skip(skipped_id)
 
-    def __get_next_id(self) -> int:
-        i = 0 if self.id is None else self.id + 1
-        while str(i) in self.skip_ids:
-            i += 1
-            continue
-        return i
+    def skip_many(self, skipped_ids: Iterable[str]) -> None:
+        """ Skip all specified IDs. """
+        with self._lock:
+            for skipped_id in skipped_ids:
+                self._skip(skipped_id)
 
     def next(self) -> str:
         """ Return the next available id. """
-        self.id = self.__get_next_id()
-        return str(self.id)
+        with self._lock:
+            i = 0 if self.id is None else self.id + 1
+            while i in self._skipped_ints:
+                i += 1
+            self.id = i
+        return f"{self.prefix}{i}"
 
     def is_used(self, id_: str) -> bool:
-        return id_ in self.skip_ids
+        """ Check if the ID was either skipped or already generated. """
+        number = self._to_int(id_)
+        if number is None:
+            return id_ in self._skipped_strs
+        if self.id is not None and number <= self.id:
+            return True
+        return number in self._skipped_ints
 
 
+# Used by entries, which are created without the generator of a feed.
 UIDGenerator = _UIDGenerator()
 
 
@@ -54,6 +125,62 @@ T_ = TypeVar("T_")
 PaddedList: TypeAlias = list[T_ | None]
 
 
+def get_cache_dir(fallback_dir: Path) -> Path:
+    """ Return the system dependent path to the cache directory.
+
+    If the cache_directory is set in the config, it is used instead. If the
+    system is neither linux nor windows, return the fallback_dir instead.
+    """
+    from pdf2gtfs.config import Config
+
+    if Config.cache_directory:
+        return Path(Config.cache_directory)
+    system = platform.system().lower()
+    if system == "windows":
+        return Path(os.path.expandvars("%LOCALAPPDATA%/pdf2gtfs/")).resolve()
+    if system == "linux":
+        return Path(os.path.expanduser("~/.cache/pdf2gtfs/")).resolve()
+
+    fallback_msg = f"Using fallback cache directory ({fallback_dir})."
+    logger.warning("Could not determine system platform. " + fallback_msg)
+    return fallback_dir
+
+
+def create_cache_dir(path: Path, fallback_dir: Path) -> Path:
+    """ Tries to create the cache directory.
+
+If creation fails, use the fallback cache directory.
+"""
+    fallback_msg = f"Using fallback cache directory ({fallback_dir})."
+    if path.exists():
+        if path.is_dir():
+            return path
+        logger.warning(f"Cache directory '{path}' appears to be a file. "
+                       f"You need to move or remove that file to use the "
+                       f"default system cache. " + fallback_msg)
+        return fallback_dir
+    try:
+        os.makedirs(path, exist_ok=True)
+        return path
+    except OSError as e:
+        logger.warning(f"Cache directory could not be created. "
+                       f"Reason: '{e}'\n" + fallback_msg)
+        return fallback_dir
+
+
+def get_and_create_cache_dir() -> Path:
+    """ Get the cache directory path. Create it, if it does not exist.
+
+    If this fails at any point, the src directory will be used as fallback.
+    """
+    from pdf2gtfs.config import Config
+
+    fallback_dir = Config.source_dir
+    path = get_cache_dir(fallback_dir)
+    path = create_cache_dir(path, fallback_dir)
+    return path
+
+
 def replace_abbreviations(name: str) -> str:
     """ Replace all abbreviations in name. """
     regex = get_abbreviations_regex()
@@ -8,8 +8,8 @@ import pdf2gtfs.config.errors as err
 from pdf2gtfs.config import (
     AbbrevProperty, AverageSpeedProperty, DateBoundsProperty,
     FilenameProperty, HeaderValuesProperty, HolidayCodeProperty,
-    InputProperty, OutputPathProperty, PagesProperty,
-    RepeatIdentifierProperty, RouteTypeProperty)
+    InputProperty, OutputPathProperty, PageBudgetFallbackProperty,
+    PagesProperty, RepeatIdentifierProperty, RouteTypeProperty)
 from pdf2gtfs.config.properties import Pages
 
 from test import P2GTestCase, TEST_DIR
@@ -35,6 +35,7 @@ class DummyConfig(BaseConfig):
         self.abbreviations = AbbrevProperty("abbreviations")
         self.average_speed = AverageSpeedProperty("average_speed")
         self.input = InputProperty("input")
+        self.fallback = PageBudgetFallbackProperty("fallback")
         super()._initialize_config_properties()
 
     @property
@@ -225,6 +226,28 @@ class TestRouteTypeProperty(P2GTestCase):
                 self.assertEqual(result, c.gtfs_routetype)
 
 
+class TestPageBudgetFallbackProperty(P2GQuietTestCase):
+    def test_validate(self) -> None:
+        prop = PageBudgetFallbackProperty("fallback")
+        for i, value in enumerate(["legacy", "skip"]):
+            with self.subTest(i=i):
+                try:
+                    prop.validate(value)
+                except err.InvalidPageBudgetFallbackError:
+                    self.fail("InvalidPageBudgetFallbackError raised")
+        for j, value in enumerate(["Legacy", "ignore", ""]):
+            with (self.subTest(j=j),
+                  self.assertRaises(err.InvalidPageBudgetFallbackError)):
+                prop.validate(value)
+
+    def test_set(self) -> None:
+        c = DummyConfig()
+        for i, value in enumerate(["legacy", "skip"]):
+            with self.subTest(i=i):
+                c.fallback = value
+                self.assertEqual(value, c.fallback)
+
+
 class TestOutputPathProperty(P2GQuietTestCase):
     @classmethod
     def setUpClass(cls: P2GTestCase, create_temp_dir: bool = True,
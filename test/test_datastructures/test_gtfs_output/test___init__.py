@@ -1,14 +1,80 @@
+from zipfile import ZipFile
+
 from pdf2gtfs.datastructures.gtfs_output import (
     BaseContainer, BaseDataClass, str_wrap)
+from pdf2gtfs.datastructures.gtfs_output.trips import GTFSTripsEntry
 from test import P2GTestCase
 
 
 class TestBaseDataClass(P2GTestCase):
-    ...
+    def test_get_key(self) -> None:
+        entry = GTFSTripsEntry("route", "service", "trip")
+        self.assertEqual(("trip", "route", "service"), entry.get_key())
 
 
 class TestBaseContainer(P2GTestCase):
-    ...
+    @classmethod
+    def setUpClass(cls: P2GTestCase, **kwargs) -> None:
+        super().setUpClass(True, False)
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.container = BaseContainer(
+            "trips.txt", GTFSTripsEntry, self.temp_path)
+
+    def test__add(self) -> None:
+        e1 = self.container._add(GTFSTripsEntry("route", "service", "1"))
+        e2 = self.container._add(GTFSTripsEntry("route", "service", "2"))
+        self.assertEqual(2, len(self.container))
+        e3 = self.container._add(GTFSTripsEntry("route", "service", "1"))
+        self.assertEqual(2, len(self.container))
+        self.assertIs(e1, e3)
+        self.assertIsNot(e2, e3)
+
+    def test__get(self) -> None:
+        e1 = GTFSTripsEntry("route", "service", "1")
+        self.assertIsNone(self.container._get(e1))
+        # Entries added directly are found as well.
+        self.container.entries.append(e1)
+        e2 = self.container._get(GTFSTripsEntry("route", "service", "1"))
+        self.assertIs(e1, e2)
+        # Changed entries are found using their new values.
+        e1.route_id = "route 2"
+        self.assertIsNone(
+            self.container._get(GTFSTripsEntry("route", "service", "1")))
+        e2 = self.container._get(GTFSTripsEntry("route 2", "service", "1"))
+        self.assertIs(e1, e2)
+
+    def test__add__changed_entry(self) -> None:
+        e1 = self.container._add(GTFSTripsEntry("route", "service", "1"))
+        e1.route_id = "route 2"
+        # The key of the entry changed, so the index needs to be rebuilt.
+        self.container.invalidate_index()
+        e2 = self.container._add(GTFSTripsEntry("route 2", "service", "1"))
+        self.assertIs(e1, e2)
+        self.assertEqual(1, len(self.container))
+
+    def test_remove(self) -> None:
+        e1 = self.container._add(GTFSTripsEntry("route", "service", "1"))
+        self.container.remove(e1)
+        self.assertEqual(0, len(self.container))
+        self.assertIsNone(self.container._get(e1))
+        e2 = self.container._add(GTFSTripsEntry("route", "service", "1"))
+        self.assertIsNot(e1, e2)
+        self.assertEqual(1, len(self.container))
+
+    def test_write_to_zip(self) -> None:
+        self.container._add(GTFSTripsEntry("route", "service", "1"))
+        self.container._add(GTFSTripsEntry("route", "service", "2"))
+        archive_path = self.temp_path.joinpath("test.zip")
+        with ZipFile(archive_path, "w") as zip_file:
+            self.container.write_to_zip(zip_file)
+        with ZipFile(archive_path) as zip_file:
+            self.assertEqual(["trips.txt"], zip_file.namelist())
+            content = zip_file.read("trips.txt").decode("utf-8")
+        self.assertEqual(self.container.to_output(), content)
+        # No file is written to the temporary directory.
+        self.assertFalse(self.container.fp.exists())
 
 
 class Test(P2GTestCase):
@@ -0,0 +1,44 @@
+from dataclasses import fields
+
+import pandas as pd
+
+from pdf2gtfs.datastructures.gtfs_output.frequencies import (
+    GTFSFrequencies, GTFSFrequencyEntry)
+from pdf2gtfs.datastructures.gtfs_output.stop_times import Time
+from test.test_datastructures.test_gtfs_output import GTFSOutputBaseClass
+
+
+class TestGTFSFrequencyEntry(GTFSOutputBaseClass):
+    def test_from_series(self) -> None:
+        index = [f.name for f in fields(GTFSFrequencyEntry)]
+        values = ["trip 1", "05:00:00", "25:00:00", "600", "1"]
+        entry = GTFSFrequencyEntry.from_series(pd.Series(values, index))
+        self.assertEqual("trip 1", entry.trip_id)
+        self.assertEqual(Time(5), entry.start_time)
+        self.assertEqual(Time(25), entry.end_time)
+        self.assertEqual(600, entry.headway_secs)
+        self.assertEqual(1, entry.exact_times)
+
+    def test_to_output(self) -> None:
+        entry = GTFSFrequencyEntry("trip 1", Time(5), Time(6, 30), 600)
+        self.assertEqual('"trip 1",05:00:00,06:30:00,600,1',
+                         entry.to_output())
+
+
+class TestGTFSFrequencies(GTFSOutputBaseClass):
+    def test_add(self) -> None:
+        frequencies = GTFSFrequencies(self.temp_path)
+        e1 = frequencies.add("trip 1", Time(5), Time(6), 600)
+        e2 = frequencies.add("trip 1", Time(5), Time(6), 600)
+        self.assertEqual(1, len(frequencies))
+        self.assertEqual(e1, e2)
+        frequencies.add("trip 1", Time(6), Time(7), 300)
+        self.assertEqual(2, len(frequencies))
+
+    def test_remove_unused(self) -> None:
+        frequencies = GTFSFrequencies(self.temp_path)
+        frequencies.add("trip 1", Time(5), Time(6), 600)
+        frequencies.add("trip 2", Time(5), Time(6), 600)
+        frequencies.remove_unused({"trip 2", "trip 3"})
+        self.assertEqual(["trip 2"],
+                         [entry.trip_id for entry in frequencies])
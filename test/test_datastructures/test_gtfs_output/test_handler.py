@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest import mock
+from zipfile import ZipFile
 
 from holidays import country_holidays
 from more_itertools import collapse
@@ -56,10 +57,19 @@ class TestHandler(P2GTestCase):
         agency_id = self.handler.get_default_agency_id()
         self.assertEqual(agencies[2].agency_id, agency_id)
 
+    def test_uid_generator(self) -> None:
+        trip = self.handler.trips.add("route", "service")
+        self.assertTrue(self.handler.uid_generator.is_used(trip.trip_id))
+        # Creating another feed does not reset the IDs of the first one.
+        handler = GTFSHandler()
+        self.assertIsNot(self.handler.uid_generator, handler.uid_generator)
+        self.assertTrue(self.handler.uid_generator.is_used(trip.trip_id))
+
     def test_timetable_to_gtfs(self) -> None:
         # Page 1, first table. No repeat columns.
         timetable = self.timetables[0]
         self.handler.timetable_to_gtfs(timetable)
+        self.handler._remove_unused_trips()
         self.assertEqual(22, len(self.handler.stops))
         self.assertEqual(20, len(self.handler.trips))
         self.assertEqual(3, len(self.handler.routes))
@@ -71,6 +81,7 @@ class TestHandler(P2GTestCase):
         # Page 2, first table. Contains repeat columns.
         timetable = self.timetables[3]
         self.handler.timetable_to_gtfs(timetable)
+        self.handler._remove_unused_trips()
         self.assertEqual(22, len(self.handler.stops))
         # Normal trips + first repeat trips + second repeat trips.
         self.assertEqual(18 + 87 + 7, len(self.handler.trips))
@@ -79,6 +90,16 @@ class TestHandler(P2GTestCase):
         self.assertEqual(1, len(self.handler.agency))
         self.assertEqual(2446, len(self.handler.stop_times))
 
+    def test_timetable_to_gtfs__duplicates(self) -> None:
+        timetable = self.timetables[0]
+        self.handler.timetable_to_gtfs(timetable)
+        # Adding the same timetable again, does not add any trips.
+        self.handler.timetable_to_gtfs(timetable)
+        self.handler._remove_unused_trips()
+        self.assertEqual(20, len(self.handler.trips))
+        self.assertEqual(3, len(self.handler.routes))
+        self.assertEqual(284, len(self.handler.stop_times))
+
     def test_add_timetable_stops(self) -> None:
         timetable = self.timetables[6]
         self.assertEqual(0, len(self.handler.stops))
@@ -226,12 +247,16 @@ class TestHandler(P2GTestCase):
         self.assertEqual(0, len(self.handler.routes))
         self.handler.timetable_to_gtfs(self.timetables[3])
         self.assertEqual(2, len(self.handler.routes))
-        self.handler.routes.add("test_route", "test_route")
+        route = self.handler.routes.add("test_route", "test_route")
+        # Trips without stop times are only removed before the output.
+        trip = self.handler.trips.add(route.route_id, "test_service")
         self.handler.timetable_to_gtfs(self.timetables[4])
         self.assertEqual(4, len(self.handler.routes))
+        self.assertIn(trip, self.handler.trips.entries)
         # test_route is unused and will be removed.
         self.handler._remove_unused_routes()
         self.assertEqual(3, len(self.handler.routes))
+        self.assertNotIn(trip, self.handler.trips.entries)
 
     def test_write_files(self) -> None:
         Config.non_interactive = True
@@ -241,16 +266,21 @@ class TestHandler(P2GTestCase):
         UIDGenerator.skip_ids = set()
         self.handler.timetable_to_gtfs(timetable)
 
-        fps = self.handler.get_gtfs_filepaths()
+        names = self.handler.get_gtfs_filenames()
         Config.output_path = self.temp_path
-        for i, fp in enumerate(fps):
-            with self.subTest(i=i):
-                self.assertFalse(fp.exists())
+        archives = set(self.temp_path.glob("*.zip"))
         self.handler.write_files()
-        for i, fp in enumerate(fps):
+        # The files are written directly into the archive.
+        temp_dir = Path(self.handler.temp_dir.name)
+        for i, name in enumerate(names):
             with self.subTest(i=i):
-                self.assertTrue(fp.exists())
-        Config.input_files = fps
+                self.assertFalse(temp_dir.joinpath(name).exists())
+        new_archives = set(self.temp_path.glob("*.zip")) - archives
+        self.assertEqual(1, len(new_archives))
+        archive = new_archives.pop()
+        with ZipFile(archive) as zip_file:
+            self.assertEqual(names, zip_file.namelist())
+        Config.input_files = [archive]
         # Reset UIDGenerator.
         UIDGenerator.id = None
         UIDGenerator.skip_ids = set()
@@ -269,17 +299,10 @@ class TestHandler(P2GTestCase):
         trips = GTFSTrips(self.temp_path)
         self.assertEqual(self.handler.trips, trips)
 
-    def test_get_gtfs_filepaths(self) -> None:
+    def test_get_gtfs_filenames(self) -> None:
         names = ["agency.txt", "calendar.txt", "calendar_dates.txt",
                  "routes.txt", "stop_times.txt", "stops.txt", "trips.txt"]
-
-        filepaths = self.handler.get_gtfs_filepaths()
-        temp_dir = Path(self.handler.temp_dir.name)
-        for i in range(len(names)):
-            with self.subTest(i=i):
-                filepaths[i].resolve()
-                self.assertEqual(names[i], filepaths[i].name)
-                self.assertEqual(temp_dir.resolve(), filepaths[i].parent)
+        self.assertEqual(names, self.handler.get_gtfs_filenames())
 
     @mock.patch("pdf2gtfs.user_input.cli.input", create=True)
     def test_create_zip_archive(self, mock_input: mock.Mock) -> None:
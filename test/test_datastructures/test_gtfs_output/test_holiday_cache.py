@@ -0,0 +1,46 @@
+import datetime as dt
+import json
+from unittest import mock
+
+from holidays.utils import country_holidays
+
+from pdf2gtfs.datastructures.gtfs_output import holiday_cache
+from pdf2gtfs.datastructures.gtfs_output.holiday_cache import get_holidays
+from test import P2GTestCase
+
+
+class TestHolidayCache(P2GTestCase):
+    @classmethod
+    def setUpClass(cls, **kwargs) -> None:
+        super().setUpClass(True)
+
+    def setUp(self) -> None:
+        holiday_cache._holidays.clear()
+
+    def test_get_holidays(self) -> None:
+        path = self.temp_path.joinpath("DE_BW_2022_2023.json")
+        with mock.patch.object(holiday_cache, "get_holiday_cache_path",
+                               return_value=path):
+            dates = get_holidays("DE", "BW", 2022, 2023)
+            expected = country_holidays("DE", "BW", years=[2022, 2023])
+            self.assertEqual(tuple(sorted(expected)), dates)
+            self.assertTrue(path.exists())
+            # The holidays are cached in memory...
+            self.assertIs(dates, get_holidays("DE", "BW", 2022, 2023))
+            # ...and on disk.
+            holiday_cache._holidays.clear()
+            with mock.patch.object(holiday_cache,
+                                   "country_holidays") as mocked:
+                self.assertEqual(dates, get_holidays("DE", "BW", 2022, 2023))
+                mocked.assert_not_called()
+
+    def test_read_holiday_cache__invalid(self) -> None:
+        path = self.temp_path.joinpath("invalid.json")
+        self.assertIsNone(holiday_cache._read_holiday_cache(path))
+        with open(path, "w", encoding="utf-8") as fil:
+            json.dump({"version": "0.0", "holidays": ["2022-01-01"]}, fil)
+        # Created by a different version of the holidays library.
+        self.assertIsNone(holiday_cache._read_holiday_cache(path))
+        holiday_cache._write_holiday_cache(path, [dt.date(2022, 1, 1)])
+        self.assertEqual([dt.date(2022, 1, 1)],
+                         holiday_cache._read_holiday_cache(path))
@@ -0,0 +1,39 @@
+from pdf2gtfs.datastructures.gtfs_output.route_analysis import RouteAnalysis
+from pdf2gtfs.datastructures.gtfs_output.stop_times import (
+    GTFSStopTimes, Time)
+from pdf2gtfs.datastructures.gtfs_output.trips import GTFSTrips
+from test.test_datastructures.test_gtfs_output import GTFSOutputBaseClass
+
+
+class TestRouteAnalysis(GTFSOutputBaseClass):
+    def setUp(self) -> None:
+        self.trips = GTFSTrips(self.temp_path)
+        self.stop_times = GTFSStopTimes(self.temp_path)
+        for route_id, minutes in [("route 1", [0, 2, 5]),
+                                  ("route 1", [0, 4, 9]),
+                                  ("route 2", [0, 10])]:
+            trip = self.trips.add(route_id, "service 1")
+            for i, minute in enumerate(minutes):
+                self.stop_times.add(
+                    trip.trip_id, f"stop {i}", i, Time(6, minute))
+        self.analysis = RouteAnalysis(self.trips, self.stop_times)
+
+    def test_get_stop_ids(self) -> None:
+        self.assertEqual(["stop 0", "stop 1", "stop 2"],
+                         self.analysis.get_stop_ids("route 1"))
+        self.assertEqual(["stop 0", "stop 1"],
+                         self.analysis.get_stop_ids("route 2"))
+        self.assertEqual([], self.analysis.get_stop_ids("route 3"))
+
+    def test_get_avg_time_between(self) -> None:
+        self.assertEqual(Time(0, 3), self.analysis.get_avg_time_between(
+            "route 1", "stop 0", "stop 1"))
+        self.assertEqual(Time(0, 4), self.analysis.get_avg_time_between(
+            "route 1", "stop 1", "stop 2"))
+        self.assertEqual(Time(0, 10), self.analysis.get_avg_time_between(
+            "route 2", "stop 0", "stop 1"))
+        # Only consecutive stops are analyzed.
+        self.assertIsNone(self.analysis.get_avg_time_between(
+            "route 1", "stop 0", "stop 2"))
+        self.assertIsNone(self.analysis.get_avg_time_between(
+            "route 2", "stop 1", "stop 2"))
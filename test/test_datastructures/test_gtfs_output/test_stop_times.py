@@ -3,10 +3,13 @@ from dataclasses import fields
 import pandas as pd
 
 from pdf2gtfs.config import Config
+from pdf2gtfs.datastructures.gtfs_output.frequencies import GTFSFrequencies
 from pdf2gtfs.datastructures.gtfs_output.stop import GTFSStops
 from pdf2gtfs.datastructures.gtfs_output.stop_times import (
-    get_repeat_deltas, GTFSStopTimes, GTFSStopTimesEntry, Time)
+    get_repeat_deltas, get_repeat_offsets, GTFSStopTimes, GTFSStopTimesEntry,
+    gtfs_times_to_seconds, Time, TripPatternStore, TripStopTimes)
 from pdf2gtfs.datastructures.gtfs_output.trips import GTFSTrips
+from pdf2gtfs.datastructures.timetable.stops import Stop
 from test import P2GTestCase
 from test.test_datastructures.test_gtfs_output import GTFSOutputBaseClass
 from test.test_datastructures.test_timetable import create_stops
@@ -35,6 +38,15 @@ class TestTime(P2GTestCase):
         self.assertEqual("04:40:20", self.t2.to_output())
         self.assertEqual("05:55:01", self.t3.to_output())
 
+    def test_total_seconds(self) -> None:
+        self.assertEqual(15640, self.t1.total_seconds)
+        t = Time(25, 3, 4)
+        self.assertEqual(90184, t.total_seconds)
+        self.assertEqual("25:03:04", t.to_output())
+        t.minutes = 70
+        self.assertEqual("26:10:04", t.to_output())
+        self.assertEqual(Time(), self.t1 - self.t2)
+
     def test_copy(self) -> None:
         t1c = self.t1.copy()
         self.assertTrue(t1c == self.t1)
@@ -204,6 +216,17 @@ class TestGTFSStopTimes(GTFSOutputBaseClass):
         self.assertTrue(self.stop_times.entries[1].arrival_time <
                         self.stop_times.entries[2].arrival_time)
 
+    def test_read_input_files(self) -> None:
+        self.stop_times.add("trip 1", "stop 1", 0, Time(6), Time(6, 1))
+        self.stop_times.add("trip 1", "stop 2", 1, Time(6, 5))
+        self.stop_times.add("trip 2", "stop 1", 0, Time(25, 0, 30))
+        self.stop_times.write()
+        Config.input_files = [self.stop_times.fp]
+        stop_times = GTFSStopTimes(self.temp_path)
+        self.assertEqual(3, len(stop_times))
+        self.assertEqual(self.stop_times.entries, stop_times.entries)
+        self.assertEqual(2, len(stop_times._store.blocks))
+
     def test_merge(self) -> None:
         stop_times_1 = GTFSStopTimes(self.temp_path)
         times = {self.stops[0]: "23.29",
@@ -305,6 +328,39 @@ class TestGTFSStopTimes(GTFSOutputBaseClass):
             self.assertLess(entry, stop_times2)
             prev = entry
 
+    def test_add_repeat_as_frequency(self) -> None:
+        Config.repeat_strategy = "mean"
+        times = {self.stops[0]: "00.42",
+                 self.stops[1]: "01.00",
+                 self.stops[2]: "01.26"}
+        stop_times1 = GTFSStopTimes(self.temp_path)
+        stop_times1.add_multiple("0", self.gtfs_stops, 0, times)
+        times = {self.stops[0]: "07.24",
+                 self.stops[1]: "07.25",
+                 self.stops[2]: "07.26"}
+        stop_times2 = GTFSStopTimes(self.temp_path)
+        stop_times2.add_multiple("1", self.gtfs_stops, 0, times)
+        trips = GTFSTrips(self.temp_path)
+        trip_factory = trips.get_factory("service_1", "route_id 1")
+        frequencies = GTFSFrequencies(self.temp_path)
+        entries = GTFSStopTimes.add_repeat_as_frequency(
+            stop_times1, stop_times2, [30], trip_factory, frequencies)
+        # Only the template trip is created.
+        self.assertEqual(1, len(entries))
+        self.assertEqual(1, len(trips))
+        self.assertEqual(1, len(frequencies))
+        frequency = frequencies.entries[0]
+        self.assertEqual(trips.entries[0].trip_id, frequency.trip_id)
+        self.assertEqual(Time(1, 12), frequency.start_time)
+        self.assertEqual(Time(7, 42), frequency.end_time)
+        self.assertEqual(1800, frequency.headway_secs)
+        # Trips that are not evenly spaced are created normally.
+        Config.repeat_strategy = "cycle"
+        entries = GTFSStopTimes.add_repeat_as_frequency(
+            stop_times1, stop_times2, [30, 20], trip_factory, frequencies)
+        self.assertEqual(16, len(entries))
+        self.assertEqual(1, len(frequencies))
+
     def test__get_entry_from_stop_id(self) -> None:
         times = {self.stops[0]: "23.42",
                  self.stops[1]: "00.00",
@@ -406,6 +462,203 @@ class TestGTFSStopTimes(GTFSOutputBaseClass):
                 self.assertEqual("1", entry.trip_id)
 
 
+class TestTripStopTimes(GTFSOutputBaseClass):
+    def setUp(self) -> None:
+        self.stops = create_stops(3)
+        self.gtfs_stops = GTFSStops(self.temp_path)
+        for stop in self.stops:
+            self.gtfs_stops.add(stop.name)
+
+    def test_init(self) -> None:
+        # Input files are only read by the GTFSStopTimes.
+        path = self.temp_path.joinpath("input")
+        path.mkdir(exist_ok=True)
+        path = path.joinpath("stop_times.txt")
+        with open(path, "w", encoding="utf-8") as fil:
+            fil.write("trip_id,arrival_time,departure_time,stop_id,"
+                      "stop_sequence\n1,10:00:00,10:00:00,stop 1,0\n")
+        Config.input_files = [path]
+        self.assertEqual(1, len(GTFSStopTimes(self.temp_path)))
+        self.assertEqual(0, len(TripStopTimes()))
+
+    def test_add(self) -> None:
+        stop_times = TripStopTimes()
+        e1 = stop_times.add("trip 1", "stop 1", 0, Time(17, 58, 31))
+        e2 = stop_times.add("trip 1", "stop 1", 0, Time(17, 58, 31))
+        self.assertEqual(1, len(stop_times))
+        self.assertIs(e1, e2)
+        stop_times.shift(Time(1))
+        e3 = stop_times.add("trip 1", "stop 1", 0, Time(18, 58, 31))
+        self.assertEqual(1, len(stop_times))
+        self.assertIs(e1, e3)
+
+    def test_add_multiple__departure(self) -> None:
+        departure_stop = Stop(self.stops[0].name, 1)
+        departure_stop.annotation = "ab"
+        times = {self.stops[0]: "10.00",
+                 departure_stop: "10.05",
+                 self.stops[1]: "10.10"}
+        stop_times = TripStopTimes()
+        e1 = stop_times.add_multiple("0", self.gtfs_stops, 0, times)[0]
+        self.assertEqual(2, len(stop_times))
+        self.assertEqual(Time(10, 5), e1.departure_time)
+        # The entry is found using its new departure time.
+        e2 = stop_times.add("0", e1.stop_id, 0, Time(10), Time(10, 5))
+        self.assertIs(e1, e2)
+        self.assertEqual(2, len(stop_times))
+
+    def test_duplicate_with_trip_id(self) -> None:
+        times = {self.stops[0]: "23.42",
+                 self.stops[1]: "00.00",
+                 self.stops[2]: "00.26"}
+        stop_times = TripStopTimes()
+        stop_times.add_multiple("0", self.gtfs_stops, 0, times)
+        duplicate = stop_times._duplicate_with_trip_id("7")
+        self.assertIsInstance(duplicate, TripStopTimes)
+        self.assertEqual(len(stop_times), len(duplicate))
+        self.assertTrue(all(entry.trip_id == "7" for entry in duplicate))
+        self.assertFalse(stop_times == duplicate)
+
+    def test_get_signature(self) -> None:
+        stop_times = TripStopTimes()
+        stop_times.add("trip 1", "stop 1", 0, Time(6), Time(6, 1))
+        stop_times.add("trip 1", "stop 2", 1, Time(6, 5))
+        self.assertEqual((("stop 1", 0, 21600, 21660),
+                          ("stop 2", 1, 21900, 21900)),
+                         stop_times.get_signature())
+        # The signature does not depend on the trip_id.
+        duplicate = stop_times._duplicate_with_trip_id("trip 2")
+        self.assertEqual(stop_times.get_signature(),
+                         duplicate.get_signature())
+        duplicate.shift(Time(0, 1))
+        self.assertNotEqual(stop_times.get_signature(),
+                            duplicate.get_signature())
+
+
+class TestTripPatternStore(P2GTestCase):
+    def setUp(self) -> None:
+        self.store = TripPatternStore()
+        for trip_id in ["0", "1", "2"]:
+            hours = 5 + int(trip_id)
+            self.store.add_entries(
+                [GTFSStopTimesEntry(trip_id, f"stop {i}", i, Time(hours, i))
+                 for i in range(3)])
+
+    def test_add_entries(self) -> None:
+        self.assertEqual(9, len(self.store))
+        self.assertEqual(3, len(self.store.blocks))
+        # All trips share the same pattern.
+        self.assertEqual(1, len(self.store._pattern_ids))
+        self.assertEqual({"0", "1", "2"}, self.store.get_trip_ids())
+
+    def test_append_entry(self) -> None:
+        entry = GTFSStopTimesEntry("2", "stop 3", 3, Time(7, 3))
+        view = self.store.append_entry(entry)
+        self.assertEqual(entry, view)
+        self.assertEqual(10, len(self.store))
+        self.assertEqual(3, len(self.store.blocks))
+        self.assertEqual(2, len(self.store._pattern_ids))
+        # Views write through to the store.
+        view.departure_time = Time(7, 4)
+        self.assertEqual(Time(7, 4),
+                         self.store.get_with_trip_id("2")[3].departure_time)
+        self.assertEqual(view, self.store.find(view))
+
+    def test_append_entry__open_block(self) -> None:
+        entries = [GTFSStopTimesEntry("3", f"stop {i}", i, Time(9, i))
+                   for i in range(5)]
+        for entry in entries:
+            self.assertIsNone(self.store.find(entry))
+            self.store.append_entry(entry)
+            # Finding appended entries does not close the block.
+            self.assertIsNotNone(self.store.find(entry))
+            self.assertIsNone(self.store.blocks[-1].pattern_id)
+        self.assertEqual(14, len(self.store))
+        self.assertEqual(4, len(self.store.blocks))
+        # The block is closed, before the store is accessed otherwise.
+        self.assertEqual(entries, self.store.get_with_trip_id("3"))
+        self.assertEqual(2, len(self.store._pattern_ids))
+        # Closed blocks can be appended to as well.
+        entry = GTFSStopTimesEntry("3", "stop 5", 5, Time(9, 5))
+        self.store.append_entry(entry)
+        self.assertEqual(entries + [entry],
+                         self.store.get_with_trip_id("3"))
+
+    def test_set_time__open_block(self) -> None:
+        view = self.store.append_entry(
+            GTFSStopTimesEntry("3", "stop 0", 0, Time(9)))
+        view.departure_time = Time(9, 5)
+        self.assertIsNone(self.store.blocks[-1].pattern_id)
+        entry = GTFSStopTimesEntry("3", "stop 0", 0, Time(9), Time(9, 5))
+        self.assertEqual(view, self.store.find(entry))
+        self.assertIsNone(
+            self.store.find(GTFSStopTimesEntry("3", "stop 0", 0, Time(9))))
+
+    def test_get_views(self) -> None:
+        views = self.store.get_views()
+        self.assertEqual(9, len(views))
+        self.assertIs(views, self.store.get_views())
+        self.store.append_entry(
+            GTFSStopTimesEntry("3", "stop 0", 0, Time(9)))
+        self.assertEqual(10, len(self.store.get_views()))
+
+    def test_replace_stop_ids(self) -> None:
+        self.store.replace_stop_ids({"stop 1": "stop 4"})
+        self.assertEqual([], self.store.get_with_stop_id(["0"], "stop 1"))
+        views = self.store.get_with_stop_id(["1", "0"], "stop 4")
+        self.assertEqual(["0", "1"], [view.trip_id for view in views])
+        self.assertEqual(1, len(self.store._pattern_ids))
+        # All stop_ids are replaced at once.
+        self.store.replace_stop_ids({"stop 0": "stop 1", "stop 4": "stop 0"})
+        stop_ids = [view.stop_id for view in self.store.get_with_trip_id("2")]
+        self.assertEqual(["stop 1", "stop 0", "stop 2"], stop_ids)
+
+    def test_get_with_stop_id(self) -> None:
+        self.store.add_entries(
+            [GTFSStopTimesEntry("3", f"stop {i}", i, Time(9, i))
+             for i in range(1, 4)])
+        views = self.store.get_with_stop_id(["3", "0", "1"], "stop 1")
+        self.assertEqual(["0", "1", "3"], [view.trip_id for view in views])
+        self.assertEqual(
+            [], self.store.get_with_stop_id(["0", "1", "2"], "stop 3"))
+        # The index is updated, when new blocks are added.
+        self.store.add_entries([GTFSStopTimesEntry("4", "stop 3", 0, Time())])
+        views = self.store.get_with_stop_id({"3", "4"}, "stop 3")
+        self.assertEqual(["3", "4"], [view.trip_id for view in views])
+        # ...and when the stop_ids of the blocks change.
+        self.store.replace_stop_ids({"stop 3": "stop 5"})
+        self.assertEqual([], self.store.get_with_stop_id(["3"], "stop 3"))
+        self.assertEqual(2, len(self.store.get_with_stop_id(
+            ["3", "4", "5"], "stop 5")))
+
+    def test_get_travel_times(self) -> None:
+        # Trip 3 visits "stop 1" after "stop 2".
+        self.store.add_entries(
+            [GTFSStopTimesEntry("3", "stop 0", 0, Time(9)),
+             GTFSStopTimesEntry("3", "stop 2", 1, Time(9, 4)),
+             GTFSStopTimesEntry("3", "stop 1", 2, Time(9, 6))])
+        stop_ids = ["stop 0", "stop 1", "stop 2"]
+        self.assertEqual(
+            [60, 60], self.store.get_travel_times(["0", "1"], stop_ids))
+        # Trip 3 can not be paired for "stop 1" -> "stop 2".
+        self.assertEqual(
+            [210, 0], self.store.get_travel_times(["0", "3"], stop_ids))
+        self.assertEqual(
+            [240, 120], self.store.get_travel_times(
+                ["3"], ["stop 0", "stop 2", "stop 1"]))
+        # Stops that are not visited can not be paired.
+        self.assertEqual(
+            [0], self.store.get_travel_times(["0"], ["stop 0", "stop 3"]))
+        self.assertEqual([], self.store.get_travel_times(["0"], ["stop 0"]))
+
+    def test_to_output(self) -> None:
+        self.store.shift(3600)
+        lines = list(self.store.to_output())
+        self.assertEqual(9, len(lines))
+        self.assertEqual('"0",06:00:00,06:00:00,"stop 0",0', lines[0])
+        self.assertEqual('"2",08:02:00,08:02:00,"stop 2",2', lines[-1])
+
+
 class Test(P2GTestCase):
     def test__get_repeat_deltas(self) -> None:
         def get_five_deltas(cycle) -> list[Time]:
@@ -433,3 +686,19 @@ class Test(P2GTestCase):
                   Time.from_minutes(7), Time.from_minutes(8),
                   Time.from_minutes(7)]
         self.assertEqual(result, get_five_deltas(repeat_deltas))
+
+    def test_get_repeat_offsets(self) -> None:
+        Config.repeat_strategy = "mean"
+        self.assertEqual([600, 1200], get_repeat_offsets(0, 1800, [10]))
+        self.assertEqual([600, 1200, 1800],
+                         get_repeat_offsets(0, 1801, [10]))
+        self.assertEqual([450, 900], get_repeat_offsets(0, 1200, [7, 8]))
+        Config.repeat_strategy = "cycle"
+        self.assertEqual([420, 900], get_repeat_offsets(0, 1200, [7, 8]))
+        # Deltas that would never reach the end are ignored.
+        self.assertEqual([], get_repeat_offsets(0, 1200, [0]))
+
+    def test_gtfs_times_to_seconds(self) -> None:
+        times = pd.Series(["00:00:00", "05:20:10", "25:00:01", "", "5:20"])
+        self.assertEqual([0, 19210, 90001, 0, 0],
+                         gtfs_times_to_seconds(times).tolist())
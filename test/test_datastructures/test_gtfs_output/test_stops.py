@@ -126,6 +126,23 @@ class TestGTFSStops(GTFSOutputBaseClass):
         with self.assertRaises(KeyError):
             stops.get_by_stop_id("test stop B")
 
+    def test_set_stop_id(self) -> None:
+        stops = GTFSStops(self.temp_path)
+        stops.add("test")
+        stops.add("test2")
+        stop1 = stops.entries[0]
+        old_stop_id = stop1.stop_id
+        stops.set_stop_id(stop1, "de:1234")
+        self.assertEqual("de:1234", stop1.stop_id)
+        self.assertIs(stop1, stops.get_by_stop_id("de:1234"))
+        with self.assertRaises(KeyError):
+            stops.get_by_stop_id(old_stop_id)
+        # Changing the stop_id directly requires invalidating the index.
+        stop1.stop_id = "de:5678"
+        stops.invalidate_index()
+        self.assertIs(stop1, stops.get_by_stop_id("de:5678"))
+        self.assertIs(stop1, stops.get("test"))
+
     def test_get_existing_stops(self) -> None:
         stops = GTFSStops(self.temp_path)
         names = ["stop_a", "stop_b", "stop_d"]
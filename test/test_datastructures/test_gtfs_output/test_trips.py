@@ -4,6 +4,7 @@ import pandas as pd
 
 from pdf2gtfs.datastructures.gtfs_output.stop_times import GTFSStopTimes, Time
 from pdf2gtfs.datastructures.gtfs_output.trips import GTFSTrips, GTFSTripsEntry
+from pdf2gtfs.utils import _UIDGenerator
 from test import P2GTestCase
 from test.test_datastructures.test_gtfs_output import GTFSOutputBaseClass
 
@@ -34,6 +35,12 @@ class TestGTFSTrips(GTFSOutputBaseClass):
         self.trips.add("route 2", "service 2")
         self.assertEqual(4, len(self.trips))
 
+    def test_add__uid_generator(self) -> None:
+        generator = _UIDGenerator("test_")
+        trips = GTFSTrips(self.temp_path, generator)
+        self.assertEqual("test_0", trips.add("route 1", "service 1").trip_id)
+        self.assertEqual("test_1", trips.add("route 1", "service 1").trip_id)
+
     def test_remove(self) -> None:
         e1 = self.trips.add("route 1", "service 1")
         e2 = self.trips.add("route 1", "service 2")
@@ -165,6 +165,40 @@ class TestRow(P2GTestCase):
         self.assertEqual(fields[0].bbox.y0, row.bbox.y0)
         self.assertEqual(fields[-1].bbox.y1, row.bbox.y1)
 
+    def test_stats(self) -> None:
+        fields = create_fields(4, 1, 12, 7)
+        row = Row.from_fields(fields[:3])
+        self.assertEqual(3, row.stats.field_count)
+        self.assertEqual(15, row.stats.text_length)
+        self.assertEqual(3, row.stats.type_counts[FieldType.OTHER])
+        row.add_field(fields[3])
+        self.assertEqual(4, row.stats.field_count)
+        Config.time_format = "%H.%M"
+        fields[0].text = "03.55"
+        self.assertEqual(1, row.stats.type_counts[FieldType.DATA])
+        fields[1].text = ""
+        self.assertEqual(1, row.stats.empty_count)
+        self.assertEqual(15, row.stats.text_length)
+        row.remove_field(fields[0])
+        self.assertEqual(0, row.stats.type_counts[FieldType.DATA])
+        self.assertEqual(10, row.stats.text_length)
+
+    def test_stats__container_type(self) -> None:
+        fields = create_fields(2, 1, 12, 7)
+        row = Row.from_fields(fields)
+        row._set_type(RowType.DATA)
+        self.assertEqual(0, row.stats.type_counts[FieldType.STOP])
+        column = Column.from_fields([])
+        column.type = ColumnType.STOP
+        # Moving a field to a stop column changes its type in the row.
+        column.add_field(fields[0])
+        self.assertEqual(1, row.stats.type_counts[FieldType.STOP])
+        self.assertTrue(row.has_field_of_type(FieldType.STOP))
+        # As does changing the type of its column.
+        column.type = ColumnType.DATA
+        self.assertEqual(0, row.stats.type_counts[FieldType.STOP])
+        self.assertEqual(1, column.stats.field_count)
+
     def test_has_field_of_type(self) -> None:
         fields = create_fields(8, 1, 19, 33)
         row = Row()
@@ -28,13 +28,29 @@ class TestRowList(P2GTestCase):
         ...
 
     def test_prev(self) -> None:
-        ...
+        rows = [Row(), Row(), Row()]
+        for row in rows:
+            self.rowlist.add(row)
+        self.assertIsNone(self.rowlist.prev(rows[0]))
+        self.assertEqual(rows[0], self.rowlist.prev(rows[1]))
+        self.assertEqual(rows[1], self.rowlist.prev(rows[2]))
 
     def test_next(self) -> None:
-        ...
+        rows = [Row(), Row(), Row()]
+        for row in rows:
+            self.rowlist.add(row)
+        self.assertEqual(rows[1], self.rowlist.next(rows[0]))
+        self.assertEqual(rows[2], self.rowlist.next(rows[1]))
+        self.assertIsNone(self.rowlist.next(rows[2]))
 
     def test_index(self) -> None:
-        ...
+        rows = [Row(), Row(), Row()]
+        for row in rows:
+            self.rowlist.add(row)
+        for i, row in enumerate(rows):
+            self.assertEqual(i, self.rowlist.index(row))
+        with self.assertRaises(ValueError):
+            self.rowlist.index(Row())
 
     def test_from_list(self) -> None:
         from pdf2gtfs.datastructures.pdftable.lists import RowList
@@ -54,4 +70,14 @@ class TestRowList(P2GTestCase):
         ...
 
     def test_merge(self) -> None:
-        ...
+        from pdf2gtfs.datastructures.pdftable.bbox import BBox
+        from pdf2gtfs.datastructures.pdftable.lists import RowList
+
+        rows = [Row(bbox=BBox(0, y, 10, y + 5)) for y in range(0, 40, 10)]
+        self.rowlist = RowList.from_list(self.table, rows[::2])
+        other = RowList.from_list(self.table, rows[1::2])
+        self.rowlist.merge(other)
+        self.assertEqual(rows, list(self.rowlist.objects))
+        # The positions are updated as well.
+        for i, row in enumerate(rows):
+            self.assertEqual(i, self.rowlist.index(row))
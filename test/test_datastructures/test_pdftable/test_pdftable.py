@@ -9,7 +9,7 @@ from pdf2gtfs.datastructures.pdftable.bbox import BBox
 from pdf2gtfs.datastructures.pdftable.container import Row
 from pdf2gtfs.datastructures.pdftable.field import Field
 from pdf2gtfs.datastructures.pdftable.pdftable import (
-    split_rows_into_tables, Tables)
+    PDFTable, split_rows_into_tables, Tables)
 from pdf2gtfs.reader import (
     preprocess_check, dataframe_to_rows, get_chars_dataframe, Reader)
 from test import get_data_gen, P2GTestCase, TEST_DATA_DIR
@@ -102,6 +102,23 @@ class TestTable(P2GTestCase):
             self.assertEqual(int(col_types[i]), col.type.value)
             self.assertEqual(cols[i], [f.text.strip() for f in col.fields])
 
+    def test_generate_columns_from_rows__overlapping(self) -> None:
+        rows = create_rows(3, 3)
+        for row in rows:
+            row.update_type()
+        # Overlaps with the second column of the first row.
+        field = Field(BBox(111, 100, 119, 110), "a")
+        rows[0].add_field(field)
+        table = PDFTable(rows)
+        table.generate_columns_from_rows()
+        self.assertEqual(3, len(table.columns))
+        self.assertEqual(["0.1 a", "1.1", "2.1"],
+                         [f.text for f in table.columns[1].fields])
+        for column in table.columns:
+            with self.subTest(column=column):
+                self.assertEqual(3, len(column.fields))
+                self.assertEqual(table, column.table)
+
     def test_fix_split_stop_names(self) -> None:
         Config.min_row_count = 3
         data = self.get_data_func("test_fix_split_stop_names")
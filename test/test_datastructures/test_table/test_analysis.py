@@ -0,0 +1,58 @@
+from pdf2gtfs.datastructures.pdftable.bbox import BBox
+from pdf2gtfs.datastructures.table.cell import Cell
+from pdf2gtfs.datastructures.table.celltype import cell_row_contains_type, T
+from pdf2gtfs.datastructures.table.direction import E, H, S, V
+from pdf2gtfs.datastructures.table.grid import table_from_grid
+from test import P2GTestCase
+
+
+def create_grid() -> list[list[Cell]]:
+    return [[Cell("Stop A", BBox(0, 0, 40, 10)),
+             Cell("08.00", BBox(50, 0, 70, 10))],
+            [Cell("Stop B", BBox(0, 20, 40, 30)),
+             Cell("08.05", BBox(50, 20, 70, 30))]]
+
+
+class TestTableAnalysis(P2GTestCase):
+    def test_get_series_id(self) -> None:
+        grid = create_grid()
+        table = table_from_grid(grid)
+        self.assertEqual(1, table.analysis.get_series_id(grid[1][0], H))
+        self.assertEqual(0, table.analysis.get_series_id(grid[1][0], V))
+        self.assertIsNone(table.analysis.get_series_id(Cell("test"), H))
+
+    def test_get(self) -> None:
+        table = table_from_grid(create_grid())
+        calls = []
+
+        def func() -> int:
+            calls.append(1)
+            return 42
+
+        self.assertEqual(42, table.analysis.get("key", func))
+        self.assertEqual(42, table.analysis.get("key", func))
+        self.assertEqual(1, len(calls))
+        table.analysis.invalidate(False)
+        self.assertEqual(42, table.analysis.get("key", func))
+        self.assertEqual(2, len(calls))
+
+    def test_invalidate__structure(self) -> None:
+        grid = create_grid()
+        table = table_from_grid(grid)
+        self.assertTrue(cell_row_contains_type(grid[0][0], T.Time))
+        # Unlinking the Cells changes the structure.
+        grid[0][0].del_neighbor(E)
+        grid[0][1].del_neighbor(S)
+        self.assertIsNone(table.analysis._positions)
+        self.assertEqual({}, table.analysis._values)
+        self.assertFalse(cell_row_contains_type(grid[0][0], T.Time))
+
+    def test_invalidate__type(self) -> None:
+        grid = create_grid()
+        table = table_from_grid(grid)
+        table.analysis.get_series_id(grid[0][0], H)
+        table.analysis.get("key", lambda: 1)
+        grid[0][0].invalidate_analysis(False)
+        # Only the values depending on the Types are invalidated.
+        self.assertIsNotNone(table.analysis._positions)
+        self.assertEqual({}, table.analysis._values)
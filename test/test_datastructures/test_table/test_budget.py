@@ -0,0 +1,43 @@
+from pdf2gtfs.config import Config
+from pdf2gtfs.datastructures.table.budget import (
+    PageBudget, PageBudgetExceeded,
+    )
+from test import P2GTestCase
+
+
+class TestPageBudget(P2GTestCase):
+    def tearDown(self) -> None:
+        PageBudget.stop()
+
+    def test_check__inactive(self) -> None:
+        Config.page_operation_budget = 1
+        self.assertFalse(PageBudget.active)
+        # Does not raise, because no page is tracked.
+        PageBudget.check(5)
+        self.assertEqual(0, PageBudget.operations)
+
+    def test_check__operations(self) -> None:
+        Config.page_operation_budget = 3
+        PageBudget.start()
+        PageBudget.check()
+        PageBudget.check(2)
+        with self.assertRaises(PageBudgetExceeded):
+            PageBudget.check()
+        # Starting a new page resets the budget.
+        PageBudget.start()
+        PageBudget.check(3)
+
+    def test_check__time(self) -> None:
+        Config.page_time_budget = 0.01
+        PageBudget.start()
+        PageBudget.check()
+        PageBudget.start_time -= 1
+        with self.assertRaises(PageBudgetExceeded):
+            PageBudget.check()
+
+    def test_check__disabled(self) -> None:
+        Config.page_operation_budget = 0
+        Config.page_time_budget = 0
+        PageBudget.start()
+        PageBudget.start_time -= 1000
+        PageBudget.check(10000)
@@ -0,0 +1,100 @@
+import numpy as np
+from pdfminer.layout import LTPage, LTRect
+
+from pdf2gtfs.datastructures.pdftable.bbox import BBox
+from pdf2gtfs.datastructures.table.cell import Cell, EmptyCell
+from pdf2gtfs.datastructures.table.grid import (
+    assign_cells_to_slots, cluster_positions, create_grid,
+    create_tables_from_rulings, group_rulings,
+    )
+from test import P2GTestCase
+
+
+class Test(P2GTestCase):
+    def test_cluster_positions(self) -> None:
+        self.assertEqual([], cluster_positions([]))
+        positions = [10., 50.5, 11., 49.5, 100.]
+        self.assertEqual([10.5, 50., 100.], cluster_positions(positions))
+
+    def test_assign_cells_to_slots(self) -> None:
+        h_rulings = [0., 10., 20.]
+        v_rulings = [0., 50., 100.]
+        cells = [Cell("a", BBox(5, 2, 20, 8)),
+                 Cell("b", BBox(60, 12, 80, 18)),
+                 Cell("c", BBox(120, 12, 140, 18))]
+        row_ids, col_ids = assign_cells_to_slots(cells, h_rulings, v_rulings)
+        self.assertEqual([0, 1, 1], list(row_ids))
+        self.assertEqual([0, 1, -1], list(col_ids))
+
+    def test_create_grid(self) -> None:
+        h_rulings = [0., 10., 20., 30.]
+        v_rulings = [0., 50., 100.]
+        time_cells = [Cell("08:00", BBox(60, 12, 80, 18)),
+                      Cell("09:00", BBox(60, 22, 80, 28))]
+        other_cells = [Cell("Stop", BBox(5, 12, 20, 18)),
+                       Cell("A", BBox(22, 12, 40, 18)),
+                       Cell("outside", BBox(120, 12, 140, 18))]
+        grid = create_grid(h_rulings, v_rulings, time_cells, other_cells)
+        # The first row does not contain any Cells.
+        self.assertEqual(2, len(grid))
+        self.assertEqual("Stop A", grid[0][0].text)
+        self.assertEqual(time_cells, [grid[0][1], grid[1][1]])
+        self.assertIsInstance(grid[1][0], EmptyCell)
+        # Only the Cells outside the grid remain.
+        self.assertEqual(["outside"], [c.text for c in other_cells])
+
+    def test_create_grid__inconsistent(self) -> None:
+        h_rulings = [0., 10., 20.]
+        v_rulings = [0., 50., 100.]
+        time_cells = [Cell("08:00", BBox(60, 12, 70, 18)),
+                      Cell("09:00", BBox(75, 12, 90, 18))]
+        other_cells = [Cell("Stop", BBox(5, 12, 20, 18))]
+        # Multiple TimeCells in the same slot.
+        self.assertIsNone(
+            create_grid(h_rulings, v_rulings, time_cells, other_cells))
+        # TimeCell outside the grid.
+        time_cells = [Cell("08:00", BBox(60, 32, 70, 38))]
+        self.assertIsNone(
+            create_grid(h_rulings, v_rulings, time_cells, other_cells))
+        self.assertEqual(1, len(other_cells))
+
+    def test_group_rulings(self) -> None:
+        rulings = np.array([[0, 0, 100, 0], [0, 0, 0, 100],
+                            [100, 1, 100, 100], [200, 0, 300, 0],
+                            [250, -50, 250, 50]], dtype=float)
+        groups = group_rulings(rulings)
+        self.assertEqual(2, len(groups))
+        self.assertEqual(rulings[:3].tolist(), groups[0].tolist())
+        self.assertEqual(rulings[3:].tolist(), groups[1].tolist())
+
+    def test_create_tables_from_rulings(self) -> None:
+        page = LTPage(1, (0, 0, 500, 200))
+        # Two tables with 2x2 slots each, drawn using rectangles.
+        for x in [0, 50, 300, 350]:
+            for y in [100, 150]:
+                page.add(LTRect(1, (x, y, x + 50, y + 50)))
+        time_cells = [Cell("08.00", BBox(60, 10, 80, 20)),
+                      Cell("09.00", BBox(60, 60, 80, 70)),
+                      Cell("10.00", BBox(360, 60, 380, 70))]
+        other_cells = [Cell("A", BBox(10, 10, 20, 20)),
+                       Cell("B", BBox(310, 60, 320, 70)),
+                       Cell("outside", BBox(200, 10, 220, 20))]
+        tables = create_tables_from_rulings(page, time_cells, other_cells)
+        self.assertEqual(2, len(tables))
+        self.assertEqual(["A", "08.00"],
+                         [c.text for c in tables[0].top.row])
+        self.assertEqual(["B", "10.00"],
+                         [c.text for c in tables[1].top.row])
+        self.assertEqual(["outside"], [c.text for c in other_cells])
+
+    def test_create_tables_from_rulings__missing_time_cell(self) -> None:
+        page = LTPage(1, (0, 0, 500, 200))
+        for x in [0, 50]:
+            for y in [100, 150]:
+                page.add(LTRect(1, (x, y, x + 50, y + 50)))
+        time_cells = [Cell("08.00", BBox(60, 10, 80, 20)),
+                      Cell("10.00", BBox(360, 60, 380, 70))]
+        other_cells = [Cell("A", BBox(10, 10, 20, 20))]
+        self.assertIsNone(
+            create_tables_from_rulings(page, time_cells, other_cells))
+        self.assertEqual(["A"], [c.text for c in other_cells])
@@ -0,0 +1,86 @@
+from pdf2gtfs.datastructures.pdftable.bbox import BBox
+from pdf2gtfs.datastructures.table.cell import Cell
+from pdf2gtfs.datastructures.table.layout import (
+    LayoutLibrary, LayoutTemplate, TableRegion,
+    )
+from test import P2GTestCase
+
+
+def create_template() -> LayoutTemplate:
+    regions = [TableRegion(0.1, 0.1, 0.9, 0.45, "V"),
+               TableRegion(0.1, 0.55, 0.9, 0.9, "V")]
+    return LayoutTemplate(500, 1000, regions)
+
+
+class TestTableRegion(P2GTestCase):
+    def test_contains(self) -> None:
+        region = TableRegion(0.1, 0.1, 0.5, 0.5, "V")
+        self.assertTrue(region.contains(BBox(60, 110, 70, 120), 500, 1000))
+        # Only the center of the bbox needs to be within the region.
+        self.assertTrue(region.contains(BBox(240, 490, 260, 510), 500, 1000))
+        self.assertFalse(region.contains(BBox(260, 110, 280, 120), 500, 1000))
+
+    def test_to_dict__from_dict(self) -> None:
+        region = TableRegion(0.1, 0.2, 0.3, 0.4, "H")
+        self.assertEqual(region, TableRegion.from_dict(region.to_dict()))
+
+
+class TestLayoutTemplate(P2GTestCase):
+    def test_fits_page(self) -> None:
+        template = create_template()
+        self.assertTrue(template.fits_page(500, 1000))
+        self.assertTrue(template.fits_page(501, 999))
+        self.assertFalse(template.fits_page(1000, 500))
+
+    def test_assign_cells(self) -> None:
+        template = create_template()
+        cells = [Cell("08:00", BBox(100, 200, 120, 210)),
+                 Cell("09:00", BBox(130, 200, 150, 210)),
+                 Cell("10:00", BBox(100, 700, 120, 710))]
+        groups = template.assign_cells(cells)
+        self.assertEqual([cells[:2], cells[2:]], groups)
+        # Each region needs to contain at least one Cell.
+        self.assertIsNone(template.assign_cells(cells[:2]))
+        # Each Cell needs to be contained in a region.
+        cells.append(Cell("11:00", BBox(100, 490, 120, 510)))
+        self.assertIsNone(template.assign_cells(cells))
+
+
+class TestLayoutLibrary(P2GTestCase):
+    @classmethod
+    def setUpClass(cls, **kwargs) -> None:
+        super().setUpClass(True)
+
+    def test_read__write(self) -> None:
+        path = self.temp_path.joinpath("templates.json")
+        library = LayoutLibrary(path)
+        self.assertEqual([], library.templates)
+        library.templates.append(create_template())
+        # Only changed libraries are written.
+        library.write()
+        self.assertFalse(path.exists())
+        library.changed = True
+        library.write()
+        self.assertTrue(path.exists())
+        self.assertEqual(library.templates, LayoutLibrary(path).templates)
+
+    def test_match(self) -> None:
+        library = LayoutLibrary(self.temp_path.joinpath("match.json"))
+        template = create_template()
+        library.templates.append(template)
+        cells = [Cell("08:00", BBox(100, 200, 120, 210)),
+                 Cell("10:00", BBox(100, 700, 120, 710))]
+        self.assertIsNone(library.match(cells, 1000, 500))
+        match = library.match(cells, 500, 1000)
+        self.assertEqual((template, [cells[:1], cells[1:]]), match)
+
+    def test_match__most_recently_used(self) -> None:
+        library = LayoutLibrary(self.temp_path.joinpath("mru.json"))
+        other = LayoutTemplate(500, 1000, [TableRegion(0, 0, 0.1, 0.1, "")])
+        template = create_template()
+        library.templates = [other, template]
+        cells = [Cell("08:00", BBox(100, 200, 120, 210)),
+                 Cell("10:00", BBox(100, 700, 120, 710))]
+        self.assertEqual(template, library.match(cells, 500, 1000)[0])
+        self.assertEqual([template, other], library.templates)
+        self.assertTrue(library.changed)
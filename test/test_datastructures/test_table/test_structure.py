@@ -0,0 +1,42 @@
+from pdfminer.psparser import LIT
+
+from pdf2gtfs.datastructures.table.structure import StructureTree
+from test import P2GTestCase
+
+
+def create_elem(typ: str, kids: list) -> dict:
+    return {"S": LIT(typ), "K": kids}
+
+
+class TestStructureTree(P2GTestCase):
+    def setUp(self) -> None:
+        row1 = create_elem("TR", [create_elem("TH", [0]),
+                                  create_elem("Cell", [1, 2])])
+        row2 = create_elem("TR", [create_elem("TD", [{"MCID": 3}]),
+                                  create_elem("TD", [create_elem("P", [4])])])
+        table = create_elem("Table", [create_elem("THead", [row1]), row2])
+        document = create_elem("Document", [create_elem("P", [5]), table])
+        root = {"K": document, "RoleMap": {LIT("Cell"): LIT("TD")}}
+        self.tree = StructureTree(root)
+
+    def test_find_elements(self) -> None:
+        tables = self.tree.find_elements("Table")
+        self.assertEqual(1, len(tables))
+        self.assertEqual(2, len(self.tree.find_elements("P")))
+
+    def test_get_type(self) -> None:
+        self.assertEqual("TD", self.tree.get_type(create_elem("Cell", [])))
+        self.assertEqual("TR", self.tree.get_type(create_elem("TR", [])))
+
+    def test_get_rows(self) -> None:
+        table = self.tree.find_elements("Table")[0]
+        rows = self.tree.get_rows(table)
+        self.assertEqual([2, 2], list(map(len, rows)))
+
+    def test_get_mc_keys(self) -> None:
+        table = self.tree.find_elements("Table")[0]
+        rows = self.tree.get_rows(table)
+        keys = [[self.tree.get_mc_keys(cell, 7) for cell in row]
+                for row in rows]
+        self.assertEqual([[[(7, 0)], [(7, 1), (7, 2)]],
+                          [[(7, 3)], [(7, 4)]]], keys)
@@ -1,6 +1,7 @@
+import logging
 from itertools import pairwise
 from operator import attrgetter, methodcaller
-from unittest import TestCase
+from unittest import mock, TestCase
 
 from more_itertools import collapse, first_true
 
@@ -9,13 +10,14 @@ from pdf2gtfs.datastructures.pdftable.bbox import BBox
 from pdf2gtfs.datastructures.table.direction import E, H, N, S, V, W
 from pdf2gtfs.datastructures.table.cell import Cell
 from pdf2gtfs.datastructures.table.celltype import T
+from pdf2gtfs.datastructures.table.grid import table_from_grid
 from pdf2gtfs.datastructures.table.table import Table
 from pdf2gtfs.reader import (
     assign_other_cells_to_tables,
     get_cells_from_page, Reader,
     )
 
-from test import TEST_DATA_DIR
+from test import P2GTestCase, TEST_DATA_DIR
 
 
 class TestTable(TestCase):
@@ -416,3 +418,32 @@ class TestTable(TestCase):
 
     def test_iter(self) -> None:
         self.skipTest("Not implemented yet!")
+
+
+class TestTableRendering(P2GTestCase):
+    def setUp(self) -> None:
+        grid = [[Cell("Stop A", BBox(0, 0, 40, 10)),
+                 Cell("08:00", BBox(50, 0, 70, 10))],
+                [Cell("Stop B", BBox(0, 20, 40, 30)),
+                 Cell("08:05", BBox(50, 20, 70, 30))]]
+        self.table = table_from_grid(grid)
+
+    def test_render(self) -> None:
+        self.assertEqual("| Stop A | 08:00 |\n| Stop B | 08:05 |",
+                         self.table.render(None))
+        self.assertEqual("| Stop A |\n| Stop B |", self.table.render(1))
+
+    def test_print(self) -> None:
+        table_logger = logging.getLogger("pdf2gtfs.datastructures.table.table")
+        level = table_logger.level
+        try:
+            table_logger.setLevel(logging.INFO)
+            with mock.patch.object(Table, "render") as mocked:
+                self.table.print()
+                # The Table is not rendered, if the record is not emitted.
+                mocked.assert_not_called()
+        finally:
+            table_logger.setLevel(level)
+        with self.assertLogs(table_logger, logging.DEBUG) as logs:
+            self.table.print(None)
+        self.assertIn(self.table.render(None), logs.output[0])
@@ -22,9 +22,6 @@ class TestOSMFetcher(P2GTestCase):
 
 
 class Test(P2GTestCase):
-    def test_get_and_create_cache_dir(self) -> None:
-        ...
-
     def test_get_osm_comments(self) -> None:
         ...
 
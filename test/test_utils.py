@@ -1,16 +1,22 @@
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 
 from pdf2gtfs.config import Config
 from pdf2gtfs.utils import (
-    get_abbreviations_regex, next_uid, normalize_series, replace_abbreviation,
-    replace_abbreviations, UIDGenerator)
+    _UIDGenerator, get_abbreviations_regex, get_and_create_cache_dir,
+    next_uid, normalize_series, replace_abbreviation, replace_abbreviations,
+    UIDGenerator)
 
 from test import P2GTestCase
 
 
 class TestUtils(P2GTestCase):
+    @classmethod
+    def setUpClass(cls, **kwargs) -> None:
+        super().setUpClass(True)
+
     def test_next_uid(self) -> None:
         g = UIDGenerator
         # Reset.
@@ -22,6 +28,34 @@ class TestUtils(P2GTestCase):
         self.assertEqual("5", next_uid())
         self.assertEqual("7", next_uid())
 
+    def test_uid_generator__prefix(self) -> None:
+        g = _UIDGenerator()
+        g.reset("a_")
+        g.skip_many(["a_0", "a_2", "0", "a_01", "b_1"])
+        self.assertEqual({"a_0", "a_2", "0", "a_01", "b_1"}, g.skip_ids)
+        self.assertEqual("a_1", g.next())
+        self.assertEqual("a_3", g.next())
+        self.assertTrue(g.is_used("a_1"))
+        self.assertTrue(g.is_used("a_01"))
+        self.assertFalse(g.is_used("a_4"))
+        self.assertFalse(g.is_used("1"))
+        g.reset()
+        self.assertEqual(set(), g.skip_ids)
+        self.assertEqual("a_0", g.next())
+
+    def test_uid_generator__threads(self) -> None:
+        g = _UIDGenerator()
+        with ThreadPoolExecutor(4) as executor:
+            ids = list(executor.map(lambda _: g.next(), range(1000)))
+        self.assertEqual(1000, len(set(ids)))
+
+    def test_get_and_create_cache_dir(self) -> None:
+        path = self.temp_path.joinpath("cache")
+        Config.cache_directory = str(path)
+        self.assertEqual(path, get_and_create_cache_dir())
+        self.assertTrue(path.is_dir())
+        Config.cache_directory = ""
+
     def test_replace_abbreviations__no_dot(self) -> None:
         Config.name_abbreviations = {"str": "strasse"}
         names = {"hauptstr.": "hauptstr.",